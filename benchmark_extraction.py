@@ -0,0 +1,53 @@
+import sys
+from srcs_benchmark import benchmark, cli, config, logger
+
+def main():
+	args = cli.parse_args(sys.argv[1:])
+
+	logger.info(f"Parsed arguments: {args}")
+
+	config.PROJECTS = args["projects"]
+	config.ISSUES = args["issues"]
+	config.USERS = args["users"]
+	config.TIME_ENTRIES = args["time_entries"]
+	config.WIKI_PAGES = args["wiki_pages"]
+	config.FILES = args["files"]
+	config.FILE_SIZE = args["file_size"]
+	config.SEED = args["seed"]
+	config.LATENCY = args["latency"]
+	config.LATENCY_JITTER = args["latency_jitter"]
+	config.ERROR_RATE = args["error_rate"]
+	config.THROTTLE_RATE = args["throttle_rate"]
+	config.RETRY_AFTER = args["retry_after"]
+	config.LISTING_INCLUDES = args["listing_includes"]
+	config.SERVE = args["serve"]
+	config.HOST = args["host"]
+	config.PORT = args["port"]
+	config.OUTPUT = args["output"]
+	config.REPORT = args["report"]
+	config.COMPARE = args["compare"]
+	config.INTERRUPT_AFTER = args["interrupt_after"]
+
+	logger.info(f"Configuration: PROJECTS={config.PROJECTS}, ISSUES={config.ISSUES}, USERS={config.USERS}, TIME_ENTRIES={config.TIME_ENTRIES}, "
+				f"WIKI_PAGES={config.WIKI_PAGES}, FILES={config.FILES}, FILE_SIZE={config.FILE_SIZE}, SEED={config.SEED}, "
+				f"LATENCY={config.LATENCY}, LATENCY_JITTER={config.LATENCY_JITTER}, ERROR_RATE={config.ERROR_RATE}, THROTTLE_RATE={config.THROTTLE_RATE}, "
+				f"RETRY_AFTER={config.RETRY_AFTER}, LISTING_INCLUDES={config.LISTING_INCLUDES}, SERVE={config.SERVE}, HOST={config.HOST}, PORT={config.PORT}, "
+				f"OUTPUT={config.OUTPUT}, REPORT={config.REPORT}, COMPARE={config.COMPARE}, INTERRUPT_AFTER={config.INTERRUPT_AFTER}")
+
+	if config.SERVE:
+		benchmark.serve()
+		return
+
+	previous = benchmark.load_report(config.COMPARE) if config.COMPARE else None
+	report = benchmark.run(args["extraction_options"])
+	benchmark.print_report(report, previous)
+	if config.REPORT:
+		benchmark.save_report(report, config.REPORT)
+
+if __name__ == "__main__":
+	logger.info("Script started")
+	try:
+		main()
+	except Exception as e:
+		logger.error(f"Script execution failed: {e}")
+		print(config.BOLD + "Error: " + config.END + f"{e}")
@@ -0,0 +1,26 @@
+import sys
+from srcs_merge import cli, config, logger, merge
+from srcs_extraction import compression
+
+def main():
+	args = cli.parse_args(sys.argv[1:])
+
+	logger.info(f"Parsed arguments: {args}")
+
+	config.SINGLE_FILE = not args["multiple_files"]
+	config.NDJSON = args["ndjson"]
+	config.COMPRESSION = args["compression"] or compression.compression_of(args["output"])
+	config.OUTPUT = compression.strip_extension(args["output"])
+	config.INPUTS = args["inputs"]
+
+	logger.info(f"Configuration: OUTPUT={config.OUTPUT}, SINGLE_FILE={config.SINGLE_FILE}, NDJSON={config.NDJSON}, COMPRESSION={config.COMPRESSION}, INPUTS={config.INPUTS}")
+
+	merge.merge(config.INPUTS, config.OUTPUT)
+
+if __name__ == "__main__":
+	logger.info("Script started")
+	try:
+		main()
+	except Exception as e:
+		logger.error(f"Script execution failed: {e}")
+		print(config.BOLD + "Error: " + config.END + f"{e}")
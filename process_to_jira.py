@@ -1,5 +1,6 @@
 import sys
 from srcs_process_to_jira import config, cli, logger, process
+from srcs_extraction import compression
 
 def main():
 	args = cli.parse_args(sys.argv[1:])
@@ -15,11 +16,14 @@ def main():
 
 	config.AUTO = args["auto"]
 	config.AUTO_INDENT = args["auto_indent"]
+	config.COMPRESSION = args["compression"] or compression.compression_of(output_file)
+	config.ATTACHMENTS_URL = args["attachments_url"]
+	output_file = compression.strip_extension(output_file)
 
 	logger.info(f"Configuration: input_file={input_file}, output_file={output_file}, "
 				f"SINGLE_FILE_INPUT={config.INPUT_SINGLE_FILE}, MULTIPLE_FILE_INPUT={config.INPUT_MULTIPLE_FILE}, "
 				f"SINGLE_FILE_OUTPUT={config.OUTPUT_SINGLE_FILE}, MULTIPLE_FILE_OUTPUT={config.OUTPUT_MULTIPLE_FILE}, "
-				f"AUTO={config.AUTO}, AUTO_INDENT={config.AUTO_INDENT}")
+				f"AUTO={config.AUTO}, AUTO_INDENT={config.AUTO_INDENT}, COMPRESSION={config.COMPRESSION}, ATTACHMENTS_URL={config.ATTACHMENTS_URL}")
 
 	try:
 		process.process(input_file, output_file)
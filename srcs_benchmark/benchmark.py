@@ -0,0 +1,321 @@
+import os
+import sys
+import json
+import time
+import signal
+import shutil
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from srcs_extraction import cli as extraction_cli, compression, fetcher, incremental, telemetry
+from srcs_benchmark import config, dataset, logger, server
+
+def count_records(output_file):
+	"""
+	Count the records of the listings written by the extraction.
+
+	Args:
+		output_file (str): The output of the extraction, as configured by the extraction CLI.
+
+	Returns:
+		int: The number of records of all the endpoints.
+	"""
+	data = incremental.load_previous_data(output_file)
+	return sum(len(records) for records in data.values() if isinstance(records, list))
+
+def directory_size(directory):
+	"""
+	Get the size of everything written in a directory.
+
+	Args:
+		directory (str): The directory to measure.
+
+	Returns:
+		int: The size in bytes.
+	"""
+	total = 0
+	for root, _, files in os.walk(directory):
+		for name in files:
+			total += os.path.getsize(os.path.join(root, name))
+	return total
+
+def same_file(path_a, path_b):
+	"""
+	Tell if two files written by the extraction hold the same data.
+
+	Compressed files are compared once decompressed, their headers holding the time they were written,
+	and JSON files once parsed.
+
+	Args:
+		path_a (str): The first file.
+		path_b (str): The second file.
+
+	Returns:
+		bool: True if both files hold the same data.
+	"""
+	if compression.strip_extension(path_a).endswith(".json"):
+		with compression.open_read(path_a) as file_a, compression.open_read(path_b) as file_b:
+			return json.load(file_a) == json.load(file_b)
+	with compression.open_read(path_a, binary=True) as file_a, compression.open_read(path_b, binary=True) as file_b:
+		return file_a.read() == file_b.read()
+
+def compare_outputs(output_file, other_file):
+	"""
+	Compare what two extractions wrote, except their reports of the requests.
+
+	The records of the output are compared as loaded by the next incremental extraction, whatever
+	its format, and the other files next to it (wikis, journals, attachments, state) one by one.
+
+	Args:
+		output_file (str): The output of the first extraction, as configured by the extraction CLI.
+		other_file (str): The output of the second extraction, with the same name in another directory.
+
+	Returns:
+		list: The paths, relative to the output directory, that differ or are missing on one side.
+	"""
+	directory = os.path.dirname(output_file)
+	other_directory = os.path.dirname(other_file)
+	differences = []
+	if incremental.load_previous_data(output_file) != incremental.load_previous_data(other_file):
+		differences.append(os.path.basename(output_file))
+	skipped = {os.path.basename(telemetry.report_path(output_file))}
+	paths = set()
+	for root in (directory, other_directory):
+		for current, _, files in os.walk(root):
+			paths.update(os.path.relpath(os.path.join(current, name), root) for name in files)
+	for path in sorted(paths):
+		if path in skipped or path.startswith(os.path.splitext(os.path.basename(output_file))[0]):
+			continue
+		path_a = os.path.join(directory, path)
+		path_b = os.path.join(other_directory, path)
+		if not os.path.exists(path_a) or not os.path.exists(path_b) or not same_file(path_a, path_b):
+			differences.append(path)
+	return differences
+
+def run_extraction(extraction_argv, fake, output_arg):
+	"""
+	Run extract_from_redmine.py in another process against a fake Redmine, as a user would.
+
+	Args:
+		extraction_argv (list): The options given to the extraction.
+		fake (FakeRedmine): The running fake Redmine.
+		output_arg (list): The output option, e.g., ["-s", "/tmp/output/redmine_data.json"].
+
+	Returns:
+		subprocess.Popen: The running extraction, its output discarded.
+	"""
+	script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "extract_from_redmine.py")
+	command = [sys.executable, script] + extraction_argv + ["-a", "benchmark", "-u", fake.url] + output_arg
+	logger.info(f"Running {command}")
+	return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def check_resume(extraction_argv, fake, args, output_file):
+	"""
+	Interrupt an extraction like Ctrl-C, resume it with --resume and compare its output with a clean run.
+
+	The extraction is interrupted with SIGINT once the fake Redmine answered config.INTERRUPT_AFTER of
+	its requests, then run again with --resume into the same output.
+
+	Args:
+		extraction_argv (list): The options given to the extraction.
+		fake (FakeRedmine): The running fake Redmine.
+		args (dict): The extraction arguments parsed for the clean run.
+		output_file (str): The output of the clean run.
+
+	Returns:
+		dict: Whether the extraction was interrupted, the requests of both runs and the files that differ from the clean run.
+	"""
+	output_dir = f"{os.path.dirname(output_file)}_resumed" if config.OUTPUT else tempfile.mkdtemp(prefix="redmine_benchmark_resumed_")
+	shutil.rmtree(output_dir, ignore_errors=True)
+	os.makedirs(output_dir)
+	output_arg = ["-s", os.path.join(output_dir, os.path.basename(args["output"]))]
+	try:
+		start_requests = fake.snapshot()["requests"]
+		process = run_extraction(extraction_argv, fake, output_arg)
+		interrupted = False
+		while process.poll() is None:
+			if fake.snapshot()["requests"] - start_requests >= config.INTERRUPT_AFTER:
+				process.send_signal(signal.SIGINT)
+				interrupted = True
+				break
+			time.sleep(0.01)
+		process.wait()
+		interrupted_requests = fake.snapshot()["requests"] - start_requests
+		logger.info(f"Extraction {'interrupted' if interrupted else 'completed before the interruption'} after {interrupted_requests} requests")
+
+		process = run_extraction(extraction_argv + ["--resume"], fake, output_arg)
+		process.wait()
+		differences = compare_outputs(output_file, os.path.join(output_dir, os.path.basename(output_file)))
+	finally:
+		if not config.OUTPUT:
+			shutil.rmtree(output_dir, ignore_errors=True)
+	if differences:
+		logger.warning(f"The resumed extraction differs from the clean run: {differences}")
+	return {
+		"interrupt_after": config.INTERRUPT_AFTER,
+		"interrupted": interrupted,
+		"interrupted_requests": interrupted_requests,
+		"resumed_requests": fake.snapshot()["requests"] - start_requests - interrupted_requests,
+		"resume_exit_code": process.returncode,
+		"differences": differences
+	}
+
+def serve():
+	"""
+	Run the fake Redmine in the foreground until Ctrl-C.
+
+	Returns:
+		None
+	"""
+	fake = server.FakeRedmine(dataset.generate())
+	print("Fake Redmine listening on " + config.BOLD + fake.url + config.END + " (Ctrl-C to stop)")
+	try:
+		fake.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		fake.server_close()
+		logger.info(f"Fake Redmine served {fake.snapshot()}")
+
+def run(extraction_argv):
+	"""
+	Run an extraction against a fake Redmine and measure it.
+
+	The extraction is configured from extraction_argv like extract_from_redmine.py, with the URL of the
+	fake Redmine and an output in config.OUTPUT, or in a temporary directory removed afterwards.
+	With config.INTERRUPT_AFTER, the extraction is then interrupted and resumed, see check_resume().
+
+	Args:
+		extraction_argv (list): The options given to the extraction, e.g., ["--workers=8"].
+
+	Returns:
+		dict: The report of the run: its settings, wall time, requests, records and bytes.
+	"""
+	data = dataset.generate()
+	fake = server.FakeRedmine(data)
+	fake.start()
+	output_dir = config.OUTPUT or tempfile.mkdtemp(prefix="redmine_benchmark_")
+	try:
+		args = extraction_cli.parse_args(["-a", "benchmark", "-u", fake.url, "-s", "redmine_data.json"] + extraction_argv)
+		args["url"] = fake.url
+		args["output"] = os.path.join(output_dir, os.path.basename(args["output"]))
+		output_file = extraction_cli.configure(args)
+
+		logger.info(f"Benchmarking the extraction with {extraction_argv} into {output_dir}")
+		start = time.perf_counter()
+		fetcher.fetch_all_data(output_file)
+		wall_time = time.perf_counter() - start
+
+		stats = fake.snapshot()
+		records = count_records(output_file)
+		report = {
+			"created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+			"extraction_options": extraction_argv,
+			"dataset": {
+				"projects": config.PROJECTS,
+				"issues": config.ISSUES,
+				"users": config.USERS,
+				"time_entries": config.TIME_ENTRIES,
+				"wiki_pages": config.WIKI_PAGES,
+				"files": config.FILES,
+				"file_size": config.FILE_SIZE,
+				"seed": config.SEED
+			},
+			"server": {
+				"latency_ms": config.LATENCY * 1000,
+				"jitter_ms": config.LATENCY_JITTER * 1000,
+				"error_rate": config.ERROR_RATE,
+				"throttle_rate": config.THROTTLE_RATE,
+				"listing_includes": config.LISTING_INCLUDES
+			},
+			"wall_time": round(wall_time, 3),
+			"requests": stats["requests"],
+			"requests_per_second": round(stats["requests"] / wall_time, 2),
+			"records": records,
+			"records_per_second": round(records / wall_time, 2),
+			"bytes_sent": stats["bytes_sent"],
+			"output_bytes": directory_size(output_dir),
+			"statuses": stats["statuses"],
+			"kinds": stats["kinds"],
+			"failed_requests": len(fetcher.failed_requests)
+		}
+		if config.INTERRUPT_AFTER is not None:
+			report["resume"] = check_resume(extraction_argv, fake, args, output_file)
+	finally:
+		fake.stop()
+		if not config.OUTPUT:
+			shutil.rmtree(output_dir, ignore_errors=True)
+	logger.info(f"Benchmark report: {report}")
+	return report
+
+def save_report(report, report_file):
+	"""
+	Save a report as JSON.
+
+	Args:
+		report (dict): The report returned by run().
+		report_file (str): The file to write.
+
+	Returns:
+		None
+	"""
+	report_dir = os.path.dirname(report_file)
+	if report_dir:
+		os.makedirs(report_dir, exist_ok=True)
+	with open(report_file, "w", encoding="utf-8") as file:
+		json.dump(report, file, indent=4)
+	logger.info(f"Benchmark report saved to {report_file}")
+	print("Report saved to " + config.BOLD + report_file + config.END)
+
+def load_report(report_file):
+	"""
+	Load a report saved by a previous run.
+
+	Args:
+		report_file (str): The file to read.
+
+	Returns:
+		dict: The report.
+	"""
+	with open(report_file, encoding="utf-8") as file:
+		return json.load(file)
+
+def print_report(report, previous=None):
+	"""
+	Print the results of a run, next to the ones of a previous run if given.
+
+	Args:
+		report (dict): The report returned by run().
+		previous (dict, optional): A previous report to compare with. Defaults to None.
+
+	Returns:
+		None
+	"""
+	rows = [
+		("Wall time (s)", "wall_time"),
+		("Requests", "requests"),
+		("Requests/s", "requests_per_second"),
+		("Records", "records"),
+		("Records/s", "records_per_second"),
+		("Bytes sent", "bytes_sent"),
+		("Output bytes", "output_bytes"),
+		("Failed requests", "failed_requests")
+	]
+	print(config.BOLD + "Extraction benchmark" + config.END + f" {' '.join(report['extraction_options']) or '(default options)'}")
+	if previous:
+		print(f"\t{'':<18}{'this run':>14}{'previous':>14}{'change':>10}")
+	for label, key in rows:
+		line = f"\t{label:<18}{report[key]:>14}"
+		if previous and key in previous:
+			change = f"{(report[key] - previous[key]) / previous[key] * 100:+.1f}%" if previous[key] else ""
+			line += f"{previous[key]:>14}{change:>10}"
+		print(line)
+	print(f"\t{'Answers':<18}" + ", ".join(f"{status}: {count}" for status, count in report["statuses"].items()))
+	if "resume" in report:
+		resume = report["resume"]
+		if not resume["interrupted"]:
+			print(config.BOLD + "Warning: " + config.END + f"The extraction completed before {resume['interrupt_after']} requests, nothing was resumed")
+		elif resume["differences"] or resume["resume_exit_code"]:
+			print(config.BOLD + "Error: " + config.END + f"The extraction interrupted after {resume['interrupted_requests']} requests and resumed does not match the clean run: {', '.join(resume['differences']) or 'the resume failed'}")
+		else:
+			print(f"\t{'Resume':<18}interrupted after {resume['interrupted_requests']} requests, resumed with {resume['resumed_requests']}, same output as the clean run")
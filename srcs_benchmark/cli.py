@@ -0,0 +1,144 @@
+import getopt
+import sys
+from srcs_benchmark import config, logger
+from srcs_extraction.cli import parse_size
+
+COUNT_OPTIONS = {
+	"--projects": "projects",
+	"--issues": "issues",
+	"--users": "users",
+	"--time-entries": "time_entries",
+	"--wiki-pages": "wiki_pages",
+	"--files": "files",
+	"--seed": "seed",
+	"--retry-after": "retry_after",
+	"--port": "port",
+	"--interrupt-after": "interrupt_after"
+}
+RATE_OPTIONS = {
+	"--error-rate": "error_rate",
+	"--throttle-rate": "throttle_rate"
+}
+MILLISECONDS_OPTIONS = {
+	"--latency": "latency",
+	"--jitter": "latency_jitter"
+}
+
+def exit_with_error(message):
+	"""
+	Report an invalid argument, print the usage and exit.
+
+	Args:
+		message (str): What is wrong with the argument.
+
+	Returns:
+		None
+	"""
+	logger.error(f"{message} Exiting.")
+	print(config.BOLD + "Error: " + config.END + message)
+	print(config.TXT_USAGE)
+	sys.exit(2)
+
+def parse_args(argv):
+	"""
+	Parse command-line arguments and return them as a dictionary.
+
+	The arguments after "--" are kept as the options of the extraction.
+
+	Args:
+		argv (list): List of argument.
+
+	Returns:
+		dict: Parsed arguments as a dictionary.
+	"""
+	args = {
+		"projects": config.PROJECTS,
+		"issues": config.ISSUES,
+		"users": config.USERS,
+		"time_entries": config.TIME_ENTRIES,
+		"wiki_pages": config.WIKI_PAGES,
+		"files": config.FILES,
+		"file_size": config.FILE_SIZE,
+		"seed": config.SEED,
+		"latency": config.LATENCY,
+		"latency_jitter": config.LATENCY_JITTER,
+		"error_rate": config.ERROR_RATE,
+		"throttle_rate": config.THROTTLE_RATE,
+		"retry_after": config.RETRY_AFTER,
+		"listing_includes": list(config.LISTING_INCLUDES),
+		"serve": config.SERVE,
+		"host": config.HOST,
+		"port": config.PORT,
+		"output": config.OUTPUT,
+		"report": config.REPORT,
+		"compare": config.COMPARE,
+		"interrupt_after": config.INTERRUPT_AFTER,
+		"extraction_options": []
+	}
+
+	try:
+		opts, args["extraction_options"] = getopt.getopt(
+			argv, "ho:r:c:", ["help", "projects=", "issues=", "users=", "time-entries=", "wiki-pages=", "files=", "file-size=", "seed=", "latency=", "jitter=", "error-rate=", "throttle-rate=", "retry-after=", "listing-includes=", "serve", "host=", "port=", "output=", "report=", "compare=", "interrupt-after="]
+		)
+	except getopt.GetoptError as e:
+		logger.error(f"Argument parsing error: {e}")
+		logger.info("Displaying usage information.")
+		print(config.BOLD + "Error: " + config.END + str(e))
+		print(config.TXT_USAGE)
+		sys.exit(1)
+
+	for opt, arg in opts:
+		if opt in ("-h", "--help"):
+			logger.info("Help requested. Displaying usage and help information.")
+			print(config.TXT_USAGE + "\n" + config.TXT_HELP)
+			sys.exit(0)
+		elif opt in COUNT_OPTIONS:
+			if not arg.isdigit():
+				exit_with_error(f"{opt} must be a positive integer or 0, got \"{arg}\".")
+			args[COUNT_OPTIONS[opt]] = int(arg)
+			logger.debug(f"{opt} set to: {arg}")
+		elif opt in RATE_OPTIONS:
+			try:
+				args[RATE_OPTIONS[opt]] = float(arg)
+				if not 0 <= args[RATE_OPTIONS[opt]] <= 1:
+					raise ValueError(arg)
+			except ValueError:
+				exit_with_error(f"{opt} must be a number between 0 and 1, got \"{arg}\".")
+			logger.debug(f"{opt} set to: {arg}")
+		elif opt in MILLISECONDS_OPTIONS:
+			try:
+				args[MILLISECONDS_OPTIONS[opt]] = float(arg) / 1000
+				if args[MILLISECONDS_OPTIONS[opt]] < 0:
+					raise ValueError(arg)
+			except ValueError:
+				exit_with_error(f"{opt} must be a positive number of milliseconds, got \"{arg}\".")
+			logger.debug(f"{opt} set to: {arg} ms")
+		elif opt == "--file-size":
+			args["file_size"] = parse_size(arg)
+			if args["file_size"] is None:
+				exit_with_error(f"File size must be a positive size in bytes (e.g: 64K, 1M), got \"{arg}\".")
+			logger.debug(f"File size set to: {args['file_size']} bytes")
+		elif opt == "--listing-includes":
+			args["listing_includes"] = [include.strip() for include in arg.split(",") if include.strip()]
+			logger.debug(f"Listing includes set to: {args['listing_includes']}")
+		elif opt == "--serve":
+			args["serve"] = True
+			logger.debug("Serve only enabled")
+		elif opt == "--host":
+			args["host"] = arg
+			logger.debug(f"Host set to: {arg}")
+		elif opt in ("-o", "--output"):
+			args["output"] = arg
+			logger.debug(f"Output set to: {arg}")
+		elif opt in ("-r", "--report"):
+			args["report"] = arg
+			logger.debug(f"Report file set to: {arg}")
+		elif opt in ("-c", "--compare"):
+			args["compare"] = arg
+			logger.debug(f"Compare file set to: {arg}")
+
+	if args["projects"] < 1:
+		exit_with_error("At least one project is needed.")
+
+	logger.info("Arguments successfully parsed.")
+	return args
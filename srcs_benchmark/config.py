@@ -0,0 +1,98 @@
+PROJECTS = 10
+ISSUES = 2000
+USERS = 50
+TIME_ENTRIES = 2000
+NEWS = 20
+WIKI_PAGES = 5
+FILES = 2
+FILE_SIZE = 64 * 1024
+SEED = 42
+HOST = "127.0.0.1"
+PORT = 0
+LATENCY = 0.02
+LATENCY_JITTER = 0.01
+ERROR_RATE = 0.0
+THROTTLE_RATE = 0.0
+RETRY_AFTER = 1
+LISTING_INCLUDES = ["attachments", "relations"]
+MAX_LIMIT = 100
+SERVE = False
+OUTPUT = None
+REPORT = None
+COMPARE = None
+INTERRUPT_AFTER = None
+
+BOLD = "\x1B[1m"
+ITALIC = "\x1B[3m"
+END = "\x1B[0m"
+
+TXT_USAGE = BOLD + "Usage: " + END + "(e.g)\n\
+\tpython3 benchmark_extraction.py " + ITALIC + "-h --issues=<ISSUES> --latency=<MS> --error-rate=<RATE> -- <EXTRACTION_OPTIONS>" + END + "\n\
+\tOR\n\
+\tpython3 benchmark_extraction.py " + ITALIC + "--serve --port=<PORT> --projects=<PROJECTS> --issues=<ISSUES>" + END
+
+TXT_HELP = BOLD + "Options: " + END + "\n\
+\t" + BOLD + "-h, -help" + END + "\n\
+\t\tPrint this help paragraph.\n\n\
+\t" + BOLD + "-- EXTRACTION_OPTIONS" + END + " (optional)\n\
+\t\tEverything after " + ITALIC + "--" + END + " is given to the extraction, as to " + ITALIC + "extract_from_redmine.py" + END + ", e.g: " + ITALIC + "-- --workers=8 --adaptive" + END + ".\n\
+\t\tThe API key, the URL and the output are set by the benchmark.\n\n\
+\t" + BOLD + "--projects=PROJECTS" + END + " (optional)\n\
+\t\tUse to set the number of generated projects.\n\
+\t\tDefault: " + ITALIC + "10" + END + "\n\n\
+\t" + BOLD + "--issues=ISSUES" + END + " (optional)\n\
+\t\tUse to set the number of generated issues, spread over the projects.\n\
+\t\tDefault: " + ITALIC + "2000" + END + "\n\n\
+\t" + BOLD + "--users=USERS" + END + " (optional)\n\
+\t\tUse to set the number of generated users.\n\
+\t\tDefault: " + ITALIC + "50" + END + "\n\n\
+\t" + BOLD + "--time-entries=TIME_ENTRIES" + END + " (optional)\n\
+\t\tUse to set the number of generated time entries.\n\
+\t\tDefault: " + ITALIC + "2000" + END + "\n\n\
+\t" + BOLD + "--wiki-pages=PAGES" + END + " (optional)\n\
+\t\tUse to set the number of wiki pages of each project.\n\
+\t\tDefault: " + ITALIC + "5" + END + "\n\n\
+\t" + BOLD + "--files=FILES" + END + " (optional)\n\
+\t\tUse to set the number of files of each project.\n\
+\t\tDefault: " + ITALIC + "2" + END + "\n\n\
+\t" + BOLD + "--file-size=BYTES" + END + " (optional)\n\
+\t\tUse to set the size of the files and attachments, with an optional K, M or G suffix.\n\
+\t\tDefault: " + ITALIC + "64K" + END + "\n\n\
+\t" + BOLD + "--seed=SEED" + END + " (optional)\n\
+\t\tUse to set the seed of the generated data and of the injected failures, so runs can be compared.\n\
+\t\tDefault: " + ITALIC + "42" + END + "\n\n\
+\t" + BOLD + "--latency=MS" + END + " (optional)\n\
+\t\tUse to set the time the server waits before answering each request, in milliseconds.\n\
+\t\tDefault: " + ITALIC + "20" + END + "\n\n\
+\t" + BOLD + "--jitter=MS" + END + " (optional)\n\
+\t\tUse to set the random variation added to the latency, in milliseconds.\n\
+\t\tDefault: " + ITALIC + "10" + END + "\n\n\
+\t" + BOLD + "--error-rate=RATE" + END + " (optional)\n\
+\t\tUse to set the share of requests answered with a 500 or 503 error, between 0 and 1.\n\
+\t\tDefault: " + ITALIC + "0" + END + "\n\n\
+\t" + BOLD + "--throttle-rate=RATE" + END + " (optional)\n\
+\t\tUse to set the share of requests answered with a 429 and a Retry-After header, between 0 and 1.\n\
+\t\tDefault: " + ITALIC + "0" + END + "\n\n\
+\t" + BOLD + "--retry-after=SECONDS" + END + " (optional)\n\
+\t\tUse to set the Retry-After header of the 429 answers.\n\
+\t\tDefault: " + ITALIC + "1" + END + "\n\n\
+\t" + BOLD + "--listing-includes=INCLUDES" + END + " (optional)\n\
+\t\tUse to set which includes the issues listing honours, separated by commas, like a given Redmine version.\n\
+\t\tDefault: " + ITALIC + "attachments,relations" + END + "\n\n\
+\t" + BOLD + "--serve" + END + " (optional)\n\
+\t\tUse to only run the server until Ctrl-C, e.g. to extract from it by hand.\n\n\
+\t" + BOLD + "--host=HOST" + END + " (optional)\n\
+\t\tUse to set the address the server listens on.\n\
+\t\tDefault: " + ITALIC + "127.0.0.1" + END + "\n\n\
+\t" + BOLD + "--port=PORT" + END + " (optional)\n\
+\t\tUse to set the port the server listens on, a free one is picked by default.\n\n\
+\t" + BOLD + "-o, --output=OUTPUT" + END + " (optional)\n\
+\t\tUse to keep the extraction in this output instead of a temporary directory removed after the run.\n\n\
+\t" + BOLD + "-r, --report=REPORT_FILE" + END + " (optional)\n\
+\t\tUse to save the results of the run as JSON, e.g: " + ITALIC + "--report=benchmarks/workers_8.json" + END + ".\n\n\
+\t" + BOLD + "-c, --compare=REPORT_FILE" + END + " (optional)\n\
+\t\tUse to print the results next to the ones of a previous report.\n\n\
+\t" + BOLD + "--interrupt-after=REQUESTS" + END + " (optional)\n\
+\t\tUse to check the resume after the run: the extraction is run again in another process, interrupted like Ctrl-C once the\n\
+\t\tserver answered REQUESTS of its requests, resumed with " + ITALIC + "--resume" + END + ", and what it wrote is compared with the run,\n\
+\t\te.g: " + ITALIC + "--interrupt-after=150 -- --journals --workers=1" + END + "."
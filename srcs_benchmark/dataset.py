@@ -0,0 +1,249 @@
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from srcs_benchmark import config, logger
+
+START_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+END_DATE = datetime(2024, 12, 31, tzinfo=timezone.utc)
+TRACKERS = [{"id": 1, "name": "Bug"}, {"id": 2, "name": "Feature"}, {"id": 3, "name": "Support"}]
+STATUSES = [
+	{"id": 1, "name": "New", "is_closed": False},
+	{"id": 2, "name": "In Progress", "is_closed": False},
+	{"id": 3, "name": "Resolved", "is_closed": False},
+	{"id": 4, "name": "Feedback", "is_closed": False},
+	{"id": 5, "name": "Closed", "is_closed": True},
+	{"id": 6, "name": "Rejected", "is_closed": True}
+]
+PRIORITIES = [{"id": 1, "name": "Low"}, {"id": 2, "name": "Normal"}, {"id": 3, "name": "High"}, {"id": 4, "name": "Urgent"}]
+ACTIVITIES = [{"id": 8, "name": "Design"}, {"id": 9, "name": "Development"}, {"id": 10, "name": "Testing"}]
+ROLES = [{"id": 3, "name": "Manager"}, {"id": 4, "name": "Developer"}, {"id": 5, "name": "Reporter"}]
+RELATION_TYPES = ["relates", "duplicates", "blocks", "precedes", "copied_to"]
+WORDS = ("redmine jira migration issue project version release server client request answer page "
+	"export import user report field status priority tracker comment update fix crash slow login").split()
+
+def timestamp(date):
+	"""
+	Format a date the way the Redmine API does.
+
+	Args:
+		date (datetime): The date to format.
+
+	Returns:
+		str: The date, e.g., 2024-01-31T12:00:00Z.
+	"""
+	return date.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def file_content(attachment_id, size):
+	"""
+	Generate the content of a file, the same for the same attachment ID and size.
+
+	Args:
+		attachment_id (int): The ID of the attachment.
+		size (int): The size of the file in bytes.
+
+	Returns:
+		bytes: The content of the file.
+	"""
+	pattern = hashlib.sha256(str(attachment_id).encode()).digest()
+	return (pattern * (size // len(pattern) + 1))[:size]
+
+def generate():
+	"""
+	Generate a Redmine dataset, of the size set in config, always the same for the same config.SEED.
+
+	Returns:
+		dict: The records of the listings by endpoint, the sub-resources of the projects by project ID
+		and of the issues by issue ID, and the attachments by ID.
+	"""
+	rng = random.Random(config.SEED)
+	span = (END_DATE - START_DATE).total_seconds()
+
+	def text(words):
+		return " ".join(rng.choice(WORDS) for _ in range(words))
+
+	def date_between(start, end=END_DATE):
+		return start + timedelta(seconds=rng.uniform(0, max((end - start).total_seconds(), 0)))
+
+	def ref(record, name_key="name"):
+		return {"id": record["id"], "name": record[name_key]}
+
+	attachments = {}
+
+	def attachment(container_date, author):
+		attachment_id = len(attachments) + 1
+		size = max(1, int(config.FILE_SIZE * rng.uniform(0.5, 1.5)))
+		attachments[attachment_id] = {
+			"id": attachment_id,
+			"filename": f"{rng.choice(WORDS)}_{attachment_id}.bin",
+			"filesize": size,
+			"content_type": "application/octet-stream",
+			"description": text(3),
+			"digest": hashlib.sha256(file_content(attachment_id, size)).hexdigest(),
+			"author": author,
+			"created_on": timestamp(date_between(container_date))
+		}
+		return attachments[attachment_id]
+
+	users = []
+	for user_id in range(1, config.USERS + 1):
+		created = date_between(START_DATE)
+		users.append({
+			"id": user_id,
+			"login": f"user{user_id}",
+			"admin": user_id == 1,
+			"firstname": rng.choice(WORDS).capitalize(),
+			"lastname": f"User{user_id}",
+			"mail": f"user{user_id}@example.com",
+			"created_on": timestamp(created),
+			"last_login_on": timestamp(date_between(created))
+		})
+		users[-1]["name"] = f"{users[-1]['firstname']} {users[-1]['lastname']}"
+	user_refs = [ref(user) for user in users] or [{"id": 1, "name": "Anonymous"}]
+
+	projects = []
+	memberships, versions, issue_categories, files, wiki_pages = {}, {}, {}, {}, {}
+	for project_id in range(1, config.PROJECTS + 1):
+		created = START_DATE + timedelta(days=project_id)
+		project = {
+			"id": project_id,
+			"name": f"Project {project_id}",
+			"identifier": f"project-{project_id}",
+			"description": text(12),
+			"status": 1,
+			"is_public": True,
+			"created_on": timestamp(created),
+			"updated_on": timestamp(date_between(created))
+		}
+		projects.append(project)
+		memberships[project_id] = [
+			{"id": project_id * 100 + index, "project": ref(project), "user": user, "roles": [rng.choice(ROLES)]}
+			for index, user in enumerate(rng.sample(user_refs, min(len(user_refs), 5)))
+		]
+		versions[project_id] = [
+			{"id": project_id * 10 + index, "project": ref(project), "name": f"{index + 1}.0", "status": rng.choice(["open", "locked", "closed"]),
+			 "due_date": date_between(created).strftime("%Y-%m-%d"), "sharing": "none", "created_on": timestamp(created), "updated_on": timestamp(created)}
+			for index in range(3)
+		]
+		issue_categories[project_id] = [
+			{"id": project_id * 10 + index, "project": ref(project), "name": rng.choice(WORDS).capitalize()}
+			for index in range(2)
+		]
+		files[project_id] = [dict(attachment(created, rng.choice(user_refs)), version=ref(rng.choice(versions[project_id]))) for _ in range(config.FILES)]
+		wiki_pages[project_id] = {}
+		for index in range(config.WIKI_PAGES):
+			title = "Wiki" if index == 0 else f"Page_{index}"
+			page_created = date_between(created)
+			wiki_pages[project_id][title] = {
+				"title": title,
+				"parent": {"title": "Wiki"} if index else None,
+				"text": f"h1. {title}\n\n{text(200)}",
+				"version": rng.randint(1, 12),
+				"author": rng.choice(user_refs),
+				"comments": text(4),
+				"created_on": timestamp(page_created),
+				"updated_on": timestamp(date_between(page_created)),
+				"attachments": [attachment(page_created, rng.choice(user_refs))] if rng.random() < 0.2 else []
+			}
+
+	issues = []
+	relations, journals, issue_attachments = {}, {}, {}
+	for issue_id in range(1, config.ISSUES + 1):
+		project = projects[rng.randrange(len(projects))] if projects else {"id": 0, "name": "None"}
+		created = START_DATE + timedelta(seconds=span * issue_id / (config.ISSUES + 1))
+		updated = date_between(created, min(created + timedelta(days=400), END_DATE))
+		status = rng.choice(STATUSES)
+		issue = {
+			"id": issue_id,
+			"project": ref(project),
+			"tracker": rng.choice(TRACKERS),
+			"status": {"id": status["id"], "name": status["name"], "is_closed": status["is_closed"]},
+			"priority": rng.choice(PRIORITIES),
+			"author": rng.choice(user_refs),
+			"subject": text(6).capitalize(),
+			"description": text(rng.randint(10, 120)),
+			"start_date": created.strftime("%Y-%m-%d"),
+			"due_date": None,
+			"done_ratio": 100 if status["is_closed"] else rng.choice([0, 10, 50, 80]),
+			"is_private": False,
+			"estimated_hours": rng.choice([None, 1.0, 4.0, 8.0]),
+			"created_on": timestamp(created),
+			"updated_on": timestamp(updated),
+			"closed_on": timestamp(updated) if status["is_closed"] else None
+		}
+		if rng.random() < 0.7:
+			issue["assigned_to"] = rng.choice(user_refs)
+		if versions.get(project["id"]) and rng.random() < 0.5:
+			issue["fixed_version"] = ref(rng.choice(versions[project["id"]]))
+		issues.append(issue)
+		relations[issue_id] = []
+		if issue_id > 1 and rng.random() < 0.2:
+			relations[issue_id].append({"id": issue_id, "issue_id": issue_id, "issue_to_id": rng.randint(1, issue_id - 1),
+				"relation_type": rng.choice(RELATION_TYPES), "delay": None})
+		issue_attachments[issue_id] = [attachment(created, issue["author"])] if rng.random() < 0.1 else []
+		journals[issue_id] = []
+		journal_date = created
+		previous_status = STATUSES[0]
+		for index in range(rng.randint(0, 4)):
+			journal_date = date_between(journal_date, updated)
+			next_status = status if index == 0 else rng.choice(STATUSES)
+			details = []
+			if next_status["id"] != previous_status["id"]:
+				details.append({"property": "attr", "name": "status_id", "old_value": str(previous_status["id"]), "new_value": str(next_status["id"])})
+				previous_status = next_status
+			journals[issue_id].append({
+				"id": issue_id * 10 + index,
+				"user": rng.choice(user_refs),
+				"notes": text(rng.randint(0, 30)),
+				"created_on": timestamp(journal_date),
+				"private_notes": False,
+				"details": details
+			})
+
+	time_entries = []
+	for entry_id in range(1, config.TIME_ENTRIES + 1):
+		issue = issues[rng.randrange(len(issues))] if issues else None
+		spent = date_between(START_DATE)
+		time_entries.append({
+			"id": entry_id,
+			"project": issue["project"] if issue else ref(projects[0]) if projects else {"id": 0, "name": "None"},
+			"issue": {"id": issue["id"]} if issue else None,
+			"user": rng.choice(user_refs),
+			"activity": rng.choice(ACTIVITIES),
+			"hours": rng.choice([0.25, 0.5, 1.0, 1.5, 2.0, 4.0, 8.0]),
+			"comments": text(rng.randint(0, 8)),
+			"spent_on": spent.strftime("%Y-%m-%d"),
+			"created_on": timestamp(spent),
+			"updated_on": timestamp(date_between(spent, min(spent + timedelta(days=30), END_DATE)))
+		})
+
+	news = []
+	for news_id in range(1, config.NEWS + 1):
+		project = rng.choice(projects) if projects else {"id": 0, "name": "None"}
+		news.append({
+			"id": news_id,
+			"project": ref(project),
+			"author": rng.choice(user_refs),
+			"title": text(5).capitalize(),
+			"summary": text(10),
+			"description": text(60),
+			"created_on": timestamp(date_between(START_DATE))
+		})
+
+	logger.info(f"Generated {len(projects)} projects, {len(issues)} issues, {len(users)} users, {len(time_entries)} time entries, "
+				f"{len(news)} news and {len(attachments)} attachments with seed {config.SEED}")
+	return {
+		"projects": projects,
+		"issues": issues,
+		"users": users,
+		"time_entries": time_entries,
+		"news": news,
+		"memberships": memberships,
+		"versions": versions,
+		"issue_categories": issue_categories,
+		"files": files,
+		"wiki_pages": wiki_pages,
+		"relations": relations,
+		"journals": journals,
+		"issue_attachments": issue_attachments,
+		"attachments": attachments
+	}
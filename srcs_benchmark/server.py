@@ -0,0 +1,394 @@
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
+from srcs_benchmark import config, dataset, logger
+
+LISTINGS = {
+	"/projects.json": "projects",
+	"/issues.json": "issues",
+	"/users.json": "users",
+	"/time_entries.json": "time_entries",
+	"/news.json": "news"
+}
+DEFAULT_SORTS = {"issues": "id:desc", "time_entries": "spent_on:desc"}
+
+def matches_date(value, condition):
+	"""
+	Check a date or a timestamp against a Redmine date filter, e.g., >=2024-01-01 or ><2024-01-01|2024-01-31.
+
+	A condition on a date only compares the date of timestamps.
+
+	Args:
+		value (str): The date or timestamp of the record.
+		condition (str): The filter, with an optional >=, <= or >< operator.
+
+	Returns:
+		bool: True if the record matches.
+	"""
+	if not value:
+		return False
+
+	def bound(limit):
+		return value[:len(limit)] if len(limit) == 10 else value
+
+	if condition.startswith("><"):
+		start, _, end = condition[2:].partition("|")
+		return bound(start) >= start and bound(end) <= end
+	if condition.startswith(">="):
+		return bound(condition[2:]) >= condition[2:]
+	if condition.startswith("<="):
+		return bound(condition[2:]) <= condition[2:]
+	return bound(condition.removeprefix("=")) == condition.removeprefix("=")
+
+def matches_id(value, condition):
+	"""
+	Check an ID against a Redmine integer filter, e.g., 1,2,3 or ><100|200 or >=100.
+
+	Args:
+		value (int): The ID of the record.
+		condition (str): The IDs separated by commas, or a >=, <= or >< operator.
+
+	Returns:
+		bool: True if the record matches.
+	"""
+	if condition.startswith("><"):
+		start, _, end = condition[2:].partition("|")
+		return int(start) <= value <= int(end)
+	if condition.startswith(">="):
+		return value >= int(condition[2:])
+	if condition.startswith("<="):
+		return value <= int(condition[2:])
+	return value in {int(issue_id) for issue_id in condition.removeprefix("=").split(",") if issue_id.strip()}
+
+def matches_status(issue, condition):
+	"""
+	Check an issue against the status_id filter, open issues only by default like Redmine.
+
+	Args:
+		issue (dict): The issue.
+		condition (str): "open", "closed", "*" or status IDs separated by "|".
+
+	Returns:
+		bool: True if the issue matches.
+	"""
+	if condition == "*":
+		return True
+	if condition == "open":
+		return not issue["status"]["is_closed"]
+	if condition == "closed":
+		return issue["status"]["is_closed"]
+	return str(issue["status"]["id"]) in condition.split("|")
+
+class FakeRedmine(ThreadingHTTPServer):
+	"""
+	A local HTTP server answering like the Redmine REST API, from a generated dataset.
+
+	Every request waits config.LATENCY (plus a random jitter), and can be answered with an injected
+	500/503 error or a 429 with a Retry-After header, at the rates set in config. JSON answers carry an
+	ETag and honour If-None-Match, downloads honour Range requests. What was served is counted in stats.
+	"""
+
+	daemon_threads = True
+
+	def __init__(self, data, host=None, port=None):
+		super().__init__((host or config.HOST, config.PORT if port is None else port), RequestHandler)
+		self.data = data
+		self.issues_by_id = {issue["id"]: issue for issue in data["issues"]}
+		self.projects_by_key = {}
+		for project in data["projects"]:
+			self.projects_by_key[str(project["id"])] = project
+			self.projects_by_key[project["identifier"]] = project
+		self.random = random.Random(config.SEED)
+		self.lock = threading.Lock()
+		self.thread = None
+		self.stats = {"requests": 0, "bytes_sent": 0, "statuses": Counter(), "kinds": Counter()}
+
+	@property
+	def url(self):
+		"""
+		str: The base URL to give to the extraction.
+		"""
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}/"
+
+	def start(self):
+		"""
+		Serve the requests on a background thread.
+
+		Returns:
+			None
+		"""
+		self.thread = threading.Thread(target=self.serve_forever, name="fake-redmine", daemon=True)
+		self.thread.start()
+		logger.info(f"Fake Redmine listening on {self.url}")
+
+	def stop(self):
+		"""
+		Stop serving and release the port.
+
+		Returns:
+			None
+		"""
+		self.shutdown()
+		self.server_close()
+		if self.thread:
+			self.thread.join()
+		logger.info("Fake Redmine stopped")
+
+	def draw(self):
+		"""
+		Draw the latency and the failure injected into a request.
+
+		Returns:
+			tuple: (latency in seconds, status to answer with or None).
+		"""
+		with self.lock:
+			latency = max(0.0, config.LATENCY + self.random.uniform(-config.LATENCY_JITTER, config.LATENCY_JITTER))
+			roll = self.random.random()
+			if roll < config.THROTTLE_RATE:
+				return latency, 429
+			if roll < config.THROTTLE_RATE + config.ERROR_RATE:
+				return latency, self.random.choice([500, 503])
+			return latency, None
+
+	def record(self, status, size, kind):
+		"""
+		Count an answer in the stats.
+
+		Args:
+			status (int): The HTTP status of the answer.
+			size (int): The bytes of the body.
+			kind (str): What was requested: listing, resource or download.
+
+		Returns:
+			None
+		"""
+		with self.lock:
+			self.stats["requests"] += 1
+			self.stats["bytes_sent"] += size
+			self.stats["statuses"][status] += 1
+			self.stats["kinds"][kind] += 1
+
+	def snapshot(self):
+		"""
+		Get a copy of the stats, with the statuses as strings so they can be saved as JSON.
+
+		Returns:
+			dict: The requests, bytes sent, and the answers by status and by kind.
+		"""
+		with self.lock:
+			return {
+				"requests": self.stats["requests"],
+				"bytes_sent": self.stats["bytes_sent"],
+				"statuses": {str(status): count for status, count in sorted(self.stats["statuses"].items())},
+				"kinds": dict(self.stats["kinds"])
+			}
+
+class RequestHandler(BaseHTTPRequestHandler):
+	"""
+	Answer one request of the Redmine REST API from the dataset of the server.
+	"""
+
+	protocol_version = "HTTP/1.1"
+	disable_nagle_algorithm = True
+	ROUTES = [
+		(re.compile(r"^/issues/(\d+)\.json$"), "issue"),
+		(re.compile(r"^/issues/(\d+)/relations\.json$"), "issue_relations"),
+		(re.compile(r"^/projects/([^/]+)/(memberships|versions|issue_categories)\.json$"), "project_resource"),
+		(re.compile(r"^/projects/([^/]+)/files\.json$"), "project_files"),
+		(re.compile(r"^/projects/([^/]+)/wiki/index\.json$"), "wiki_index"),
+		(re.compile(r"^/projects/([^/]+)/wiki/([^/]+)\.json$"), "wiki_page"),
+		(re.compile(r"^/attachments/download/(\d+)(?:/[^/]*)?$"), "download")
+	]
+
+	def log_message(self, format, *args):
+		logger.debug(f"{self.address_string()} {format % args}")
+
+	def do_GET(self):
+		url = urlparse(self.path)
+		self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+		kind = "listing" if url.path in LISTINGS else "download" if url.path.startswith("/attachments/download/") else "resource"
+
+		latency, failure = self.server.draw()
+		if latency:
+			time.sleep(latency)
+		if failure == 429:
+			return self.send_json(429, {"errors": ["Too many requests"]}, kind, {"Retry-After": str(config.RETRY_AFTER)})
+		if failure:
+			return self.send_json(failure, {"errors": ["Injected failure"]}, kind)
+
+		try:
+			if url.path in LISTINGS:
+				return self.listing(LISTINGS[url.path])
+			for pattern, name in self.ROUTES:
+				match = pattern.match(url.path)
+				if match:
+					return getattr(self, name)(*[unquote(group) for group in match.groups()])
+			return self.send_json(404, {"errors": ["Not found"]}, kind)
+		except LookupError:
+			return self.send_json(404, {"errors": ["Not found"]}, kind)
+		except ValueError as e:
+			return self.send_json(400, {"errors": [str(e)]}, kind)
+
+	def send_json(self, status, data, kind="resource", headers=None):
+		"""
+		Send a JSON answer, or a 304 when the ETag of a 200 answer matches If-None-Match.
+
+		Args:
+			status (int): The HTTP status.
+			data (dict): The body.
+			kind (str, optional): What was requested, for the stats. Defaults to "resource".
+			headers (dict, optional): Extra headers. Defaults to None.
+
+		Returns:
+			None
+		"""
+		body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+		headers = dict(headers or {})
+		if status == 200:
+			headers["ETag"] = f"\"{hashlib.md5(body).hexdigest()}\""
+			if self.headers.get("If-None-Match") == headers["ETag"]:
+				status, body = 304, b""
+		self.send_response(status)
+		for name, value in headers.items():
+			self.send_header(name, value)
+		if status != 304:
+			self.send_header("Content-Type", "application/json; charset=utf-8")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+		self.server.record(status, len(body), kind)
+
+	def page(self, key, records):
+		"""
+		Send a page of records, from the offset (or page) and limit of the query.
+
+		Args:
+			key (str): The key of the records in the answer, e.g., issues.
+			records (list): All the records matching the query.
+
+		Returns:
+			None
+		"""
+		limit = min(max(int(self.query.get("limit", 25)), 1), config.MAX_LIMIT)
+		offset = int(self.query.get("offset", (int(self.query.get("page", 1)) - 1) * limit))
+		self.send_json(200, {key: records[offset:offset + limit], "total_count": len(records), "offset": offset, "limit": limit}, "listing")
+
+	def includes(self):
+		return {include.strip() for include in self.query.get("include", "").split(",") if include.strip()}
+
+	def listing(self, key):
+		records = self.server.data[key]
+		query = self.query
+		if "project_id" in query and key in ("issues", "time_entries", "news"):
+			project = self.server.projects_by_key[query["project_id"]]
+			records = [record for record in records if record.get("project", {}).get("id") == project["id"]]
+		if key == "issues":
+			records = [issue for issue in records if matches_status(issue, query.get("status_id", "open"))]
+			if "issue_id" in query:
+				records = [issue for issue in records if matches_id(issue["id"], query["issue_id"])]
+		for field in ("created_on", "updated_on", "spent_on"):
+			if field in query:
+				records = [record for record in records if matches_date(record.get(field), query[field])]
+		if key == "time_entries":
+			if "from" in query:
+				records = [entry for entry in records if entry["spent_on"] >= query["from"]]
+			if "to" in query:
+				records = [entry for entry in records if entry["spent_on"] <= query["to"]]
+		if key in DEFAULT_SORTS:
+			for criterion in reversed(query.get("sort", DEFAULT_SORTS[key]).split(",") + ["id:desc"]):
+				field, _, order = criterion.partition(":")
+				records = sorted(records, key=lambda record: (record.get(field) is not None, "" if record.get(field) is None else record.get(field)), reverse=order == "desc")
+		if key == "issues":
+			includes = self.includes() & set(config.LISTING_INCLUDES)
+			records = [self.with_includes(issue, includes) for issue in records]
+		self.page(key, records)
+
+	def with_includes(self, issue, includes):
+		"""
+		Copy an issue with the associated data asked by the include parameter.
+
+		Args:
+			issue (dict): The issue.
+			includes (set): The associated data to add: relations, journals and/or attachments.
+
+		Returns:
+			dict: The issue with its associated data.
+		"""
+		if not includes:
+			return issue
+		issue = dict(issue)
+		data = self.server.data
+		if "relations" in includes:
+			issue["relations"] = data["relations"][issue["id"]]
+		if "journals" in includes:
+			issue["journals"] = data["journals"][issue["id"]]
+		if "attachments" in includes:
+			issue["attachments"] = [self.with_content_url(attachment) for attachment in data["issue_attachments"][issue["id"]]]
+		return issue
+
+	def with_content_url(self, attachment):
+		host = self.headers.get("Host") or f"{self.server.server_address[0]}:{self.server.server_address[1]}"
+		return dict(attachment, content_url=f"http://{host}/attachments/download/{attachment['id']}/{attachment['filename']}")
+
+	def issue(self, issue_id):
+		issue = self.server.issues_by_id[int(issue_id)]
+		self.send_json(200, {"issue": self.with_includes(issue, self.includes())})
+
+	def issue_relations(self, issue_id):
+		self.send_json(200, {"relations": self.server.data["relations"][int(issue_id)]})
+
+	def project_resource(self, project_key, resource):
+		project = self.server.projects_by_key[project_key]
+		self.page(resource, self.server.data[resource][project["id"]])
+
+	def project_files(self, project_key):
+		project = self.server.projects_by_key[project_key]
+		self.send_json(200, {"files": [self.with_content_url(file) for file in self.server.data["files"][project["id"]]]})
+
+	def wiki_index(self, project_key):
+		project = self.server.projects_by_key[project_key]
+		pages = self.server.data["wiki_pages"][project["id"]].values()
+		self.send_json(200, {"wiki_pages": [
+			{key: page[key] for key in ("title", "parent", "version", "created_on", "updated_on") if page.get(key) is not None}
+			for page in pages
+		]})
+
+	def wiki_page(self, project_key, title):
+		project = self.server.projects_by_key[project_key]
+		page = dict(self.server.data["wiki_pages"][project["id"]][title])
+		attachments = page.pop("attachments")
+		if "attachments" in self.includes():
+			page["attachments"] = [self.with_content_url(attachment) for attachment in attachments]
+		self.send_json(200, {"wiki_page": page})
+
+	def download(self, attachment_id):
+		attachment = self.server.data["attachments"][int(attachment_id)]
+		content = dataset.file_content(attachment["id"], attachment["filesize"])
+		status, start = 200, 0
+		range_header = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+		if range_header:
+			start = int(range_header[1])
+			if start >= len(content):
+				self.send_response(416)
+				self.send_header("Content-Range", f"bytes */{len(content)}")
+				self.send_header("Content-Length", "0")
+				self.end_headers()
+				self.server.record(416, 0, "download")
+				return
+			status = 206
+		body = content[start:]
+		self.send_response(status)
+		self.send_header("Content-Type", attachment["content_type"])
+		self.send_header("Content-Length", str(len(body)))
+		if status == 206:
+			self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+		self.end_headers()
+		self.wfile.write(body)
+		self.server.record(status, len(body), "download")
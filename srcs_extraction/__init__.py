@@ -10,7 +10,7 @@ logging.basicConfig(
     level=logging.NOTSET,
     format="%(asctime)s [%(levelname)s] %(message)s",
     handlers=[
-        logging.FileHandler(log_filename),
+        logging.FileHandler(log_filename, delay=True),
     ]
 )
 
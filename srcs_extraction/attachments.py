@@ -0,0 +1,278 @@
+import os
+import json
+import hashlib
+import threading
+import time
+import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from srcs_extraction import checkpoint, config, logger, session, telemetry, throttle
+
+_download_executor = None
+_download_executor_lock = threading.Lock()
+_blob_futures = {}
+_manifest = {}
+_store_lock = threading.Lock()
+
+def get_download_executor():
+	"""
+	Get the pool running the file downloads, create it if needed.
+
+	Downloads have their own pool so large files do not hold the workers of the API requests.
+
+	Returns:
+		ThreadPoolExecutor: Pool bounded to config.DOWNLOAD_WORKERS concurrent downloads.
+	"""
+	global _download_executor
+	with _download_executor_lock:
+		if _download_executor is None:
+			_download_executor = ThreadPoolExecutor(max_workers=config.DOWNLOAD_WORKERS, thread_name_prefix="redmine-download")
+			logger.info(f"Download pool started with {config.DOWNLOAD_WORKERS} workers")
+		return _download_executor
+
+def shutdown_download_executor():
+	"""
+	Cancel the queued downloads, wait for the running ones and release the download pool.
+
+	Returns:
+		None
+	"""
+	global _download_executor
+	with _download_executor_lock:
+		if _download_executor is not None:
+			_download_executor.shutdown(wait=True, cancel_futures=True)
+			_download_executor = None
+			logger.info("Download pool stopped")
+
+def file_digest(file_path, digest):
+	"""
+	Compute the digest of a file with the same algorithm as the one given by Redmine.
+
+	Redmine gives a MD5 digest before 4.2 and a SHA256 digest since.
+
+	Args:
+		file_path (str): The file to hash.
+		digest (str): The digest given by Redmine, used to pick the algorithm.
+
+	Returns:
+		str: The hexadecimal digest of the file, or None if the algorithm is unknown.
+	"""
+	algorithms = {32: hashlib.md5, 64: hashlib.sha256}
+	algorithm = algorithms.get(len(digest))
+	if algorithm is None:
+		return None
+	file_hash = algorithm()
+	with open(file_path, "rb") as file:
+		for chunk in iter(lambda: file.read(config.DOWNLOAD_CHUNK_SIZE), b""):
+			file_hash.update(chunk)
+	return file_hash.hexdigest()
+
+def verify_file(file_path, filesize=None, digest=None):
+	"""
+	Check a file against the size and digest given by Redmine.
+
+	Args:
+		file_path (str): The file to check.
+		filesize (int, optional): The expected size in bytes. Defaults to None.
+		digest (str, optional): The expected digest. Defaults to None.
+
+	Returns:
+		bool: True if the file exists and matches what is known of it.
+	"""
+	if not os.path.isfile(file_path):
+		return False
+	if filesize is not None and os.path.getsize(file_path) != filesize:
+		return False
+	if digest:
+		computed = file_digest(file_path, digest)
+		if computed is not None and computed != digest.lower():
+			return False
+	return True
+
+def download_file(content_url, file_path, filesize=None, digest=None):
+	"""
+	Stream a file to disk, resuming a partial download and verifying it before moving it in place.
+
+	The content is written in chunks to a ".part" file. If the connection drops, the download is
+	resumed with an HTTP Range request from what is already on disk, up to config.RETRIES times.
+	A file already present and matching the expected size and digest is not downloaded again.
+
+	Args:
+		content_url (str): The URL of the file content.
+		file_path (str): Where to write the file.
+		filesize (int, optional): The expected size in bytes. Defaults to None.
+		digest (str, optional): The expected digest. Defaults to None.
+
+	Returns:
+		bool: True if the file is on disk and verified, False otherwise.
+	"""
+	start = time.monotonic()
+	if verify_file(file_path, filesize, digest):
+		logger.info(f"{file_path} already downloaded and verified, skipping it")
+		telemetry.record_download(start, 0, "skipped")
+		return True
+
+	part_path = f"{file_path}.part"
+	attempt = 0
+	received = 0
+	while True:
+		downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+		headers = dict(config.HEADERS or {})
+		if downloaded:
+			headers["Range"] = f"bytes={downloaded}-"
+		try:
+			logger.info(f"Downloading file from {content_url}" + (f" from byte {downloaded}" if downloaded else ""))
+			response = session.get(content_url, headers=headers, stream=True, adaptive=False)
+			with response:
+				if response.status_code == 416 and downloaded:
+					logger.info(f"{part_path} is already complete")
+				elif response.status_code in (200, 206):
+					mode = "ab" if response.status_code == 206 else "wb"
+					with open(part_path, mode) as file:
+						for chunk in response.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
+							throttle.consume_bytes(len(chunk))
+							received += len(chunk)
+							file.write(chunk)
+				else:
+					logger.error(f"Failed to download file from {content_url}: Status Code {response.status_code}")
+					telemetry.record_download(start, received, "failed", content_url)
+					return False
+			break
+		except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError, requests.exceptions.Timeout) as e:
+			if attempt >= config.RETRIES:
+				logger.error(f"Error downloading file from {content_url}: {e}")
+				telemetry.record_download(start, received, "failed", content_url)
+				return False
+			attempt += 1
+			logger.warning(f"Download of {content_url} interrupted ({e}), resuming {attempt}/{config.RETRIES}")
+
+	if not verify_file(part_path, filesize, digest):
+		logger.error(f"Downloaded file from {content_url} does not match its size or digest, discarding it")
+		os.remove(part_path)
+		telemetry.record_download(start, received, "failed", content_url)
+		return False
+	os.replace(part_path, file_path)
+	telemetry.record_download(start, received, url=content_url)
+	logger.info(f"Successfully downloaded {file_path}")
+	return True
+
+def store_path(output_file):
+	"""
+	Get the directory of the attachments store, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the store.
+	"""
+	return os.path.join(os.path.dirname(output_file), "attachements")
+
+def blob_name(file):
+	"""
+	Get the name of the blob holding the content of a file, its digest when Redmine gives one.
+
+	Args:
+		file (dict): The file as listed by Redmine.
+
+	Returns:
+		str: The blob name, relative to the store.
+	"""
+	digest = (file.get("digest") or "").lower()
+	if digest:
+		return os.path.join("blobs", digest[:2], digest)
+	return os.path.join("blobs", "no-digest", str(file["id"]))
+
+def load_manifest(output_file):
+	"""
+	Load the manifest of the attachments store, so files of previous extractions are kept in it.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		None
+	"""
+	manifest_file = os.path.join(store_path(output_file), "manifest.json")
+	with _store_lock:
+		_blob_futures.clear()
+		_manifest.clear()
+		if os.path.exists(manifest_file):
+			with open(manifest_file, "r", encoding="utf-8") as file:
+				_manifest.update(json.load(file))
+			logger.info(f"Attachments manifest loaded from {manifest_file} with {len(_manifest)} file(s)")
+
+def save_manifest(output_file):
+	"""
+	Save the manifest of the attachments store.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		None
+	"""
+	with _store_lock:
+		if not _manifest:
+			return
+		manifest = dict(_manifest)
+	cleaned_path = store_path(output_file)
+	os.makedirs(cleaned_path, exist_ok=True)
+	checkpoint.atomic_write_json(os.path.join(cleaned_path, "manifest.json"), manifest)
+	logger.info(f"Attachments manifest saved with {len(manifest)} file(s)")
+
+def store_file(output_file, file):
+	"""
+	Download a file into the content-addressed store, once per blob.
+
+	A blob already present at its digest path was verified before being moved there, so it is
+	not downloaded again. Files sharing a digest share the same download.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		file (dict): The file as listed by Redmine.
+
+	Returns:
+		tuple: (blob name, Future resolving to True if the blob is on disk and verified).
+	"""
+	blob = blob_name(file)
+	blob_path = os.path.join(store_path(output_file), blob)
+	with _store_lock:
+		future = _blob_futures.get(blob)
+		if future is None:
+			if file.get("digest") and os.path.isfile(blob_path) and (file.get("filesize") is None or os.path.getsize(blob_path) == file["filesize"]):
+				logger.info(f"Blob {blob} already in the store, skipping {file['content_url']}")
+				future = Future()
+				future.set_result(True)
+			else:
+				os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+				future = get_download_executor().submit(download_file, file["content_url"], blob_path, file.get("filesize"), file.get("digest"))
+			_blob_futures[blob] = future
+		else:
+			logger.info(f"Blob {blob} already downloaded in this extraction, sharing it with {file['content_url']}")
+	return blob, future
+
+def register_file(project_id, file, blob, issue_id=None):
+	"""
+	Map a file of a project to its blob in the manifest.
+
+	Args:
+		project_id (int): The ID of the project owning the file.
+		file (dict): The file as listed by Redmine.
+		blob (str): The blob name, relative to the store.
+		issue_id (int, optional): The ID of the issue the file is attached to. Defaults to None.
+
+	Returns:
+		None
+	"""
+	entry = {
+		"project_id": project_id,
+		"file_id": file["id"],
+		"filename": file["filename"],
+		"blob": blob,
+		"filesize": file.get("filesize"),
+		"digest": file.get("digest")
+	}
+	if issue_id is not None:
+		entry["issue_id"] = issue_id
+	with _store_lock:
+		_manifest[f"{project_id}/{file['id']}"] = entry
@@ -0,0 +1,229 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import requests
+from srcs_extraction import config, logger
+
+_cache_path = None
+_entries = OrderedDict()
+_size = 0
+_hits = 0
+_misses = 0
+_cache_lock = threading.Lock()
+
+def cache_path(output_file):
+	"""
+	Get the directory of the HTTP cache, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the cache.
+	"""
+	return os.path.join(os.path.dirname(output_file), "http_cache")
+
+def cache_key(url, params=None, headers=None):
+	"""
+	Compute the key of a request in the cache, from its URL, its parameters and the API key used.
+
+	Args:
+		url (str): The URL requested.
+		params (dict, optional): Dictionary of query parameters. Defaults to None.
+		headers (dict, optional): Request headers, the API key is part of the key as it changes what Redmine answers. Defaults to None.
+
+	Returns:
+		str: The hexadecimal key.
+	"""
+	api_key = (headers or {}).get("X-Redmine-API-Key", "")
+	identity = json.dumps([url, sorted((str(name), str(value)) for name, value in (params or {}).items()), api_key])
+	return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+def entry_paths(key):
+	"""
+	Get the paths of the body and the metadata of a cache entry.
+
+	Args:
+		key (str): The key of the entry.
+
+	Returns:
+		tuple: (body path, metadata path).
+	"""
+	directory = os.path.join(_cache_path, key[:2])
+	return os.path.join(directory, f"{key}.body"), os.path.join(directory, f"{key}.meta.json")
+
+def open_cache(output_file):
+	"""
+	Open the HTTP cache when config.CACHE is set, indexing the entries of previous runs by last use.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		None
+	"""
+	global _cache_path, _size, _hits, _misses
+	with _cache_lock:
+		_entries.clear()
+		_size = 0
+		_hits = 0
+		_misses = 0
+		_cache_path = cache_path(output_file) if config.CACHE else None
+		if _cache_path is None:
+			return
+		os.makedirs(_cache_path, exist_ok=True)
+		found = []
+		for directory, _, files in os.walk(_cache_path):
+			for name in files:
+				if name.endswith(".body"):
+					key = name.removesuffix(".body")
+					body_path, meta_path = entry_paths(key)
+					if not os.path.exists(meta_path):
+						os.remove(body_path)
+						continue
+					size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+					found.append((os.path.getmtime(body_path), key, size))
+				elif name.endswith(".tmp"):
+					os.remove(os.path.join(directory, name))
+		for _, key, size in sorted(found):
+			_entries[key] = size
+			_size += size
+		logger.info(f"HTTP cache opened in {_cache_path} with {len(_entries)} response(s), {_size} bytes")
+		_evict()
+
+def close_cache():
+	"""
+	Log the use of the HTTP cache and close it.
+
+	Returns:
+		None
+	"""
+	global _cache_path
+	with _cache_lock:
+		if _cache_path is not None:
+			logger.info(f"HTTP cache closed: {_hits} response(s) reused, {_misses} fetched, {len(_entries)} cached, {_size} bytes")
+		_cache_path = None
+		_entries.clear()
+
+def conditional_headers(key, headers):
+	"""
+	Add the validators of a cached response to the headers of a request.
+
+	Args:
+		key (str): The key of the request.
+		headers (dict): The request headers.
+
+	Returns:
+		dict: The headers with If-None-Match and/or If-Modified-Since, or the headers unchanged if nothing is cached.
+	"""
+	with _cache_lock:
+		if _cache_path is None or key not in _entries:
+			return headers
+		_, meta_path = entry_paths(key)
+		try:
+			with open(meta_path, "r", encoding="utf-8") as file:
+				meta = json.load(file)
+		except (OSError, ValueError):
+			return headers
+	headers = dict(headers or {})
+	if meta.get("etag"):
+		headers["If-None-Match"] = meta["etag"]
+	if meta.get("last_modified"):
+		headers["If-Modified-Since"] = meta["last_modified"]
+	return headers
+
+def cached_response(key, response):
+	"""
+	Rebuild the cached response when the server answered 304 Not Modified.
+
+	Args:
+		key (str): The key of the request.
+		response (requests.Response): The 304 response received.
+
+	Returns:
+		requests.Response: A 200 response with the cached body, or None if the entry is gone.
+	"""
+	global _hits
+	with _cache_lock:
+		if _cache_path is None or key not in _entries:
+			return None
+		body_path, meta_path = entry_paths(key)
+		try:
+			with open(meta_path, "r", encoding="utf-8") as file:
+				meta = json.load(file)
+			with open(body_path, "rb") as file:
+				body = file.read()
+		except (OSError, ValueError):
+			return None
+		os.utime(body_path)
+		_entries.move_to_end(key)
+		_hits += 1
+	cached = requests.Response()
+	cached.status_code = 200
+	cached.reason = "OK"
+	cached.url = response.url
+	cached.headers.update(meta.get("headers", {}))
+	cached.encoding = meta.get("encoding")
+	cached.request = response.request
+	cached._content = body
+	return cached
+
+def store_response(key, response):
+	"""
+	Store a successful response that Redmine gave validators for, evicting the least recently used ones above config.CACHE_SIZE.
+
+	Args:
+		key (str): The key of the request.
+		response (requests.Response): The response to store.
+
+	Returns:
+		None
+	"""
+	global _size, _misses
+	if _cache_path is None or response.status_code != 200:
+		return
+	etag = response.headers.get("ETag")
+	last_modified = response.headers.get("Last-Modified")
+	if not etag and not last_modified:
+		return
+	meta = {
+		"url": response.url,
+		"etag": etag,
+		"last_modified": last_modified,
+		"encoding": response.encoding,
+		"headers": {name: value for name, value in response.headers.items() if name.lower() == "content-type"}
+	}
+	with _cache_lock:
+		if _cache_path is None:
+			return
+		body_path, meta_path = entry_paths(key)
+		os.makedirs(os.path.dirname(body_path), exist_ok=True)
+		with open(f"{body_path}.tmp", "wb") as file:
+			file.write(response.content)
+		with open(f"{meta_path}.tmp", "w", encoding="utf-8") as file:
+			json.dump(meta, file)
+		os.replace(f"{body_path}.tmp", body_path)
+		os.replace(f"{meta_path}.tmp", meta_path)
+		size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+		_size += size - _entries.pop(key, 0)
+		_entries[key] = size
+		_misses += 1
+		_evict()
+
+def _evict():
+	"""
+	Remove the least recently used entries until the cache fits in config.CACHE_SIZE. The caller holds the lock.
+
+	Returns:
+		None
+	"""
+	global _size
+	while _size > config.CACHE_SIZE and _entries:
+		key, size = _entries.popitem(last=False)
+		for path in entry_paths(key):
+			if os.path.exists(path):
+				os.remove(path)
+		_size -= size
+		logger.debug(f"HTTP cache entry {key} evicted")
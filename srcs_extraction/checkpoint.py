@@ -0,0 +1,211 @@
+import os
+import json
+import threading
+from srcs_extraction import compression, logger
+
+_journal = None
+_journal_lock = threading.Lock()
+_pages = {}
+_fan_outs = {}
+_endpoints = set()
+
+def journal_path(output_file):
+	"""
+	Get the path of the checkpoint journal, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the journal.
+	"""
+	return os.path.join(os.path.dirname(output_file), "extraction_journal.ndjson")
+
+def atomic_write_json(file_path, data):
+	"""
+	Write JSON data to a temporary file and move it over the target, so a crash never leaves a half-written file.
+
+	A file with a compression extension is written compressed and without indentation.
+
+	Args:
+		file_path (str): The file to write.
+		data (dict or list): The data to write.
+
+	Returns:
+		None
+	"""
+	compressed = compression.compression_of(file_path)
+	if compressed:
+		tmp_path = compression.strip_extension(file_path) + ".tmp" + compression.EXTENSIONS[compressed]
+		with compression.open_write(tmp_path) as file:
+			json.dump(data, file, ensure_ascii=False)
+	else:
+		tmp_path = f"{file_path}.tmp"
+		with open(tmp_path, "w", encoding="utf-8") as file:
+			json.dump(data, file, indent=4, ensure_ascii=False)
+			file.flush()
+			os.fsync(file.fileno())
+	os.replace(tmp_path, file_path)
+
+def open_journal(output_file, resume):
+	"""
+	Open the checkpoint journal, loading the completed units first when resuming.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		resume (bool): Keep and load the existing journal instead of starting a new one.
+
+	Returns:
+		None
+	"""
+	global _journal
+	_pages.clear()
+	_fan_outs.clear()
+	_endpoints.clear()
+	file_path = journal_path(output_file)
+	cleaned_path = os.path.dirname(file_path)
+	if cleaned_path:
+		os.makedirs(cleaned_path, exist_ok=True)
+
+	if resume and os.path.exists(file_path):
+		with open(file_path, "r", encoding="utf-8") as file:
+			for line in file:
+				try:
+					entry = json.loads(line)
+				except json.JSONDecodeError:
+					logger.warning(f"Ignoring a truncated line of the journal {file_path}")
+					continue
+				if entry["type"] == "page":
+					_pages[(entry["endpoint"], entry["offset"])] = entry
+				elif entry["type"] == "fan_out":
+					_fan_outs[(entry["kind"], entry["id"])] = entry["data"]
+				elif entry["type"] == "endpoint":
+					_endpoints.add(entry["endpoint"])
+		logger.info(f"Resuming from {file_path}: {len(_endpoints)} endpoint(s), {len(_pages)} page(s) and {len(_fan_outs)} fan-out(s) already completed")
+		print(f"Resuming: {len(_endpoints)} endpoint(s), {len(_pages)} page(s) and {len(_fan_outs)} project/issue fan-out(s) already completed")
+		_journal = open(file_path, "a", encoding="utf-8")
+	else:
+		_journal = open(file_path, "w", encoding="utf-8")
+		logger.info(f"Checkpoint journal started at {file_path}")
+
+def close_journal(output_file, completed):
+	"""
+	Close the checkpoint journal, deleting it once the extraction is completed.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		completed (bool): Whether the whole extraction is completed.
+
+	Returns:
+		None
+	"""
+	global _journal
+	with _journal_lock:
+		if _journal is None:
+			return
+		_journal.close()
+		_journal = None
+	if completed:
+		os.remove(journal_path(output_file))
+		logger.info("Extraction completed, checkpoint journal deleted")
+	else:
+		logger.info(f"Extraction interrupted, use --resume to continue from {journal_path(output_file)}")
+
+def _append(entry, sync=False):
+	"""
+	Append an entry to the journal.
+
+	Args:
+		entry (dict): The entry to append.
+		sync (bool, optional): Also wait for the entry to reach the disk. Defaults to False.
+
+	Returns:
+		None
+	"""
+	line = json.dumps(entry, ensure_ascii=False) + "\n"
+	with _journal_lock:
+		if _journal is None:
+			return
+		_journal.write(line)
+		_journal.flush()
+		if sync:
+			os.fsync(_journal.fileno())
+
+def record_page(endpoint, offset, data):
+	"""
+	Journal a completed page of a listing, with its whole response: only done with --journal-pages.
+
+	Args:
+		endpoint (str): The endpoint name.
+		offset (int): The offset of the page.
+		data (dict): The response of the page.
+
+	Returns:
+		None
+	"""
+	_append({"type": "page", "endpoint": endpoint, "offset": offset, "data": data})
+
+def completed_page(endpoint, offset):
+	"""
+	Get a page completed before the interruption.
+
+	Args:
+		endpoint (str): The endpoint name.
+		offset (int): The offset of the page.
+
+	Returns:
+		dict: The response of the page, or None if it has to be fetched.
+	"""
+	entry = _pages.get((endpoint, offset))
+	return entry["data"] if entry else None
+
+def record_fan_out(kind, record_id, data):
+	"""
+	Journal the completed fan-out of a project or an issue.
+
+	Args:
+		kind (str): The kind of record, e.g., projects or issues.
+		record_id (int): The ID of the record.
+		data (dict): The related data fetched for the record.
+
+	Returns:
+		None
+	"""
+	_append({"type": "fan_out", "kind": kind, "id": record_id, "data": data})
+
+def completed_fan_out(kind, record_id):
+	"""
+	Get the fan-out of a project or an issue completed before the interruption.
+
+	Args:
+		kind (str): The kind of record, e.g., projects or issues.
+		record_id (int): The ID of the record.
+
+	Returns:
+		dict: The related data of the record, or None if it has to be fetched.
+	"""
+	return _fan_outs.get((kind, record_id))
+
+def record_endpoint(endpoint):
+	"""
+	Journal an endpoint whose data is completed and saved.
+
+	Args:
+		endpoint (str): The endpoint name.
+
+	Returns:
+		None
+	"""
+	_append({"type": "endpoint", "endpoint": endpoint}, sync=True)
+
+def is_endpoint_completed(endpoint):
+	"""
+	Check whether an endpoint was completed and saved before the interruption.
+
+	Args:
+		endpoint (str): The endpoint name.
+
+	Returns:
+		bool: True if the endpoint does not have to be fetched again.
+	"""
+	return endpoint in _endpoints
@@ -1,6 +1,29 @@
 import getopt
 import sys
-from srcs_extraction import config, logger
+from srcs_extraction import compression, config, endpoints, logger, shard
+
+SIZE_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+def parse_size(value):
+	"""
+	Parse a size in bytes, with an optional K, M or G suffix.
+
+	Args:
+		value (str): The size to parse, e.g., 512K or 10M.
+
+	Returns:
+		int: The size in bytes, or None if the value is invalid.
+	"""
+	value = value.strip().upper().removesuffix("B")
+	multiplier = 1
+	if value and value[-1] in SIZE_UNITS:
+		multiplier = SIZE_UNITS[value[-1]]
+		value = value[:-1]
+	try:
+		size = int(float(value) * multiplier)
+	except ValueError:
+		return None
+	return size if size > 0 else None
 
 def parse_args(argv):
 	"""
@@ -17,13 +40,42 @@ def parse_args(argv):
 		"url": config.BASE_URL,
 		"single_file": False,
 		"multiple_files": False,
+		"ndjson": config.NDJSON,
+		"sqlite": config.SQLITE,
+		"normalize": config.NORMALIZE,
+		"compression": config.COMPRESSION,
+		"incremental": False,
+		"resume": False,
+		"journal_pages": config.JOURNAL_PAGES,
 		"output": "outputs/redmine_data.json",
-		"endpoints": []
+		"endpoints": [],
+		"endpoint_specs": [],
+		"workers": config.WORKERS,
+		"pages_in_flight": config.PAGES_IN_FLIGHT,
+		"download_workers": config.DOWNLOAD_WORKERS,
+		"retries": config.RETRIES,
+		"timeout": config.READ_TIMEOUT,
+		"includes": list(config.ISSUE_INCLUDES),
+		"wiki_attachments": config.WIKI_ATTACHMENTS,
+		"issue_attachments": config.ISSUE_ATTACHMENTS,
+		"journals": config.JOURNALS,
+		"sharded_issues": config.SHARDED_ISSUES,
+		"shard_size": config.SHARD_SIZE,
+		"windowed_time_entries": config.WINDOWED_TIME_ENTRIES,
+		"window_pages": config.WINDOW_PAGES,
+		"adaptive": config.ADAPTIVE,
+		"max_rps": config.MAX_RPS,
+		"max_bandwidth": config.MAX_BANDWIDTH,
+		"cache": config.CACHE,
+		"cache_size": config.CACHE_SIZE,
+		"prometheus": config.PROMETHEUS_FILE,
+		"plan": config.PLAN,
+		"shard": config.SHARD
 	}
 
 	try:
 		opts, _ = getopt.getopt(
-			argv, "hu:s:ma:e:", ["help", "url=", "single-file=", "multiple-files=", "api-key=", "endpoint="]
+			argv, "hu:s:ma:e:w:", ["help", "url=", "single-file=", "multiple-files=", "api-key=", "endpoint=", "endpoints-file=", "ndjson", "sqlite", "normalize", "compress=", "workers=", "pages-in-flight=", "sharded-issues", "shard-size=", "windowed-time-entries", "window-pages=", "download-workers=", "retries=", "timeout=", "include=", "wiki-attachments", "issue-attachments", "journals", "incremental", "resume", "journal-pages", "adaptive", "max-rps=", "max-bandwidth=", "cache", "cache-size=", "no-cache", "prometheus=", "plan", "shard="]
 		)
 	except getopt.GetoptError as e:
 		logger.error(f"Argument parsing error: {e}")
@@ -32,6 +84,7 @@ def parse_args(argv):
 		print(config.TXT_USAGE)
 		sys.exit(1)
 
+	no_cache = False
 	for opt, arg in opts:
 		if opt in ("-h", "--help"):
 			logger.info("Help requested. Displaying usage and help information.")
@@ -54,8 +107,180 @@ def parse_args(argv):
 				args["output"] = arg.removesuffix('.json')
 			logger.debug(f"Multiple files output prefix set to: {args['output']}")
 		elif opt in ("-e", "--endpoint"):
+			try:
+				endpoints.build_spec(arg)
+			except ValueError as e:
+				logger.error(f"Invalid endpoint: {arg} ({e}). Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Invalid endpoint \"{arg}\": {e}")
+				print(config.TXT_USAGE)
+				sys.exit(2)
 			args["endpoints"].append(arg)
 			logger.debug(f"Custom endpoint added: {arg}")
+		elif opt == "--endpoints-file":
+			try:
+				args["endpoint_specs"].extend(endpoints.load_endpoint_specs(arg))
+			except (OSError, ValueError) as e:
+				logger.error(f"Invalid endpoints file: {arg} ({e}). Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Invalid endpoints file \"{arg}\": {e}")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			logger.debug(f"Custom endpoints loaded from {arg}: {args['endpoint_specs']}")
+		elif opt == "--ndjson":
+			args["ndjson"] = True
+			logger.debug("NDJSON output enabled")
+		elif opt == "--sqlite":
+			args["sqlite"] = True
+			logger.debug("SQLite output enabled")
+		elif opt == "--normalize":
+			args["normalize"] = True
+			logger.debug("Normalized output enabled")
+		elif opt == "--compress":
+			if arg not in compression.EXTENSIONS:
+				logger.error(f"Invalid compression: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Compression must be one of {', '.join(compression.EXTENSIONS)}, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["compression"] = arg
+			logger.debug(f"Compression set to: {arg}")
+		elif opt in ("-w", "--workers"):
+			if not arg.isdigit() or int(arg) < 1:
+				logger.error(f"Invalid workers count: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Workers must be a positive integer, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["workers"] = int(arg)
+			logger.debug(f"Workers set to: {arg}")
+		elif opt == "--pages-in-flight":
+			if not arg.isdigit() or int(arg) < 1:
+				logger.error(f"Invalid pages in flight count: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Pages in flight must be a positive integer, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["pages_in_flight"] = int(arg)
+			logger.debug(f"Pages in flight set to: {arg}")
+		elif opt == "--sharded-issues":
+			args["sharded_issues"] = True
+			logger.debug("Sharded issues listing enabled")
+		elif opt == "--shard-size":
+			if not arg.isdigit() or int(arg) < 1:
+				logger.error(f"Invalid shard size: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Shard size must be a positive integer, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["shard_size"] = int(arg)
+			logger.debug(f"Shard size set to: {arg}")
+		elif opt == "--windowed-time-entries":
+			args["windowed_time_entries"] = True
+			logger.debug("Windowed time entries listing enabled")
+		elif opt == "--window-pages":
+			if not arg.isdigit() or int(arg) < 1:
+				logger.error(f"Invalid window pages count: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Window pages must be a positive integer, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["window_pages"] = int(arg)
+			logger.debug(f"Window pages set to: {arg}")
+		elif opt == "--download-workers":
+			if not arg.isdigit() or int(arg) < 1:
+				logger.error(f"Invalid download workers count: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Download workers must be a positive integer, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["download_workers"] = int(arg)
+			logger.debug(f"Download workers set to: {arg}")
+		elif opt == "--retries":
+			if not arg.isdigit():
+				logger.error(f"Invalid retries count: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Retries must be a positive integer or 0, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["retries"] = int(arg)
+			logger.debug(f"Retries set to: {arg}")
+		elif opt == "--timeout":
+			if not arg.isdigit() or int(arg) < 1:
+				logger.error(f"Invalid timeout: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Timeout must be a positive integer, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["timeout"] = int(arg)
+			logger.debug(f"Read timeout set to: {arg}")
+		elif opt == "--include":
+			for include in arg.split(","):
+				include = include.strip()
+				if include and include not in args["includes"]:
+					args["includes"].append(include)
+			logger.debug(f"Issues includes set to: {args['includes']}")
+		elif opt == "--journals":
+			args["journals"] = True
+			logger.debug("Journals extraction enabled")
+		elif opt == "--wiki-attachments":
+			args["wiki_attachments"] = True
+			logger.debug("Wiki attachments enabled")
+		elif opt == "--issue-attachments":
+			args["issue_attachments"] = True
+			logger.debug("Issue attachments enabled")
+		elif opt == "--incremental":
+			args["incremental"] = True
+			logger.debug("Incremental extraction enabled")
+		elif opt == "--resume":
+			args["resume"] = True
+			logger.debug("Resume enabled")
+		elif opt == "--journal-pages":
+			args["journal_pages"] = True
+			logger.debug("Journaling of the pages enabled")
+		elif opt == "--adaptive":
+			args["adaptive"] = True
+			logger.debug("Adaptive concurrency enabled")
+		elif opt == "--max-rps":
+			try:
+				args["max_rps"] = float(arg)
+				if args["max_rps"] <= 0:
+					raise ValueError(arg)
+			except ValueError:
+				logger.error(f"Invalid requests per second: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Max requests per second must be a positive number, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			logger.debug(f"Max requests per second set to: {arg}")
+		elif opt == "--max-bandwidth":
+			args["max_bandwidth"] = parse_size(arg)
+			if args["max_bandwidth"] is None:
+				logger.error(f"Invalid bandwidth: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Max bandwidth must be a positive size in bytes per second (e.g: 512K, 10M), got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			logger.debug(f"Max bandwidth set to: {args['max_bandwidth']} bytes/s")
+		elif opt == "--cache":
+			args["cache"] = True
+			logger.debug("HTTP cache enabled")
+		elif opt == "--cache-size":
+			args["cache_size"] = parse_size(arg)
+			if args["cache_size"] is None:
+				logger.error(f"Invalid cache size: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Cache size must be a positive size in bytes (e.g: 512M, 2G), got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			logger.debug(f"HTTP cache size set to: {args['cache_size']} bytes")
+		elif opt == "--no-cache":
+			no_cache = True
+			logger.debug("HTTP cache disabled")
+		elif opt == "--prometheus":
+			args["prometheus"] = arg
+			logger.debug(f"Prometheus textfile set to: {arg}")
+		elif opt == "--plan":
+			args["plan"] = True
+			logger.debug("Plan mode enabled")
+		elif opt == "--shard":
+			args["shard"] = shard.parse_shard(arg)
+			if args["shard"] is None:
+				logger.error(f"Invalid shard: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Shard must be INDEX/COUNT with 1 <= INDEX <= COUNT (e.g: 2/4), got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			logger.debug(f"Shard set to: {arg}")
+
+	if no_cache:
+		args["cache"] = False
 
 	if not args["api_key"]:
 		logger.error("Missing API key. Exiting.")
@@ -69,5 +294,92 @@ def parse_args(argv):
 		print(config.TXT_USAGE)
 		sys.exit(2)
 
+	if args["sqlite"] and (args["ndjson"] or args["multiple_files"]):
+		logger.error("SQLite output set with NDJSON or multiple files output. Exiting.")
+		print(config.BOLD + "Error: " + config.END + "You cannot use the SQLite output with the NDJSON or multiple files options.")
+		print(config.TXT_USAGE)
+		sys.exit(2)
+
+	if args["normalize"] and (args["sqlite"] or args["shard"]):
+		logger.error("Normalized output set with SQLite output or shard. Exiting.")
+		print(config.BOLD + "Error: " + config.END + "You cannot use the normalized output with the SQLite output or the shard option.")
+		print(config.TXT_USAGE)
+		sys.exit(2)
+
+	if args["shard"] and args["sqlite"]:
+		logger.error("Shard set with SQLite output. Exiting.")
+		print(config.BOLD + "Error: " + config.END + "You cannot use the SQLite output with the shard option, the shards are merged from JSON or NDJSON outputs.")
+		print(config.TXT_USAGE)
+		sys.exit(2)
+
+	if not compression.available(args["compression"] or compression.compression_of(args["output"])):
+		logger.error("zstd compression asked without the zstandard package. Exiting.")
+		print(config.BOLD + "Error: " + config.END + "zstd compression needs the zstandard package: pip install zstandard")
+		print(config.TXT_USAGE)
+		sys.exit(2)
+
 	logger.info("Arguments successfully parsed.")
 	return args
+
+def configure(args):
+	"""
+	Apply the parsed arguments to the configuration and register the custom endpoints.
+
+	Args:
+		args (dict): The arguments returned by parse_args().
+
+	Returns:
+		str: The output file, path, and/or prefix, without its compression extension.
+	"""
+	config.BASE_URL = args.get("url", config.BASE_URL)
+	config.HEADERS = {"X-Redmine-API-Key": args["api_key"]}
+
+	output_file = args.get("output", "outputs/redmine_data.json")
+	config.SINGLE_FILE = False if args["multiple_files"] else True
+	config.MULTIPLE_FILE = args["multiple_files"]
+	config.NDJSON = args["ndjson"]
+	config.SQLITE = args["sqlite"]
+	config.NORMALIZE = args["normalize"]
+	config.COMPRESSION = args["compression"] or compression.compression_of(output_file)
+	output_file = compression.strip_extension(output_file)
+	config.INCREMENTAL = args["incremental"]
+	config.RESUME = args["resume"]
+	config.JOURNAL_PAGES = args["journal_pages"]
+	config.WORKERS = args["workers"]
+	config.PAGES_IN_FLIGHT = args["pages_in_flight"]
+	config.SHARDED_ISSUES = args["sharded_issues"]
+	config.SHARD_SIZE = args["shard_size"]
+	config.WINDOWED_TIME_ENTRIES = args["windowed_time_entries"]
+	config.WINDOW_PAGES = args["window_pages"]
+	config.DOWNLOAD_WORKERS = args["download_workers"]
+	config.RETRIES = args["retries"]
+	config.READ_TIMEOUT = args["timeout"]
+	config.ISSUE_INCLUDES = args["includes"]
+	config.WIKI_ATTACHMENTS = args["wiki_attachments"]
+	config.ISSUE_ATTACHMENTS = args["issue_attachments"]
+	config.JOURNALS = args["journals"]
+	config.ADAPTIVE = args["adaptive"]
+	config.MAX_RPS = args["max_rps"]
+	config.MAX_BANDWIDTH = args["max_bandwidth"]
+	config.CACHE = args["cache"]
+	config.CACHE_SIZE = args["cache_size"]
+	config.PROMETHEUS_FILE = args["prometheus"]
+	config.PLAN = args["plan"]
+	config.SHARD = args["shard"]
+
+	logger.info(f"Configuration: BASE_URL={config.BASE_URL}, output_file={output_file}, "
+				f"SINGLE_FILE={config.SINGLE_FILE}, MULTIPLE_FILE={config.MULTIPLE_FILE}, NDJSON={config.NDJSON}, SQLITE={config.SQLITE}, NORMALIZE={config.NORMALIZE}, COMPRESSION={config.COMPRESSION}, INCREMENTAL={config.INCREMENTAL}, RESUME={config.RESUME}, JOURNAL_PAGES={config.JOURNAL_PAGES}, WORKERS={config.WORKERS}, PAGES_IN_FLIGHT={config.PAGES_IN_FLIGHT}, SHARDED_ISSUES={config.SHARDED_ISSUES}, SHARD_SIZE={config.SHARD_SIZE}, WINDOWED_TIME_ENTRIES={config.WINDOWED_TIME_ENTRIES}, WINDOW_PAGES={config.WINDOW_PAGES}, "
+				f"DOWNLOAD_WORKERS={config.DOWNLOAD_WORKERS}, "
+				f"RETRIES={config.RETRIES}, READ_TIMEOUT={config.READ_TIMEOUT}, "
+				f"ISSUE_INCLUDES={config.ISSUE_INCLUDES}, WIKI_ATTACHMENTS={config.WIKI_ATTACHMENTS}, ISSUE_ATTACHMENTS={config.ISSUE_ATTACHMENTS}, JOURNALS={config.JOURNALS}, ADAPTIVE={config.ADAPTIVE}, "
+				f"MAX_RPS={config.MAX_RPS}, MAX_BANDWIDTH={config.MAX_BANDWIDTH}, "
+				f"CACHE={config.CACHE}, CACHE_SIZE={config.CACHE_SIZE}, PROMETHEUS_FILE={config.PROMETHEUS_FILE}, PLAN={config.PLAN}, SHARD={config.SHARD}")
+
+	for endpoint in args.get("endpoints", []):
+		endpoints.add_custom_endpoint(endpoint)
+		logger.info(f"Custom endpoint added: {endpoint}")
+	for endpoint, options in args.get("endpoint_specs", []):
+		endpoints.add_custom_endpoint(endpoint, options)
+		logger.info(f"Custom endpoint added: {endpoint} with {options}")
+
+	return output_file
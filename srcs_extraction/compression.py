@@ -0,0 +1,180 @@
+import io
+import os
+import gzip
+import queue
+import threading
+from srcs_extraction import config, logger
+
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+CHUNK_SIZE = 1024 * 1024
+QUEUE_SIZE = 8
+
+def compression_of(file_path):
+	"""
+	Get the compression of a file from its extension.
+
+	Args:
+		file_path (str): The file to look at.
+
+	Returns:
+		str: "gzip", "zstd", or None if the file is not compressed.
+	"""
+	for compression, extension in EXTENSIONS.items():
+		if file_path.endswith(extension):
+			return compression
+	return None
+
+def strip_extension(file_path):
+	"""
+	Remove the compression extension of a file, if any.
+
+	Args:
+		file_path (str): The file to look at.
+
+	Returns:
+		str: The path without its compression extension.
+	"""
+	compression = compression_of(file_path)
+	return file_path.removesuffix(EXTENSIONS[compression]) if compression else file_path
+
+def output_path(file_path):
+	"""
+	Get the path an output is written to, with the extension of config.COMPRESSION.
+
+	Args:
+		file_path (str): The uncompressed path of the output.
+
+	Returns:
+		str: The path with its compression extension.
+	"""
+	return file_path + EXTENSIONS[config.COMPRESSION] if config.COMPRESSION else file_path
+
+def _zstandard():
+	"""
+	Import the optional zstandard package.
+
+	Returns:
+		module: The zstandard module.
+
+	Raises:
+		RuntimeError: If zstandard is not installed.
+	"""
+	try:
+		import zstandard
+	except ImportError:
+		raise RuntimeError("zstd compression needs the zstandard package: pip install zstandard")
+	return zstandard
+
+def available(compression):
+	"""
+	Check whether a compression can be used, zstd needing the optional zstandard package.
+
+	Args:
+		compression (str): "gzip" or "zstd".
+
+	Returns:
+		bool: True if the compression can be used.
+	"""
+	if compression != "zstd":
+		return True
+	try:
+		_zstandard()
+	except RuntimeError:
+		return False
+	return True
+
+class BackgroundWriter(io.RawIOBase):
+	"""
+	Compress what is written on a background thread, so compression overlaps with serialization.
+
+	Written chunks go through a bounded queue to a thread feeding the compressor. Closing the writer
+	waits for the thread, ends the compressed stream and syncs the file to disk.
+	"""
+
+	def __init__(self, file_path, compression, append=False):
+		super().__init__()
+		self.raw = open(file_path, "ab" if append else "wb")
+		if compression == "zstd":
+			self.stream = _zstandard().ZstdCompressor(level=3).stream_writer(self.raw, closefd=False)
+		else:
+			self.stream = gzip.GzipFile(fileobj=self.raw, mode="wb", compresslevel=6)
+		self.chunks = queue.Queue(maxsize=QUEUE_SIZE)
+		self.error = None
+		self.thread = threading.Thread(target=self._compress, name="redmine-compress", daemon=True)
+		self.thread.start()
+
+	def _compress(self):
+		while True:
+			chunk = self.chunks.get()
+			if chunk is None:
+				return
+			if self.error is None:
+				try:
+					self.stream.write(chunk)
+				except Exception as e:
+					self.error = e
+
+	def writable(self):
+		return True
+
+	def write(self, data):
+		if self.error is not None:
+			raise self.error
+		self.chunks.put(bytes(data))
+		return len(data)
+
+	def close(self):
+		if self.closed:
+			return
+		self.chunks.put(None)
+		self.thread.join()
+		try:
+			if self.error is None:
+				self.stream.close()
+				self.raw.flush()
+				os.fsync(self.raw.fileno())
+		finally:
+			self.raw.close()
+			super().close()
+		if self.error is not None:
+			raise self.error
+
+def open_write(file_path, append=False):
+	"""
+	Open a file for writing text, compressed on a background thread if its extension asks for it.
+
+	An appended compressed file gets a new gzip member or zstd frame, both read back as one stream.
+
+	Args:
+		file_path (str): The file to write.
+		append (bool, optional): Append to the file instead of replacing it. Defaults to False.
+
+	Returns:
+		io.TextIOWrapper: The file, closing it ends the compressed stream.
+	"""
+	compression = compression_of(file_path)
+	if compression is None:
+		return open(file_path, "a" if append else "w", encoding="utf-8")
+	writer = BackgroundWriter(file_path, compression, append)
+	logger.debug(f"Writing {file_path} with {compression} compression")
+	return io.TextIOWrapper(io.BufferedWriter(writer, CHUNK_SIZE), encoding="utf-8")
+
+def open_read(file_path, binary=False):
+	"""
+	Open a file for reading, decompressing it if its extension asks for it.
+
+	Args:
+		file_path (str): The file to read.
+		binary (bool, optional): Read bytes instead of text. Defaults to False.
+
+	Returns:
+		io.IOBase: The file.
+	"""
+	compression = compression_of(file_path)
+	if compression == "gzip":
+		file = gzip.open(file_path, "rb")
+	elif compression == "zstd":
+		file = io.BufferedReader(_zstandard().ZstdDecompressor().stream_reader(open(file_path, "rb"), read_across_frames=True, closefd=True), CHUNK_SIZE)
+	else:
+		file = open(file_path, "rb")
+	return file if binary else io.TextIOWrapper(file, encoding="utf-8")
@@ -1,16 +1,53 @@
 SINGLE_FILE = False
 MULTIPLE_FILE = False
+NDJSON = False
+SQLITE = False
+NORMALIZE = False
+COMPRESSION = None
+INCREMENTAL = False
+RESUME = False
+JOURNAL_PAGES = False
 BASE_URL = "http://localhost/"
 HEADERS = None
+WORKERS = 4
+PAGES_IN_FLIGHT = 8
+DOWNLOAD_WORKERS = 2
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+RETRIES = 5
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 60
+MAX_RETRY_AFTER = 300
+ISSUE_INCLUDES = ["relations"]
+WIKI_ATTACHMENTS = False
+ISSUE_ATTACHMENTS = False
+JOURNALS = False
+SHARDED_ISSUES = False
+SHARD_SIZE = 2000
+WINDOWED_TIME_ENTRIES = False
+WINDOW_PAGES = 5
+ADAPTIVE = False
+ADAPTIVE_INITIAL = 2
+ADAPTIVE_LATENCY_TOLERANCE = 2.0
+ADAPTIVE_COOLDOWN = 1.0
+ADAPTIVE_MIN_SAMPLES = 20
+MAX_RPS = None
+MAX_BANDWIDTH = None
+CACHE = False
+CACHE_SIZE = 512 * 1024 * 1024
+PROMETHEUS_FILE = None
+PLAN = False
+SHARD = None
 
 BOLD = "\x1B[1m"
 ITALIC = "\x1B[3m"
 END = "\x1B[0m"
 
 TXT_USAGE = BOLD + "Usage: " + END + "(e.g)\n\
-\tpython3 extract_redmine_data.py " + ITALIC + "-h -a <API_KEY> -u <URL> -s <SINGLE_OUTPUT_FILE> -m -e <ENDPOINT>" + END + "\n\
+\tpython3 extract_redmine_data.py " + ITALIC + "-h -a <API_KEY> -u <URL> -s <SINGLE_OUTPUT_FILE> -m -e <ENDPOINT> -w <WORKERS>" + END + "\n\
 \tOR\n\
-\tpython3 extract_redmine_data.py " + ITALIC + "--help --api-key=<API_KEY> --url=<URL> --single-file=<SINGLE_OUTPUT_FILE> --multiple-files=<MULTIPLE_OUTPUT_FILE> --endpoint=<ENDPOINT>" + END
+\tpython3 extract_redmine_data.py " + ITALIC + "--help --api-key=<API_KEY> --url=<URL> --single-file=<SINGLE_OUTPUT_FILE> --multiple-files=<MULTIPLE_OUTPUT_FILE> --endpoint=<ENDPOINT> --workers=<WORKERS>" + END
 
 TXT_HELP = BOLD + "Options: " + END + "\n\
 \t" + BOLD + "-h, -help" + END + "\n\
@@ -36,9 +73,114 @@ TXT_HELP = BOLD + "Options: " + END + "\n\
 \t\tUse to add an endpoint.\n\
 \t\tYou can call it multiple time in the command line. E.g: -e test --endpoint sample/test will retrieve all data from /test.json and /sample/test.json\n\
 \t\tBy deduction, you could also retrieve data from a specific endpoint, e.g: projects/3/issues will only retrieve issues from the project with id 3.\n\
+\t\tAn " + ITALIC + "{id}" + END + " placeholder fetches the endpoint once per record of the endpoint named before it, e.g: " + ITALIC + "projects/{id}/issue_categories" + END + " per project, or " + ITALIC + "groups/{id}" + END + " per group.\n\
 \t\tThe program already retrieve data from these endpoint (and can not be deactivate):\n\
 \t\t\t- /projects.json\n\
 \t\t\t- /issues.json\n\
 \t\t\t- /users.json\n\
 \t\t\t- /news.json\n\
-\t\t\t- /time_entries.json"
+\t\t\t- /time_entries.json\n\n\
+\t" + BOLD + "--endpoints-file=FILE" + END + " (optional)\n\
+\t\tUse to add endpoints described in a JSON file, a list of objects with a " + ITALIC + "path" + END + " and optionally a " + ITALIC + "name" + END + ", the " + ITALIC + "key" + END + " of the records in the answers,\n\
+\t\ttheir " + ITALIC + "pagination" + END + " (offset or none), their " + ITALIC + "parent" + END + " endpoint and their " + ITALIC + "concurrency" + END + ", e.g: " + ITALIC + "[{\"path\": \"groups/{id}\", \"concurrency\": 2}]" + END + ".\n\n\
+\t" + BOLD + "--ndjson" + END + " (optional)\n\
+\t\tUse to write the output as NDJSON, one record per line, each endpoint being written once fetched instead of rewriting the whole output.\n\
+\t\tThe output file gets a .ndjson extension, e.g: " + ITALIC + "redmine_data.ndjson" + END + ", or " + ITALIC + "test_data_issues.ndjson" + END + " in multiple files mode.\n\
+\t\tEach endpoint starts with a header line and ends with a footer line giving its number of records.\n\n\
+\t" + BOLD + "--sqlite" + END + " (optional)\n\
+\t\tUse to write the output into a SQLite database instead, with the .sqlite extension, e.g: " + ITALIC + "redmine_data.sqlite" + END + ".\n\
+\t\tEach entity has its table, with the raw JSON of the records and indexes on their id, project_id, issue_id and updated_on.\n\
+\t\tIt cannot be used with --ndjson or --multiple-files.\n\n\
+\t" + BOLD + "--normalize" + END + " (optional)\n\
+\t\tUse to write the references of the issues, time entries and news (project, tracker, status, author...) as their ID,\n\
+\t\tthe referenced objects being written once in lookup tables, under " + ITALIC + "lookups" + END + " in JSON or in the header of each NDJSON section.\n\
+\t\tIt cannot be used with --sqlite or --shard.\n\n\
+\t" + BOLD + "--compress=COMPRESSION" + END + " (optional)\n\
+\t\tUse to compress the output with " + ITALIC + "gzip" + END + " or " + ITALIC + "zstd" + END + ", adding the .gz or .zst extension to the output files.\n\
+\t\tIt is also picked from the extension of the single output file, e.g: " + ITALIC + "--single-file=redmine_data.json.gz" + END + ".\n\
+\t\tCompressed JSON is written without indentation. zstd needs the " + ITALIC + "zstandard" + END + " package.\n\n\
+\t" + BOLD + "--incremental" + END + " (optional)\n\
+\t\tUse to only fetch what changed since the previous extraction into the same output.\n\
+\t\tIssues and time entries updated since the last run are merged by id into the previous output,\n\
+\t\tprojects whose update date did not change keep their previous data.\n\
+\t\tThe watermarks are kept in " + ITALIC + "extraction_state.json" + END + " next to the output.\n\
+\t\t⚠ Records deleted from Redmine since the previous extraction are not removed.\n\n\
+\t" + BOLD + "--resume" + END + " (optional)\n\
+\t\tUse to continue an interrupted extraction (crash, Ctrl-C...) with the same options.\n\
+\t\tThe endpoints saved and the projects/issues sub-resources completed before the interruption are read back from\n\
+\t\t" + ITALIC + "extraction_journal.ndjson" + END + " next to the output instead of being fetched again.\n\n\
+\t" + BOLD + "--journal-pages" + END + " (optional)\n\
+\t\tUse to also journal every page of the listings, for " + ITALIC + "--resume" + END + " to skip the pages of the listing it was interrupted in.\n\
+\t\tEvery page is then written twice, to the journal and to the output: about twice the disk writes of the listings.\n\n\
+\t" + BOLD + "-w, --workers=WORKERS" + END + " (optional)\n\
+\t\tUse to set how many requests are sent to Redmine at the same time.\n\
+\t\tProjects and issues sub-resources (memberships, versions, wiki pages, relations...) are fetched concurrently.\n\
+\t\tDefault: " + ITALIC + "4" + END + "\n\
+\t\t⚠ Lower it if your Redmine server struggles to answer.\n\n\
+\t" + BOLD + "--pages-in-flight=PAGES" + END + " (optional)\n\
+\t\tUse to set how many pages of a same listing (issues, time entries...) can be requested at the same time.\n\
+\t\tOnce the first page gives the total count, the next pages are fetched concurrently and merged back in order.\n\
+\t\tDefault: " + ITALIC + "8" + END + "\n\n\
+\t" + BOLD + "--sharded-issues" + END + " (optional)\n\
+\t\tUse to list the issues project by project, and by ranges of issue IDs in the projects with more than --shard-size issues,\n\
+\t\tinstead of paging through the whole listing. The shallow queries are fetched concurrently and merged back by issue ID.\n\n\
+\t" + BOLD + "--shard-size=ISSUES" + END + " (optional)\n\
+\t\tUse to set how many issues a shard of --sharded-issues should hold at most.\n\
+\t\tDefault: " + ITALIC + "2000" + END + "\n\n\
+\t" + BOLD + "--windowed-time-entries" + END + " (optional)\n\
+\t\tUse to list the time entries in from/to date windows fetched concurrently, instead of paging through the whole listing.\n\
+\t\tThe windows are split until each one holds at most --window-pages pages, and merged back by time entry ID.\n\n\
+\t" + BOLD + "--window-pages=PAGES" + END + " (optional)\n\
+\t\tUse to set how many pages of 100 time entries a window of --windowed-time-entries should hold at most.\n\
+\t\tDefault: " + ITALIC + "5" + END + "\n\n\
+\t" + BOLD + "--download-workers=WORKERS" + END + " (optional)\n\
+\t\tUse to set how many files are downloaded at the same time, separately from the other requests.\n\
+\t\tFiles are streamed to disk, resumed if the connection drops and verified against their size and digest.\n\
+\t\tFiles already on disk and verified are not downloaded again.\n\
+\t\tDefault: " + ITALIC + "2" + END + "\n\n\
+\t" + BOLD + "--adaptive" + END + " (optional)\n\
+\t\tUse to adapt the number of requests in flight to how Redmine copes, up to --workers.\n\
+\t\tIt grows while the latency stays flat, and is halved on 429/503 answers, on timeouts or when the latency rises.\n\n\
+\t" + BOLD + "--max-rps=REQUESTS" + END + " (optional)\n\
+\t\tUse to cap the number of requests per second sent to Redmine, e.g: " + ITALIC + "--max-rps=5" + END + ".\n\n\
+\t" + BOLD + "--max-bandwidth=BYTES" + END + " (optional)\n\
+\t\tUse to cap the bytes per second downloaded from Redmine, with an optional K, M or G suffix, e.g: " + ITALIC + "--max-bandwidth=10M" + END + ".\n\n\
+\t" + BOLD + "--cache" + END + " (optional)\n\
+\t\tUse to keep the answers of Redmine in " + ITALIC + "http_cache/" + END + " next to the output, for repeated extractions.\n\
+\t\tThe next runs ask Redmine if each answer changed (ETag/Last-Modified) and reuse the cached one if not.\n\n\
+\t" + BOLD + "--cache-size=BYTES" + END + " (optional)\n\
+\t\tUse to set the maximum size of the cache, with an optional K, M or G suffix. The least recently used answers are removed first.\n\
+\t\tDefault: " + ITALIC + "512M" + END + "\n\n\
+\t" + BOLD + "--no-cache" + END + " (optional)\n\
+\t\tUse to disable the cache, even if --cache is given.\n\n\
+\t" + BOLD + "--prometheus=FILE" + END + " (optional)\n\
+\t\tUse to also write the metrics of the extraction in the Prometheus text format, e.g: " + ITALIC + "--prometheus=/var/lib/node_exporter/redmine.prom" + END + ".\n\
+\t\tThe requests, latencies, bytes, retries and errors by endpoint are always written to " + ITALIC + "extraction_report.json" + END + " next to the output.\n\n\
+\t" + BOLD + "--plan" + END + " (optional)\n\
+\t\tUse to only probe Redmine and print the requests, bytes and estimated wall time of the extraction with the given options.\n\
+\t\tThe plan is saved to " + ITALIC + "extraction_plan.json" + END + " next to the output, and the next extraction into it uses it for its progress bars.\n\n\
+\t" + BOLD + "--shard=INDEX/COUNT" + END + " (optional)\n\
+\t\tUse to only extract the projects of the shard INDEX of COUNT, e.g: " + ITALIC + "--shard=2/4" + END + ", with their issues, time entries and files.\n\
+\t\tThe projects are split by a hash of their ID, and the records without a project (e.g. users) go to the first shard.\n\
+\t\tThe outputs of all the shards are then merged with " + ITALIC + "merge_extractions.py" + END + ".\n\n\
+\t" + BOLD + "--retries=RETRIES" + END + " (optional)\n\
+\t\tUse to set how many times a request is retried after a timeout, a connection error or a 429/5xx answer.\n\
+\t\tRetries wait for the Retry-After header of the server, or an exponential backoff otherwise.\n\
+\t\tDefault: " + ITALIC + "5" + END + "\n\n\
+\t" + BOLD + "--timeout=SECONDS" + END + " (optional)\n\
+\t\tUse to set how long to wait for Redmine to answer a request before retrying it.\n\
+\t\tDefault: " + ITALIC + "60" + END + "\n\
+\t\tThe requests that still fail are listed in " + ITALIC + "failed_requests.json" + END + " next to the output.\n\n\
+\t" + BOLD + "--include=INCLUDES" + END + " (optional)\n\
+\t\tUse to ask the issues listing for more associated data, separated by commas, e.g: " + ITALIC + "--include=attachments,children" + END + ".\n\
+\t\tRelations are always included, they are only fetched issue by issue if your Redmine version ignores the include.\n\
+\t\tDefault: " + ITALIC + "relations" + END + "\n\n\
+\t" + BOLD + "--issue-attachments" + END + " (optional)\n\
+\t\tUse to also download the attachments of the issues into the attachments store, asked to the issues listing with the other includes.\n\
+\t\tThey are downloaded by the download workers while the extraction goes on, and become the attachments of the Jira issues.\n\n\
+\t" + BOLD + "--wiki-attachments" + END + " (optional)\n\
+\t\tUse to also download the attachments of the wiki pages into the attachments store.\n\
+\t\tThe wiki pages are saved in " + ITALIC + "wikis/<project_id>.json" + END + " next to the output, and only fetched again when their version changes.\n\n\
+\t" + BOLD + "--journals" + END + " (optional)\n\
+\t\tUse to also extract the history of the issues, with one request per issue as the issues listing of Redmine does not include it.\n\
+\t\tThe journals are saved in " + ITALIC + "journals/<project_id>.ndjson" + END + " next to the output, one issue per line, and become the Jira history."
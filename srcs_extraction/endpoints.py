@@ -1,4 +1,9 @@
-from srcs_extraction import logger
+import re
+import json
+from srcs_extraction import config, logger
+
+PAGINATIONS = ("offset", "none")
+SPEC_FIELDS = ("name", "path", "key", "pagination", "parent", "concurrency")
 
 endpoints = {
 	"projects": "/projects.json",
@@ -8,18 +13,163 @@ endpoints = {
 	"news": "/news.json"
 }
 
-def add_custom_endpoint(endpoint):
+specs = {
+	name: {"name": name, "path": path, "key": name, "pagination": "offset", "parent": None, "concurrency": None}
+	for name, path in endpoints.items()
+}
+
+def singular(name):
+	"""
+	Get the singular of a Redmine resource name, e.g., "groups" gives "group" and "issue_categories" gives "issue_category".
+
+	Args:
+		name (str): The plural name.
+
+	Returns:
+		str: The singular name.
+	"""
+	if name.endswith("ies"):
+		return name[:-3] + "y"
+	return name.removesuffix("s")
+
+def result_key(path):
+	"""
+	Guess the key holding the records in the answer of a path, from its last segment.
+
+	e.g. "/projects/3/issues.json" gives "issues", and "/groups/{id}.json", answered with a single group, gives "group".
+
+	Args:
+		path (str): The path of the endpoint.
+
+	Returns:
+		str: The key.
+	"""
+	segments = path.strip("/").removesuffix(".json").split("/")
+	if segments[-1] == "{id}" and len(segments) > 1:
+		return singular(segments[-2])
+	return segments[-1]
+
+def build_spec(endpoint, options=None):
+	"""
+	Build the spec of an endpoint, filling the fields not given from its path.
+
+	A path with an "{id}" placeholder is fetched once per record of its parent endpoint, the one named
+	before the placeholder, e.g., "projects/{id}/issue_categories" per project. A path ending with the
+	placeholder is a single resource, fetched without pagination.
+
+	Args:
+		endpoint (str): The path of the endpoint, e.g., "groups" or "/projects/{id}/issue_categories.json".
+		options (dict, optional): The fields of the spec given explicitly:
+			name (str): The name of the endpoint in the output. Defaults to the path without ".json".
+			key (str): The key holding the records in the answers. Defaults to the last segment of the path.
+			pagination (str): "offset" for the offset/limit pagination of Redmine, "none" for a single request.
+			parent (str): The endpoint whose records give the "{id}" of the path.
+			concurrency (int): The maximum number of pages or parents requested at the same time. Defaults to config.PAGES_IN_FLIGHT.
+
+	Returns:
+		dict: The spec.
+
+	Raises:
+		ValueError: If a field is unknown or invalid.
+	"""
+	options = dict(options or {})
+	unknown = set(options) - set(SPEC_FIELDS)
+	if unknown:
+		raise ValueError(f"Unknown field(s) {', '.join(sorted(unknown))} in the spec of {endpoint}")
+	name = endpoint.removeprefix("/").removesuffix(".json")
+	path = f"/{name}.json"
+	placeholders = re.findall(r"\{(\w*)\}", path)
+	if any(placeholder != "id" for placeholder in placeholders) or len(placeholders) > 1:
+		raise ValueError(f"{endpoint} can only hold one {{id}} placeholder")
+	segments = name.split("/")
+	parent = None
+	if placeholders:
+		index = segments.index("{id}")
+		if index == 0:
+			raise ValueError(f"{endpoint} needs the name of its parent endpoint before {{id}}")
+		parent = options.get("parent") or segments[index - 1]
+	elif options.get("parent"):
+		raise ValueError(f"{endpoint} has a parent but no {{id}} placeholder")
+	spec = {
+		"name": options.get("name") or name,
+		"path": path,
+		"key": options.get("key") or result_key(path),
+		"pagination": options.get("pagination") or ("none" if segments[-1] == "{id}" else "offset"),
+		"parent": parent,
+		"concurrency": options.get("concurrency")
+	}
+	if spec["pagination"] not in PAGINATIONS:
+		raise ValueError(f"Pagination of {endpoint} must be one of {', '.join(PAGINATIONS)}, got \"{spec['pagination']}\"")
+	if spec["concurrency"] is not None and (not isinstance(spec["concurrency"], int) or spec["concurrency"] < 1):
+		raise ValueError(f"Concurrency of {endpoint} must be a positive integer, got \"{spec['concurrency']}\"")
+	return spec
+
+def issue_params():
+	"""
+	Get the parameters of the issues listing: all statuses, and the includes with the attachments when
+	config.ISSUE_ATTACHMENTS is set. The journals are not asked for: the listing of Redmine ignores
+	include=journals, only honoured by /issues/{id}.json.
+
+	Returns:
+		dict: The parameters of the issues listing.
+	"""
+	params = {"status_id": "*"}
+	includes = list(config.ISSUE_INCLUDES)
+	if config.ISSUE_ATTACHMENTS and "attachments" not in includes:
+		includes.append("attachments")
+	if includes:
+		params["include"] = ",".join(includes)
+	return params
+
+def load_endpoint_specs(file_path):
+	"""
+	Load the specs of custom endpoints from a JSON file, a list of objects each with a "path" and the optional fields of build_spec().
+
+	e.g. [{"path": "projects/{id}/issue_categories", "concurrency": 4}, {"path": "groups/{id}", "key": "group"}]
+
+	Args:
+		file_path (str): The file to read.
+
+	Returns:
+		list: (path, options) for each endpoint, checked with build_spec().
+
+	Raises:
+		OSError: If the file cannot be read.
+		ValueError: If the file is not a list of valid specs.
+	"""
+	with open(file_path, encoding="utf-8") as file:
+		entries = json.load(file)
+	if not isinstance(entries, list):
+		raise ValueError(f"{file_path} must hold a list of endpoint specs")
+	loaded = []
+	for entry in entries:
+		if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+			raise ValueError(f"Every endpoint spec of {file_path} needs a \"path\", got {entry}")
+		options = {field: value for field, value in entry.items() if field != "path"}
+		build_spec(entry["path"], options)
+		loaded.append((entry["path"], options))
+	return loaded
+
+def add_custom_endpoint(endpoint, options=None):
 	"""
 	Add a custom endpoint dynamically.
 
+	The parent endpoint of a path with an "{id}" placeholder is added as well when it is not extracted yet.
+
 	Args:
-		endpoint (list): List of endpoint to add to the default one.
+		endpoint (str): The path of the endpoint to add to the default ones.
+		options (dict, optional): The fields of its spec given explicitly, see build_spec(). Defaults to None.
+
+	Raises:
+		ValueError: If the spec is invalid.
 	"""
 	try:
-		original_endpoint = endpoint
-		endpoint = endpoint.removeprefix("/").removesuffix(".json")
-		endpoints[endpoint] = f"/{endpoint}.json"
-		logger.info(f"Custom endpoint '{original_endpoint}' added as '{endpoints[endpoint]}'.")
+		spec = build_spec(endpoint, options)
+		if spec["parent"] and spec["parent"] not in specs:
+			add_custom_endpoint(spec["parent"])
+		specs[spec["name"]] = spec
+		endpoints[spec["name"]] = spec["path"]
+		logger.info(f"Custom endpoint '{endpoint}' added as {spec}.")
 	except Exception as e:
 		logger.error(f"Failed to add custom endpoint '{endpoint}': {e}")
 		raise
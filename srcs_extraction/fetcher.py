@@ -1,8 +1,51 @@
 import os
 import json
+import time
+import threading
 import requests
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
-from srcs_extraction import config, endpoints, logger
+from collections import deque
+from datetime import date, timedelta
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from functools import partial
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
+from srcs_extraction import attachments, cache, checkpoint, compression, config, endpoints, incremental, journals, logger, ndjson, normalize, planner, scheduler, session, shard, store, telemetry, throttle, wiki
+
+_executor = None
+_executor_lock = threading.Lock()
+failed_requests = []
+_failed_requests_lock = threading.Lock()
+stop_event = threading.Event()
+
+def check_stopped():
+	"""
+	Give up the current work if the extraction was interrupted, before sending another request.
+
+	The interruption is raised as a CancelledError, like the futures cancelled by the interruption, for
+	the callers to let both through instead of handling them as a failed request.
+
+	Returns:
+		None
+
+	Raises:
+		CancelledError: If stop_event is set.
+	"""
+	if stop_event.is_set():
+		raise CancelledError("Extraction interrupted")
+
+def record_failure(url, params, reason):
+	"""
+	Keep track of a request that could not be completed, to report it at the end of the extraction.
+
+	Args:
+		url (str): The URL that failed.
+		params (dict): The parameters of the request.
+		reason (str): Why the request failed.
+
+	Returns:
+		None
+	"""
+	with _failed_requests_lock:
+		failed_requests.append({"url": url, "params": params, "reason": reason})
 
 def fetch_data(endpoint, params=None):
 	"""
@@ -14,15 +57,20 @@ def fetch_data(endpoint, params=None):
 
 	Returns:
 		dict: The response data in JSON format, or None if an error occurs.
+
+	Raises:
+		CancelledError: If the extraction was interrupted.
 	"""
+	check_stopped()
 	url = f"{config.BASE_URL}{endpoint}"
 	try:
 		logger.info(f"Fetching data from {url} with params {params}")
-		response = requests.get(url, headers=config.HEADERS, params=params)
+		response = session.get(url, params=params)
 		response.raise_for_status()
 		logger.info(f"Data fetched successfully from {url}")
 		return response.json()
 	except requests.exceptions.HTTPError as http_err:
+		record_failure(url, params, str(http_err))
 		if response.status_code == 403:
 			logger.warning(f"Failed to fetch data from {url}: Unauthorized access")
 			print(config.BOLD + "Warning: " + config.END + f"Unauthorized access to \"{url}\" (closed project?)")
@@ -30,86 +78,659 @@ def fetch_data(endpoint, params=None):
 			logger.error(f"HTTP error occurred: {http_err}")
 			print(config.BOLD + "Error: " + config.END + f"{http_err}")
 		return None
+	except CancelledError:
+		raise
 	except Exception as err:
+		record_failure(url, params, str(err))
 		logger.error(f"Failed to fetch data from {url}: {err}")
 		print(config.BOLD + "Error: " + config.END + f"{err}")
 		return None
 
-def fetch_endpoint_data(endpoint, progress, task_id):
+def fetch_page(endpoint, offset, limit, extra_params=None, checkpoint_key=None):
+	"""
+	Fetch a single page of a paginated endpoint.
+
+	With config.JOURNAL_PAGES, the page is journaled, and pages completed before an interruption are
+	read back from the checkpoint journal.
+
+	Args:
+		endpoint (str): The endpoint to fetch data from.
+		offset (int): The offset of the first record of the page.
+		limit (int): The number of records per page.
+		extra_params (dict, optional): Parameters sent with the page, e.g., include. Defaults to None.
+		checkpoint_key (str, optional): The name of the listing in the checkpoint journal. Defaults to the endpoint.
+
+	Returns:
+		dict: The response data in JSON format, or None if an error occurs.
+	"""
+	checkpoint_key = checkpoint_key or endpoint
+	data = checkpoint.completed_page(checkpoint_key, offset)
+	if data is not None:
+		return data
+	params = {"offset": offset, "limit": limit}
+	if extra_params:
+		params.update(extra_params)
+	data = fetch_data(endpoint, params)
+	if data and config.JOURNAL_PAGES:
+		checkpoint.record_page(checkpoint_key, offset, data)
+	return data
+
+def map_bounded(function, items, max_in_flight):
+	"""
+	Call function(item) on the request pool for each item, with a cap on the calls in flight.
+
+	No call is submitted once the extraction is interrupted.
+
+	Args:
+		function (callable): The function to call.
+		items (iterable): The items to call the function on.
+		max_in_flight (int): The maximum number of calls submitted and not yet consumed.
+
+	Yields:
+		tuple: (item, result), in the order of items.
+	"""
+	executor = get_executor()
+	in_flight = deque()
+	for item in items:
+		if len(in_flight) >= max_in_flight:
+			done_item, future = in_flight.popleft()
+			yield done_item, future.result()
+		check_stopped()
+		in_flight.append((item, executor.submit(function, item)))
+	while in_flight:
+		done_item, future = in_flight.popleft()
+		yield done_item, future.result()
+
+def merge_pages(endpoint, pages, total_count):
+	"""
+	Merge pages in offset order, dropping the records seen twice because of records added during the run.
+
+	Args:
+		endpoint (str): The endpoint the pages come from, used for logging.
+		pages (list): The records of each page, in offset order.
+		total_count (int): The total_count announced by the first page, or None to skip the drift check.
+
+	Returns:
+		list: The merged records.
+	"""
+	all_data = []
+	seen_ids = set()
+	duplicates = 0
+	for page in pages:
+		for record in page:
+			record_id = record.get("id") if isinstance(record, dict) else None
+			if record_id is not None:
+				if record_id in seen_ids:
+					duplicates += 1
+					continue
+				seen_ids.add(record_id)
+			all_data.append(record)
+	if duplicates:
+		logger.warning(f"{duplicates} duplicated record(s) dropped from {endpoint}, records were added during the extraction")
+	if total_count is not None and len(all_data) != total_count:
+		logger.warning(f"{endpoint} announced {total_count} records but {len(all_data)} were fetched, records were added or removed during the extraction")
+	return all_data
+
+def fetch_endpoint_data(endpoint, progress, task_id, extra_params=None, on_page=None, spec=None):
 	"""
 	Fetch all data from a given endpoint.
 
+	Once the first page gives the total_count, the remaining pages are fetched concurrently,
+	at most config.PAGES_IN_FLIGHT at a time, or the concurrency of the spec, and merged back in offset order.
+
 	Args:
 		endpoint (str): The endpoint to fetch data from.
 		progress (Progress): The progress object to update the task progress.
 		task_id (TaskID): The ID of the task to update progress.
+		extra_params (dict, optional): Parameters sent with every page, e.g., include. Defaults to None.
+		on_page (callable, optional): Called with the records of each page, in offset order, as soon as it is fetched. Defaults to None.
+		spec (dict, optional): The spec of the endpoint, giving the key of the records. Defaults to the spec guessed from the endpoint.
 
 	Returns:
 		dict: All of the fetched data.
 	"""
-	all_data = []
-	offset = 0
 	limit = 100
-	total = None
+	total_count = None
+	failed_pages = 0
 
 	logger.info(f"Starting fetch for endpoint: {endpoint}")
-	key = endpoint.strip("/").split(".")[0]
+	spec = spec or endpoints.build_spec(endpoint)
+	key = spec["key"]
 
-	while True:
-		params = {"offset": offset, "limit": limit}
-		data = fetch_data(endpoint, params)
-		if data:
-			if total is None and "total_count" in data:
-				total = data["total_count"]
-				if key in ["projects", "issues"]:
-					total *= 7
-				progress.update(task_id, total=total)
-
-			fetched_data = data.get(key, [])
-			all_data.extend(fetched_data)
-			progress.update(task_id, advance=len(fetched_data))
-
-			if len(fetched_data) < limit:
-				break
-			offset += limit
-		else:
+	data = fetch_page(endpoint, 0, limit, extra_params)
+	if not data:
+		logger.warning(f"No data returned for {endpoint} at offset 0")
+		return []
+
+	pages = [data.get(key, [])]
+	progress.update(task_id, advance=len(pages[0]))
+	if on_page:
+		on_page(pages[0])
+	if "total_count" in data:
+		total_count = data["total_count"]
+		total = total_count
+		if key in ["projects", "issues"]:
+			total *= 7
+		progress.update(task_id, total=total)
+
+		offsets = range(limit, total_count, limit)
+		fetch_offset = lambda offset: fetch_page(endpoint, offset, limit, extra_params)
+		for offset, data in map_bounded(fetch_offset, offsets, spec["concurrency"] or config.PAGES_IN_FLIGHT):
+			if data:
+				pages.append(data.get(key, []))
+				progress.update(task_id, advance=len(pages[-1]))
+				if on_page:
+					on_page(pages[-1])
+			else:
+				logger.error(f"Page of {endpoint} at offset {offset} failed, skipping it")
+				print(config.BOLD + "Error: " + config.END + f"Page of \"{endpoint}\" at offset {offset} could not be fetched and was skipped")
+				pages.append([])
+				failed_pages += 1
+
+	offset = limit * len(pages)
+	while len(pages[-1]) >= limit:
+		data = fetch_page(endpoint, offset, limit, extra_params)
+		if not data:
 			logger.warning(f"No data returned for {endpoint} at offset {offset}")
 			break
+		pages.append(data.get(key, []))
+		progress.update(task_id, advance=len(pages[-1]))
+		if on_page:
+			on_page(pages[-1])
+		offset += limit
 
+	all_data = merge_pages(endpoint, pages, total_count if not failed_pages else None)
 	logger.info(f"Completed fetch for endpoint: {endpoint}, total records: {len(all_data)}")
 	return all_data
 
-def fetch_project_data(project_id, progress, task_id, output_file):
+def fetch_resource(spec, path):
+	"""
+	Fetch the records of one path of an endpoint spec, following its pagination.
+
+	Args:
+		spec (dict): The spec of the endpoint, see endpoints.build_spec().
+		path (str): The path to fetch, its "{id}" placeholder replaced.
+
+	Returns:
+		list: The records, a single resource being returned as a list of one record.
+	"""
+	if spec["pagination"] == "none":
+		data = fetch_data(path)
+		if data and spec["key"] not in data:
+			logger.warning(f"Answer of {path} has no {spec['key']}, check the key of the endpoint")
+		records = (data or {}).get(spec["key"])
+		if records is None:
+			return []
+		return records if isinstance(records, list) else [records]
+
+	records = []
+	offset = 0
+	limit = 100
+	while True:
+		data = fetch_page(path, offset, limit)
+		if not data:
+			break
+		if spec["key"] not in data:
+			logger.warning(f"Answer of {path} has no {spec['key']}, check the key of the endpoint")
+		page = data.get(spec["key"], [])
+		records.extend(page)
+		offset += limit
+		if len(page) < limit or offset >= data.get("total_count", offset + 1):
+			break
+	return records
+
+def fetch_child_data(spec, parent_ids, progress, task_id):
+	"""
+	Fetch an endpoint spec with an "{id}" placeholder once per record of its parent endpoint.
+
+	The parents are requested concurrently through the shared request pool, at most
+	config.PAGES_IN_FLIGHT at a time, or the concurrency of the spec, and their records are merged
+	in the order of the parents. The records of a paginated endpoint get the ID of their parent,
+	e.g., "project_id" for "projects/{id}/issue_categories", unless they already have it.
+
+	Args:
+		spec (dict): The spec of the endpoint, see endpoints.build_spec().
+		parent_ids (list): The IDs of the records of the parent endpoint.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+
+	Returns:
+		list: The records of all the parents.
+	"""
+	logger.info(f"Fetching {spec['path']} for {len(parent_ids)} record(s) of {spec['parent']}")
+	progress.update(task_id, total=len(parent_ids))
+	parent_field = f"{endpoints.singular(spec['parent'])}_id"
+	all_data = []
+	fetch_parent = lambda parent_id: fetch_resource(spec, spec["path"].replace("{id}", str(parent_id)))
+	for parent_id, records in map_bounded(fetch_parent, parent_ids, spec["concurrency"] or config.PAGES_IN_FLIGHT):
+		if spec["pagination"] == "offset":
+			for record in records:
+				if isinstance(record, dict):
+					record.setdefault(parent_field, parent_id)
+		all_data.extend(records)
+		progress.update(task_id, advance=1)
+	logger.info(f"Completed fetch for endpoint: {spec['path']}, total records: {len(all_data)}")
+	return all_data
+
+def shard_label(shard):
+	"""
+	Get the name of a shard, its filters as a query string.
+
+	Args:
+		shard (dict): The filters of the shard, e.g., {"project_id": 3}.
+
+	Returns:
+		str: The name of the shard, e.g., project_id=3.
+	"""
+	return "&".join(f"{name}={value}" for name, value in sorted(shard.items())) or "all"
+
+def fetch_shards(endpoint, shards, progress, task_id, extra_params=None, max_count=None, spec=None):
+	"""
+	Fetch the pages of several shards of a listing, each one a separate query paged from offset 0.
+
+	The first page of every shard is fetched first, then the remaining pages of all the shards,
+	all of them concurrently, at most config.PAGES_IN_FLIGHT at a time, or the concurrency of the spec.
+
+	Args:
+		endpoint (str): The endpoint to fetch data from.
+		shards (list): The filters of each shard, added to extra_params.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+		extra_params (dict, optional): Parameters sent with every page. Defaults to None.
+		max_count (int, optional): Only fetch the first page of the shards with more records. Defaults to None.
+		spec (dict, optional): The spec of the endpoint, giving the key of the records. Defaults to the spec guessed from the endpoint.
+
+	Returns:
+		list: (pages, total_count, failed_pages) of each shard, pages being the records of each page in offset order.
+	"""
+	limit = 100
+	spec = spec or endpoints.build_spec(endpoint)
+	key = spec["key"]
+	max_in_flight = spec["concurrency"] or config.PAGES_IN_FLIGHT
+	extra_params = extra_params or {}
+
+	def fetch_shard_page(task):
+		index, offset = task
+		return fetch_page(endpoint, offset, limit, {**extra_params, **shards[index]}, f"{endpoint}?{shard_label(shards[index])}")
+
+	results = [([], None, 0) for _ in shards]
+	for (index, _), data in map_bounded(fetch_shard_page, [(index, 0) for index in range(len(shards))], max_in_flight):
+		if data:
+			results[index] = ([data.get(key, [])], data.get("total_count"), 0)
+			progress.update(task_id, advance=len(results[index][0][0]))
+		else:
+			logger.error(f"First page of {endpoint} with {shard_label(shards[index])} failed, skipping the shard")
+			results[index] = ([], None, 1)
+
+	tasks = [
+		(index, offset)
+		for index, (pages, total_count, _) in enumerate(results)
+		if total_count is not None and (max_count is None or total_count <= max_count)
+		for offset in range(limit, total_count, limit)
+	]
+	for (index, offset), data in map_bounded(fetch_shard_page, tasks, max_in_flight):
+		pages, total_count, failed_pages = results[index]
+		if data:
+			pages.append(data.get(key, []))
+			progress.update(task_id, advance=len(pages[-1]))
+		else:
+			logger.error(f"Page of {endpoint} with {shard_label(shards[index])} at offset {offset} failed, skipping it")
+			print(config.BOLD + "Error: " + config.END + f"Page of \"{endpoint}\" with {shard_label(shards[index])} at offset {offset} could not be fetched and was skipped")
+			pages.append([])
+			results[index] = (pages, total_count, failed_pages + 1)
+	return results
+
+def id_ranges(min_id, max_id, total_count):
+	"""
+	Split an ID range into ranges of about config.SHARD_SIZE records each, the last one left open.
+
+	Args:
+		min_id (int): The lowest ID.
+		max_id (int): The highest ID.
+		total_count (int): The number of records between them.
+
+	Returns:
+		list: The issue_id filters of the ranges, e.g., ["><1|500", ">=501"].
+	"""
+	parts = max(1, -(-total_count // config.SHARD_SIZE))
+	width = max(1, -(-(max_id - min_id + 1) // parts))
+	starts = list(range(min_id, max_id + 1, width))
+	return [f"><{start}|{start + width - 1}" for start in starts[:-1]] + [f">={starts[-1]}"]
+
+def fetch_sharded_data(endpoint, progress, task_id, extra_params=None, project_ids=None, spec=None):
+	"""
+	Fetch a listing of issues in many shallow, independent queries instead of one deep pagination.
+
+	The listing is split by project, and the projects with more than config.SHARD_SIZE issues are
+	split again by ranges of issue IDs. The shards are fetched concurrently and merged back in ID
+	order (the default order of the listing), the issues found in several shards being kept once.
+
+	Args:
+		endpoint (str): The endpoint to fetch data from.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+		extra_params (dict, optional): Parameters sent with every page, e.g., include. Defaults to None.
+		project_ids (list, optional): The IDs of the projects, one shard for the whole listing if None. Defaults to None.
+		spec (dict, optional): The spec of the endpoint, giving the key of the records. Defaults to the spec guessed from the endpoint.
+
+	Returns:
+		list: All of the fetched data.
+	"""
+	spec = spec or endpoints.build_spec(endpoint)
+	key = spec["key"]
+	extra_params = {**(extra_params or {}), "sort": "id:desc"}
+	shards = [{"project_id": project_id, "subproject_id": "!*"} for project_id in project_ids or []] or [{}]
+	logger.info(f"Starting sharded fetch for endpoint: {endpoint}, {len(shards)} shard(s)")
+
+	results = fetch_shards(endpoint, shards, progress, task_id, extra_params, config.SHARD_SIZE, spec)
+	progress.update(task_id, total=7 * sum(total_count or 0 for _, total_count, _ in results))
+
+	split_shards = []
+	for shard, (pages, total_count, _) in zip(shards, results):
+		if total_count is None or total_count <= config.SHARD_SIZE or not pages[0]:
+			continue
+		lowest = fetch_page(endpoint, 0, 1, {**extra_params, **shard, "sort": "id"}, f"{endpoint}?{shard_label(shard)}&sort=id")
+		if not lowest or not lowest.get(key):
+			logger.error(f"Could not find the lowest ID of {endpoint} with {shard_label(shard)}, skipping the shard")
+			continue
+		ranges = id_ranges(lowest[key][0]["id"], pages[0][0]["id"], total_count)
+		logger.info(f"{total_count} records in {endpoint} with {shard_label(shard)}, split into {len(ranges)} ID ranges")
+		split_shards.extend({**shard, "issue_id": issue_range} for issue_range in ranges)
+	if split_shards:
+		results += fetch_shards(endpoint, split_shards, progress, task_id, extra_params, spec=spec)
+
+	all_pages = []
+	for shard, (pages, total_count, failed_pages) in zip(shards + split_shards, results):
+		if "issue_id" not in shard and total_count is not None and total_count > config.SHARD_SIZE:
+			continue
+		if not failed_pages and total_count is not None and sum(len(page) for page in pages) != total_count:
+			logger.warning(f"{endpoint} with {shard_label(shard)} announced {total_count} records but {sum(len(page) for page in pages)} were fetched")
+		all_pages.extend(pages)
+	all_data = merge_pages(endpoint, all_pages, None)
+	all_data.sort(key=lambda record: record["id"], reverse=True)
+	logger.info(f"Completed sharded fetch for endpoint: {endpoint}, {len(shards) + len(split_shards)} shard(s), total records: {len(all_data)}")
+	return all_data
+
+def fetch_project_listing(endpoint, project_ids, progress, task_id, extra_params=None, spec=None):
+	"""
+	Fetch a listing project by project, each project a shard of fetch_shards(), merged back in ID order.
+
+	Like the shards of fetch_sharded_data(), each project is listed without its subprojects, listed on their own.
+
+	Args:
+		endpoint (str): The endpoint to fetch data from.
+		project_ids (list): The IDs of the projects to list the records of.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+		extra_params (dict, optional): Parameters sent with every page. Defaults to None.
+		spec (dict, optional): The spec of the endpoint, giving the key of the records. Defaults to the spec guessed from the endpoint.
+
+	Returns:
+		list: The records of the projects.
+	"""
+	if not project_ids:
+		return []
+	logger.info(f"Starting fetch for endpoint: {endpoint} in {len(project_ids)} project(s)")
+	results = fetch_shards(endpoint, [{"project_id": project_id, "subproject_id": "!*"} for project_id in project_ids], progress, task_id, extra_params, spec=spec)
+	progress.update(task_id, total=sum(total_count or 0 for _, total_count, _ in results))
+	all_data = merge_pages(endpoint, [page for pages, _, _ in results for page in pages], None)
+	all_data.sort(key=lambda record: record["id"])
+	logger.info(f"Completed fetch for endpoint: {endpoint} in {len(project_ids)} project(s), total records: {len(all_data)}")
+	return all_data
+
+def split_window(window, first_date, last_date):
+	"""
+	Split a date window in two halves, if it spans more than one day.
+
+	Args:
+		window (dict): The from/to filters of the window, the first and last windows being left open.
+		first_date (date): The date an open from stands for.
+		last_date (date): The date an open to stands for.
+
+	Returns:
+		list: The two halves, or None if the window is a single day.
+	"""
+	start = date.fromisoformat(window.get("from", first_date.isoformat()))
+	end = date.fromisoformat(window.get("to", last_date.isoformat()))
+	if end <= start:
+		return None
+	middle = start + (end - start) // 2
+	left = {name: value for name, value in window.items() if name == "from"}
+	right = {name: value for name, value in window.items() if name == "to"}
+	return [{**left, "to": middle.isoformat()}, {"from": (middle + timedelta(days=1)).isoformat(), **right}]
+
+def fetch_windowed_data(endpoint, progress, task_id, extra_params=None, spec=None):
+	"""
+	Fetch a listing of time entries in from/to date windows of at most config.WINDOW_PAGES pages each.
+
+	The dates of the oldest and newest entries size the first windows from the total_count, for half
+	of config.WINDOW_PAGES pages each on average. A window whose first page announces more entries
+	is split in two, until it fits or spans a single day.
+	The windows are fetched concurrently, each one with its own pages in the checkpoint journal, and
+	merged back in ID order.
+
+	Args:
+		endpoint (str): The endpoint to fetch data from.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+		extra_params (dict, optional): Parameters sent with every page. Defaults to None.
+		spec (dict, optional): The spec of the endpoint, giving the key of the records. Defaults to the spec guessed from the endpoint.
+
+	Returns:
+		list: All of the fetched data.
+	"""
+	spec = spec or endpoints.build_spec(endpoint)
+	key = spec["key"]
+	extra_params = extra_params or {}
+	max_count = config.WINDOW_PAGES * 100
+
+	newest = fetch_page(endpoint, 0, 1, {**extra_params, "sort": "spent_on:desc"}, f"{endpoint}?sort=spent_on:desc")
+	oldest = fetch_page(endpoint, 0, 1, {**extra_params, "sort": "spent_on"}, f"{endpoint}?sort=spent_on")
+	if not newest or not oldest or not newest.get(key) or not oldest.get(key):
+		logger.warning(f"Could not find the date range of {endpoint}, fetching it without windows")
+		return fetch_endpoint_data(endpoint, progress, task_id, extra_params, spec=spec)
+	first_date = date.fromisoformat(oldest[key][0]["spent_on"])
+	last_date = date.fromisoformat(newest[key][0]["spent_on"])
+	total_count = newest.get("total_count", 0)
+	progress.update(task_id, total=total_count)
+
+	days = (last_date - first_date).days + 1
+	window_days = max(1, days * max_count // (2 * max(total_count, 1)))
+	windows = []
+	for start in range(0, days, window_days):
+		window = {}
+		if start:
+			window["from"] = (first_date + timedelta(days=start)).isoformat()
+		if start + window_days < days:
+			window["to"] = (first_date + timedelta(days=start + window_days - 1)).isoformat()
+		windows.append(window)
+	logger.info(f"Starting windowed fetch for endpoint: {endpoint}, {total_count} records from {first_date} to {last_date} in {len(windows)} window(s)")
+
+	all_pages = []
+	single_days = []
+	rounds = 0
+	while windows:
+		rounds += 1
+		split = []
+		for window, (pages, count, _) in zip(windows, fetch_shards(endpoint, windows, progress, task_id, extra_params, max_count, spec)):
+			if count is None or count <= max_count:
+				all_pages.extend(pages)
+				continue
+			halves = split_window(window, first_date, last_date)
+			if halves:
+				progress.update(task_id, advance=-len(pages[0]))
+				split.extend(halves)
+			else:
+				single_days.append(window)
+		windows = split
+	if single_days:
+		logger.warning(f"{len(single_days)} single day window(s) of {endpoint} hold more than {max_count} records, paging through them")
+		for pages, _, _ in fetch_shards(endpoint, single_days, progress, task_id, extra_params, spec=spec):
+			all_pages.extend(pages)
+
+	all_data = merge_pages(endpoint, all_pages, None)
+	all_data.sort(key=lambda record: record["id"])
+	logger.info(f"Completed windowed fetch for endpoint: {endpoint} in {rounds} round(s), total records: {len(all_data)}")
+	return all_data
+
+def record_ids(records):
+	"""
+	Get the IDs of records, e.g., of the parent endpoint of a spec with an "{id}" placeholder.
+
+	Args:
+		records (list): The records.
+
+	Returns:
+		list: The IDs of the records that have one, in their order.
+	"""
+	return [record["id"] for record in records if isinstance(record, dict) and record.get("id") is not None]
+
+def get_executor():
+	"""
+	Get the shared pool running the individual Redmine requests, create it if needed.
+
+	Returns:
+		ThreadPoolExecutor: Pool bounded to config.WORKERS concurrent requests.
+
+	Raises:
+		CancelledError: If the extraction was interrupted, for no pool to be created again once stopped.
+	"""
+	global _executor
+	check_stopped()
+	with _executor_lock:
+		if _executor is None:
+			_executor = ThreadPoolExecutor(max_workers=config.WORKERS, thread_name_prefix="redmine-request")
+			logger.info(f"Request pool started with {config.WORKERS} workers")
+		return _executor
+
+def shutdown_executor():
+	"""
+	Cancel the queued requests, wait for the running ones and release the shared request pool.
+
+	Returns:
+		None
+	"""
+	global _executor
+	with _executor_lock:
+		if _executor is not None:
+			_executor.shutdown(wait=True, cancel_futures=True)
+			_executor = None
+			logger.info("Request pool stopped")
+
+def submit_fan_out(kind, records, fetch_function, executor, *args):
+	"""
+	Start fetching the related data of each record, without waiting for it.
+
+	The records completed before an interruption are completed from the checkpoint journal instead.
+
+	Args:
+		kind (str): The kind of records, e.g., projects or issues.
+		records (list): The records to complete, each one with an "id".
+		fetch_function (callable): Called as fetch_function(record_id, *args), returns a dict.
+		executor (ThreadPoolExecutor): The pool to dispatch the calls on.
+		*args: Extra arguments given to fetch_function.
+
+	Returns:
+		list: (record, future) for each record, the future being None for the records completed from the journal.
+	"""
+	pending = []
+	for record in records:
+		check_stopped()
+		data = checkpoint.completed_fan_out(kind, record["id"])
+		if data is not None:
+			record.update(data)
+			pending.append((record, None))
+		else:
+			pending.append((record, executor.submit(fetch_function, record["id"], *args)))
+	return pending
+
+def collect_fan_out(kind, pending):
+	"""
+	Wait for the fan-outs started by submit_fan_out(), journal them and merge them into their record.
+
+	Results are merged in the listing order, whatever order the requests complete in. Once the
+	extraction is interrupted, no fan-out is journaled: one completed while stopping may be partial.
+
+	Args:
+		kind (str): The kind of records, e.g., projects or issues.
+		pending (list): The (record, future) tuples returned by submit_fan_out().
+
+	Returns:
+		int: The number of records completed from the checkpoint journal.
+
+	Raises:
+		CancelledError: If the extraction was interrupted.
+	"""
+	resumed = 0
+	for record, future in pending:
+		if future is None:
+			resumed += 1
+			continue
+		data = future.result()
+		check_stopped()
+		checkpoint.record_fan_out(kind, record["id"], data)
+		record.update(data)
+	return resumed
+
+def fetch_fan_out(kind, records, fetch_function, executor, *args):
+	"""
+	Fetch the related data of each record concurrently and merge it back into the record.
+
+	Each completed fan-out is journaled, and the ones completed before an interruption are not fetched again.
+
+	Args:
+		kind (str): The kind of records, e.g., projects or issues.
+		records (list): The records to complete, each one with an "id".
+		fetch_function (callable): Called as fetch_function(record_id, *args), returns a dict.
+		executor (ThreadPoolExecutor): The pool to dispatch the calls on.
+		*args: Extra arguments given to fetch_function.
+
+	Returns:
+		int: The number of records completed from the checkpoint journal.
+	"""
+	return collect_fan_out(kind, submit_fan_out(kind, records, fetch_function, executor, *args))
+
+def fetch_project_data(project_id, progress, task_id, output_file, previous_projects=None):
 	"""
 	Fetch all related data for a given project, including downloading files.
 
+	The sub-resources are requested concurrently through the shared request pool.
+	Wiki pages are stored in a per-project wiki file, see fetch_wiki_pages().
+
 	Args:
 		project_id (int): The ID of the source project.
 		progress (Progress): The progress object to update the task progress.
 		task_id (TaskID): The ID of the task to update progress.
 		output_file (str): The directory to store downloaded files.
+		previous_projects (dict, optional): The projects of the previous extraction by ID. Defaults to None.
 
 	Returns:
 		dict: All of the associated data from the project.
+
+	Raises:
+		CancelledError: If the extraction was interrupted.
 	"""
 	offset = 0
 	limit = 100
 	params = {"offset": offset, "limit": limit}
+	executor = get_executor()
 
 	logger.info(f"Fetching project-related data for project ID: {project_id}")
 
-	task_memberships = progress.add_task("↪ Fetching memberships", total=None)
-	task_versions = progress.add_task("↪ Fetching versions", total=None)
-	task_issue_categories = progress.add_task("↪ Fetching issues categories", total=None)
-	task_files = progress.add_task("↪ Fetching files", total=None)
-	task_wikis = progress.add_task("↪ Fetching wikis", total=None)
-
-	project_data = {
-		"memberships": fetch_data(f"/projects/{project_id}/memberships.json", params),
-		"versions": fetch_data(f"/projects/{project_id}/versions.json", params),
-		"issue_categories": fetch_data(f"/projects/{project_id}/issue_categories.json", params),
-		"files": fetch_data(f"/projects/{project_id}/files.json", params),
+	task_memberships = progress.add_task(f"↪ Fetching memberships of project {project_id}", total=None)
+	task_versions = progress.add_task(f"↪ Fetching versions of project {project_id}", total=None)
+	task_issue_categories = progress.add_task(f"↪ Fetching issues categories of project {project_id}", total=None)
+	task_files = progress.add_task(f"↪ Fetching files of project {project_id}", total=None)
+	task_wikis = progress.add_task(f"↪ Fetching wikis of project {project_id}", total=None)
+
+	futures = {
+		"memberships": executor.submit(fetch_data, f"/projects/{project_id}/memberships.json", params),
+		"versions": executor.submit(fetch_data, f"/projects/{project_id}/versions.json", params),
+		"issue_categories": executor.submit(fetch_data, f"/projects/{project_id}/issue_categories.json", params),
+		"files": executor.submit(fetch_data, f"/projects/{project_id}/files.json", params),
 	}
+	wiki_index_future = executor.submit(fetch_data, f"/projects/{project_id}/wiki/index.json", params)
+	project_data = {key: future.result() for key, future in futures.items()}
 	progress.update(task_id, advance=4)
 	progress.update(task_memberships, total=len(project_data["memberships"]) if project_data["memberships"] else 0, advance=len(project_data["memberships"]) if project_data["memberships"] else 0)
 	progress.update(task_versions, total=len(project_data["versions"]) if project_data["versions"] else 0, advance=len(project_data["versions"]) if project_data["versions"] else 0)
@@ -121,30 +742,27 @@ def fetch_project_data(project_id, progress, task_id, output_file):
 		logger.info(f"Files data: {project_data['files']}")
 		files_data = project_data.get("files")
 		files = files_data["files"]
+		downloads = []
 		for file in files:
 			logger.debug(f"{file}")
 			content_url = file["content_url"]
 			if not content_url:
 				logger.warning(f"File {file} does not have a 'content_url'.")
 			else:
-				cleaned_path = os.path.join(os.path.dirname(output_file), "attachements", str(project_id))
-				if cleaned_path:
-					os.makedirs(cleaned_path, exist_ok=True)
-					logger.info(f"Created directory path: {cleaned_path}")
-				file_name = file["filename"]
-				file_path = os.path.join(cleaned_path, file_name)
-				try:
-					logger.info(f"Downloading file from {content_url}")
-					file_response = requests.get(content_url, headers=config.HEADERS)
-					if file_response.status_code == 200:
-						with open(file_path, 'wb') as f:
-							f.write(file_response.content)
-						logger.info(f"Successfully downloaded {file_name}")
-						progress.update(task_files, advance=1)
-					else:
-						logger.error(f"Failed to download file from {content_url}: Status Code {file_response.status_code}")
-				except Exception as e:
-					logger.error(f"Error downloading file from {content_url}: {e}")
+				blob, future = attachments.store_file(output_file, file)
+				downloads.append((file, blob, future))
+		for file, blob, future in downloads:
+			try:
+				if future.result():
+					attachments.register_file(project_id, file, blob)
+					progress.update(task_files, advance=1)
+				else:
+					record_failure(file["content_url"], None, "Download failed or file did not match its size or digest")
+			except CancelledError:
+				raise
+			except Exception as e:
+				record_failure(file["content_url"], None, str(e))
+				logger.error(f"Error downloading file from {file['content_url']}: {e}")
 	progress.update(task_id, advance=1)
 	progress.remove_task(task_memberships)
 	progress.remove_task(task_versions)
@@ -153,23 +771,10 @@ def fetch_project_data(project_id, progress, task_id, output_file):
 
 	try:
 		logger.info(f"Fetching Wiki index for project ID: {project_id}")
-		wiki_index = fetch_data(f"/projects/{project_id}/wiki/index.json", params)
-		project_data["wiki"] = {"pages": []}
-
-		if wiki_index and "wiki_pages" in wiki_index:
-			progress.update(task_wikis, total=len(wiki_index["wiki_pages"]))
-			for page in wiki_index["wiki_pages"]:
-				page_title = page.get("title")
-				if page_title:
-					try:
-						logger.info(f"Fetching Wiki page: {page_title}")
-						page_content = fetch_data(f"/projects/{project_id}/wiki/{page_title}.json", params)
-						project_data["wiki"]["pages"].append(page_content)
-						progress.update(task_wikis, advance=1)
-					except Exception as e:
-						logger.error(f"Error fetching Wiki page {page_title} for project ID {project_id}: {e}")
-		else:
-			logger.warning(f"No Wiki pages found for project ID: {project_id}")
+		wiki_index = wiki_index_future.result()
+		project_data["wiki"] = fetch_wiki_pages(project_id, wiki_index, progress, task_wikis, output_file, (previous_projects or {}).get(project_id))
+	except CancelledError:
+		raise
 	except Exception as e:
 		logger.error(f"Error fetching Wiki index for project ID {project_id}: {e}")
 		project_data["wiki"] = None
@@ -178,10 +783,106 @@ def fetch_project_data(project_id, progress, task_id, output_file):
 	return project_data
 
 
+def fetch_wiki_pages(project_id, wiki_index, progress, task_id, output_file, previous_project=None):
+	"""
+	Fetch the wiki pages of a project concurrently and save them to its wiki file.
+
+	A page whose stored copy has the version listed in the index is not fetched again. The stored
+	copies are read from the wiki file of the project, or from the previous projects output when it
+	still holds the text of the pages. With config.WIKI_ATTACHMENTS, the attachments of the pages are
+	downloaded into the attachments store.
+
+	Args:
+		project_id (int): The ID of the project.
+		wiki_index (dict): The response of the wiki index, or None.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+		output_file (str): The file, path, and/or prefix that is used as output.
+		previous_project (dict, optional): The project of the previous extraction. Defaults to None.
+
+	Returns:
+		dict: The pages without their text, and the path of the wiki file relative to the output.
+
+	Raises:
+		CancelledError: If the extraction was interrupted, before the wiki file is written.
+	"""
+	if not wiki_index or "wiki_pages" not in wiki_index:
+		logger.warning(f"No Wiki pages found for project ID: {project_id}")
+		return {"pages": []}
+
+	stored_pages = {
+		page["wiki_page"]["title"]: page["wiki_page"]
+		for page in ((previous_project or {}).get("wiki") or {}).get("pages", [])
+		if page and "text" in page.get("wiki_page", {})
+	}
+	stored_pages.update(wiki.load_pages(output_file, project_id))
+	params = {"include": "attachments"} if config.WIKI_ATTACHMENTS else None
+	executor = get_executor()
+	progress.update(task_id, total=len(wiki_index["wiki_pages"]))
+
+	pending = []
+	for page in wiki_index["wiki_pages"]:
+		page_title = page.get("title")
+		if not page_title:
+			continue
+		stored_page = stored_pages.get(page_title)
+		if wiki.is_current(page, stored_page):
+			logger.info(f"Wiki page {page_title} of project {project_id} is current (version {stored_page.get('version')}), keeping the stored copy")
+			pending.append((page_title, None, stored_page))
+		else:
+			logger.info(f"Fetching Wiki page: {page_title}")
+			pending.append((page_title, executor.submit(fetch_data, f"/projects/{project_id}/wiki/{page_title}.json", params), stored_page))
+
+	pages = {}
+	downloads = []
+	for page_title, page_future, stored_page in pending:
+		try:
+			if page_future is None:
+				pages[page_title] = stored_page
+			else:
+				data = page_future.result()
+				if data and "wiki_page" in data:
+					pages[page_title] = data["wiki_page"]
+					if config.WIKI_ATTACHMENTS:
+						pages[page_title].setdefault("attachments", [])
+					for file in pages[page_title].get("attachments", []):
+						if file.get("content_url"):
+							blob, future = attachments.store_file(output_file, file)
+							downloads.append((file, blob, future))
+				elif stored_page:
+					logger.warning(f"Keeping the stored copy of Wiki page {page_title} for project ID {project_id}")
+					pages[page_title] = stored_page
+			progress.update(task_id, advance=1)
+		except CancelledError:
+			raise
+		except Exception as e:
+			logger.error(f"Error fetching Wiki page {page_title} for project ID {project_id}: {e}")
+
+	for file, blob, future in downloads:
+		try:
+			if future.result():
+				attachments.register_file(project_id, file, blob)
+			else:
+				record_failure(file["content_url"], None, "Download failed or file did not match its size or digest")
+		except CancelledError:
+			raise
+		except Exception as e:
+			record_failure(file["content_url"], None, str(e))
+			logger.error(f"Error downloading file from {file['content_url']}: {e}")
+
+	check_stopped()
+	return {
+		"pages": [{"wiki_page": wiki.page_summary(page)} for page in pages.values()],
+		"file": wiki.save_pages(output_file, project_id, pages)
+	}
+
 def fetch_issue_data(issue_id, progress, task_id):
 	"""
 	Fetch all related data for a given issue.
 
+	With config.JOURNALS or config.ISSUE_ATTACHMENTS, the relations are requested together with the
+	journals and/or the attachments from /issues/{id}.json.
+
 	Args:
 		issue_id (int): The ID of the source issue.
 		progress (Progress): The progress object to update the task progress.
@@ -194,57 +895,373 @@ def fetch_issue_data(issue_id, progress, task_id):
 	limit = 100
 	params = {"offset": offset, "limit": limit}
 
-	task_relations = progress.add_task("↪ Fetching relations", total=None)
-
 	logger.info(f"Fetching issue-related data for issue ID: {issue_id}")
-	relations = fetch_data(f"/issues/{issue_id}/relations.json", params)
-	progress.update(task_relations, total=len(relations) if relations else 0, advance=len(relations) if relations else 0)
+	if config.JOURNALS or config.ISSUE_ATTACHMENTS:
+		includes = ["relations"] + (["journals"] if config.JOURNALS else []) + (["attachments"] if config.ISSUE_ATTACHMENTS else [])
+		data = fetch_data(f"/issues/{issue_id}.json", {"include": ",".join(includes)})
+		issue = data.get("issue", {}) if data else {}
+		issue_data = {"relations": {"relations": issue["relations"]} if "relations" in issue else None}
+		if config.JOURNALS:
+			issue_data["journals"] = issue.get("journals", [])
+		if config.ISSUE_ATTACHMENTS:
+			issue_data["attachments"] = issue.get("attachments", [])
+	else:
+		issue_data = {"relations": fetch_data(f"/issues/{issue_id}/relations.json", params)}
 	progress.update(task_id, advance=6)
 	logger.info(f"Completed fetching issue data for issue ID: {issue_id}")
-	progress.remove_task(task_relations)
-	return {"relations": relations}
+	return issue_data
+
+def submit_issue_downloads(output_file, issues):
+	"""
+	Start the downloads of the attachments of issues into the attachments store, on the download pool.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		issues (list): The issues, with their attachments.
+
+	Returns:
+		list: (issue, file, blob, future) of each download.
+	"""
+	downloads = []
+	for issue in issues:
+		for file in issue.get("attachments") or []:
+			if file.get("content_url"):
+				blob, future = attachments.store_file(output_file, file)
+				downloads.append((issue, file, blob, future))
+			else:
+				logger.warning(f"Attachment {file.get('id')} of issue {issue['id']} does not have a 'content_url'.")
+	return downloads
+
+def collect_issue_downloads(downloads, progress):
+	"""
+	Wait for the downloads of the attachments of the issues and map the downloaded ones in the manifest.
+
+	Args:
+		downloads (list): (issue, file, blob, future) of each download, from submit_issue_downloads().
+		progress (Progress): The progress object to show the downloads.
+
+	Returns:
+		None
+	"""
+	if not downloads:
+		return
+	task_id = progress.add_task("↪ Downloading attachments of issues", total=len(downloads))
+	for issue, file, blob, future in downloads:
+		try:
+			if future.result():
+				attachments.register_file(issue["project"]["id"], file, blob, issue["id"])
+			else:
+				record_failure(file["content_url"], None, "Download failed or file did not match its size or digest")
+		except CancelledError:
+			raise
+		except Exception as e:
+			record_failure(file["content_url"], None, str(e))
+			logger.error(f"Error downloading file from {file['content_url']}: {e}")
+		progress.update(task_id, advance=1)
+	progress.remove_task(task_id)
+	logger.info(f"{len(downloads)} attachment(s) of issues downloaded")
+
+def apply_issue_includes(issues, progress, task_id):
+	"""
+	Store the relations embedded by the issues listing in the same shape as /issues/{id}/relations.json.
+
+	The issues without the relations, or without the attachments asked for, are completed one by one.
+	With config.JOURNALS, every issue is, as the listing never includes the journals.
+
+	Args:
+		issues (list): The issues returned by the listing, updated in place.
+		progress (Progress): The progress object to update the task progress.
+		task_id (TaskID): The ID of the task to update progress.
+
+	Returns:
+		list: The issues to complete from /issues/{id}.json.
+	"""
+	if config.JOURNALS:
+		logger.info(f"Fetching the journals of {len(issues)} issue(s) one by one")
+		return list(issues)
+	missing = []
+	for issue in issues:
+		if isinstance(issue.get("relations"), list) and (not config.ISSUE_ATTACHMENTS or isinstance(issue.get("attachments"), list)):
+			issue["relations"] = {"relations": issue["relations"]}
+			progress.update(task_id, advance=6)
+		else:
+			missing.append(issue)
+	if missing:
+		logger.warning(f"Relations{' or attachments' if config.ISSUE_ATTACHMENTS else ''} not included in the listing for {len(missing)} issue(s), fetching them one by one")
+	return missing
 
 def fetch_all_data(output_file):
 	"""
 	Fetch all data from key endpoints and save it into JSON file(s).
 
+	The endpoints are fetched as a graph of tasks run by scheduler.run_tasks(): the endpoints that do
+	not depend on each other are fetched concurrently, and the sub-resources of each project are
+	requested as soon as its page of the projects listing arrives. The sharded issues listing waits for
+	the projects listing, which gives its shards, and a custom endpoint with an "{id}" placeholder
+	waits for its parent endpoint, of which only the IDs are kept until every endpoint depending on it
+	is saved. All of it shares the budget of config.WORKERS requests in flight.
+	On interruption, the queued project fan-outs are cancelled rather than run before exiting.
+
+	With config.SHARD, only the projects of the shard are extracted, with their issues, time entries
+	and files, and the records of every endpoint are saved sorted by ID for merge_extractions.py.
+
+	The requests and downloads are measured on the way, and their report is written to
+	extraction_report.json next to the output, even if the extraction is interrupted. When a plan
+	made with --plan is next to the output, it gives the totals of the progress bars from the start,
+	and the remaining time of the planned requests.
+
 	Args:
 		output_file (str): The file, path, and/or prefix that should be used as output.
 
 	Returns:
 		None
 	"""
+	telemetry.reset()
+	stop_event.clear()
 	consolidated_data = {}
+	state = incremental.load_state(output_file) if config.INCREMENTAL or config.RESUME else {}
+	previous_data = incremental.load_previous_data(output_file) if config.INCREMENTAL or config.RESUME else {}
+	checkpoint.open_journal(output_file, config.RESUME)
+	written = ndjson.open_output(output_file, config.RESUME) if config.NDJSON else set()
+	if config.SQLITE:
+		store.open_store(output_file)
+	if config.SHARD:
+		shard.save_shard_info(output_file)
+	throttle.configure()
+	cache.open_cache(output_file)
+	attachments.load_manifest(output_file)
+	plan = planner.load_plan(output_file)
+	parent_ids = {}
+	dependents = {}
+	listings = {}
+	issue_downloads = []
+	downloaded_issues = set()
+	save_lock = threading.Lock()
+	completed = False
+	project_executor = ThreadPoolExecutor(max_workers=config.WORKERS, thread_name_prefix="redmine-project")
 
 	with Progress(
 		SpinnerColumn(),
 		TextColumn("[bold blue]{task.description}"),
 		BarColumn(),
 		"[progress.percentage]{task.percentage:>3.0f}%",
-		TimeElapsedColumn()
+		TimeElapsedColumn(),
+		TimeRemainingColumn()
 	) as progress:
-		for key, endpoint in endpoints.endpoints.items():
+
+		def start_issue_downloads(issues):
+			"""
+			Start the downloads of the attachments of the issues not started yet, as their page arrives.
+
+			The issues the listing gave without their attachments are started once completed one by one.
+			"""
+			issues = [issue for issue in issues if issue["id"] not in downloaded_issues and isinstance(issue.get("attachments"), list)]
+			downloaded_issues.update(issue["id"] for issue in issues)
+			issue_downloads.extend(submit_issue_downloads(output_file, issues))
+
+		def parent_of(key):
+			"""
+			Get the endpoint whose records an endpoint is fetched from: the projects for the issues listing
+			sharded by project and the time entries of a shard, or the parent of its spec.
+			"""
+			if key == "issues" and (config.SHARDED_ISSUES or config.SHARD) or key == "time_entries" and config.SHARD:
+				return "projects"
+			return endpoints.specs[key]["parent"]
+
+		def listed_ids(key):
+			"""
+			Get the IDs of the records of a parent endpoint, listed by this run or read from the previous output.
+			"""
+			if key in parent_ids:
+				return parent_ids[key]
+			return record_ids(previous_data.get(key, []))
+
+		def keep_ids(key, records):
+			"""
+			Keep the IDs of the records of an endpoint while endpoints depending on it are still to be fetched.
+			"""
+			if dependents.get(key):
+				parent_ids[key] = record_ids(records)
+
+		def list_endpoint(key):
+			"""
+			Fetch the listing of an endpoint, starting the sub-resources of each project as its page arrives.
+			"""
+			endpoint = endpoints.endpoints[key]
+			spec = endpoints.specs[key]
 			logger.info(f"Starting to fetch data for endpoint: {key}")
-			task_id = progress.add_task(f"Fetching {key}", total=None)
-			consolidated_data[key] = fetch_endpoint_data(endpoint, progress, task_id)
+			start = time.monotonic()
+			task_id = progress.add_task(f"Fetching {key}", total=planner.progress_total(plan, key))
+			extra_params = endpoints.issue_params() if key == "issues" else {}
+			delta_filter = incremental.updated_on_filter(state, key) if config.INCREMENTAL and key in previous_data else None
+			if delta_filter:
+				logger.info(f"Incremental extraction of {key} with {delta_filter}")
+				extra_params.update(delta_filter)
+			pending = []
+			project_ids = [project_id for project_id in listed_ids("projects") if shard.is_own_project(project_id)] if parent_of(key) == "projects" else []
+			if key == "issues" and config.SHARD and not project_ids:
+				records = []
+			elif key == "issues" and (config.SHARDED_ISSUES or config.SHARD):
+				records = fetch_sharded_data(endpoint, progress, task_id, extra_params, project_ids, spec)
+			elif key == "time_entries" and config.SHARD:
+				records = fetch_project_listing(endpoint, project_ids, progress, task_id, extra_params, spec)
+			elif key == "time_entries" and config.WINDOWED_TIME_ENTRIES:
+				records = fetch_windowed_data(endpoint, progress, task_id, extra_params, spec)
+			elif key == "projects":
+				previous_projects = {project["id"]: project for project in previous_data.get("projects", [])} if config.INCREMENTAL else {}
+				seen = set()
+
+				def start_fan_out(page):
+					changed = []
+					for project in page:
+						if project["id"] in seen or not shard.is_own_project(project["id"]):
+							continue
+						seen.add(project["id"])
+						previous_project = previous_projects.get(project["id"])
+						if previous_project and project.get("updated_on") and previous_project.get("updated_on") == project["updated_on"]:
+							logger.info(f"Project {project['id']} unchanged, keeping its previous sub-resources")
+							project.update({name: value for name, value in previous_project.items() if name not in project})
+							progress.update(task_id, advance=6)
+						else:
+							changed.append(project)
+					pending.extend(submit_fan_out("projects", changed, fetch_project_data, project_executor, progress, task_id, output_file, previous_projects))
+
+				records = shard.filter_records(key, fetch_endpoint_data(endpoint, progress, task_id, extra_params, on_page=start_fan_out, spec=spec))
+				keep_ids(key, records)
+			elif spec["parent"]:
+				records = fetch_child_data(spec, listed_ids(spec["parent"]), progress, task_id)
+			elif spec["pagination"] == "none":
+				records = fetch_resource(spec, endpoint)
+			elif key == "issues" and config.ISSUE_ATTACHMENTS:
+				records = fetch_endpoint_data(endpoint, progress, task_id, extra_params, on_page=start_issue_downloads, spec=spec)
+			else:
+				records = fetch_endpoint_data(endpoint, progress, task_id, extra_params, spec=spec)
+			if key == "issues" and config.ISSUE_ATTACHMENTS:
+				start_issue_downloads(records)
+			listings[key] = (start, task_id, delta_filter, records, pending)
 
+		def complete_endpoint(key):
+			"""
+			Wait for the sub-resources of the records of an endpoint, then save the endpoint.
+			"""
+			start, task_id, delta_filter, records, pending = listings.pop(key)
 			if key == "projects":
-				for project in consolidated_data["projects"]:
-					project_data = fetch_project_data(project["id"], progress, task_id, output_file)
-					project.update(project_data)
+				resumed = collect_fan_out("projects", pending)
+				progress.update(task_id, advance=6 * resumed)
 
 			if key == "issues":
-				for issue in consolidated_data["issues"]:
-					issue_data = fetch_issue_data(issue["id"], progress, task_id)
-					issue.update(issue_data)
+				missing = apply_issue_includes(records, progress, task_id)
+				resumed = fetch_fan_out("issues", missing, fetch_issue_data, get_executor(), progress, task_id)
+				progress.update(task_id, advance=6 * resumed)
+				if config.JOURNALS:
+					journals.save_journals(output_file, records)
+				if config.ISSUE_ATTACHMENTS:
+					start_issue_downloads(missing)
+					collect_issue_downloads(issue_downloads, progress)
+
+			with save_lock:
+				if delta_filter:
+					records = incremental.merge_records(previous_data.pop(key), records)
+				if config.SHARD:
+					records = shard.sort_records(records if endpoints.specs[key]["parent"] else shard.filter_records(key, records))
+				keep_ids(key, records)
+				parent = parent_of(key)
+				if parent in dependents:
+					dependents[parent].discard(key)
+					if not dependents[parent] and parent_ids.pop(parent, None) is not None:
+						logger.debug(f"Every endpoint depending on {parent} is saved, its IDs are released")
+
+				logger.info(f"Completed fetching data for endpoint: {key}")
+				if config.NDJSON:
+					ndjson.write_section(output_file, key, records)
+				elif config.SQLITE:
+					store.write_endpoint(key, records)
+				else:
+					consolidated_data[key] = records
+					save_data(output_file, {name: consolidated_data[name] for name in endpoints.endpoints if name in consolidated_data})
+				if key in incremental.INCREMENTAL_ENDPOINTS:
+					state[key] = incremental.watermark(records, state.get(key))
+					incremental.save_state(output_file, state)
+				checkpoint.record_endpoint(key)
+			telemetry.record_phase(key, time.monotonic() - start)
+
+		def fetch_endpoint(key):
+			"""
+			Fetch and save an endpoint.
+			"""
+			list_endpoint(key)
+			complete_endpoint(key)
+
+		tasks = {}
+		for key in endpoints.endpoints:
+			if checkpoint.is_endpoint_completed(key) and (key in written if config.NDJSON else key in previous_data):
+				logger.info(f"Endpoint {key} already completed, keeping the saved output")
+				if not config.NDJSON:
+					consolidated_data[key] = previous_data[key]
+				continue
+			parent = parent_of(key)
+			if parent:
+				dependents.setdefault(parent, set()).add(key)
+			if f"{parent} listing" in tasks:
+				dependencies = [f"{parent} listing"]
+			else:
+				dependencies = [parent] if parent in tasks else []
+			if key == "projects":
+				tasks["projects listing"] = (partial(list_endpoint, key), [])
+				tasks[key] = (partial(complete_endpoint, key), ["projects listing"])
+			else:
+				tasks[key] = (partial(fetch_endpoint, key), dependencies)
+
+		if plan:
+			plan_task = progress.add_task("Planned requests", total=plan["requests"])
+			telemetry.set_listener(lambda: progress.update(plan_task, advance=1))
+		try:
+			scheduler.run_tasks(tasks, stop_event=stop_event)
+			completed = True
+		finally:
+			telemetry.set_listener(None)
+			if completed:
+				project_executor.shutdown()
+			else:
+				project_executor.shutdown(wait=False, cancel_futures=True)
+			shutdown_executor()
+			attachments.shutdown_download_executor()
+			attachments.save_manifest(output_file)
+			session.close_session()
+			cache.close_cache()
+			if config.NDJSON:
+				ndjson.close_output(output_file, completed)
+			if config.SQLITE:
+				store.close_store()
+			checkpoint.close_journal(output_file, completed)
+			telemetry.save_report(output_file, completed)
+	report_failures(output_file)
 
-			logger.info(f"Completed fetching data for endpoint: {key}")
-			save_data(output_file, consolidated_data)
+def report_failures(output_file):
+	"""
+	Report the requests that still failed after all retries, and save them next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		None
+	"""
+	if not failed_requests:
+		return
+	failures_file = os.path.join(os.path.dirname(output_file), "failed_requests.json")
+	with open(failures_file, "w", encoding="utf-8") as file:
+		json.dump(failed_requests, file, indent=4, ensure_ascii=False)
+	logger.error(f"{len(failed_requests)} request(s) failed, listed in {failures_file}")
+	print(config.BOLD + "Warning: " + config.END + f"{len(failed_requests)} request(s) could not be completed, see \"{failures_file}\"")
 
 def save_data(output_file, data):
 	"""
 	Save the extracted data to JSON files.
 
+	With config.NORMALIZE, the references of the records are replaced by their ID and the lookup
+	tables are saved under normalize.LOOKUPS_KEY, or to their own file in multiple files mode.
+
 	Args:
 		output_file (str): The file, path, and/or prefix that should be used as output.
 		data (dict): All of the data that has been extracted.
@@ -253,20 +1270,21 @@ def save_data(output_file, data):
 		None
 	"""
 	if data:
+		if config.NORMALIZE:
+			data = normalize.normalize_data(data)
 		cleaned_path = os.path.dirname(output_file)
 		if cleaned_path:
 			os.makedirs(cleaned_path, exist_ok=True)
 			logger.info(f"Created directory path: {cleaned_path}")
 
 		if config.SINGLE_FILE:
-			with open(output_file, "w", encoding="utf-8") as file:
-				json.dump(data, file, indent=4, ensure_ascii=False)
-			logger.info(f"All data saved to {output_file}")
+			file_path = compression.output_path(output_file)
+			checkpoint.atomic_write_json(file_path, data)
+			logger.info(f"All data saved to {file_path}")
 		else:
 			for key, value in data.items():
-				file_path = f"{output_file}{key}.json"
-				with open(file_path, "w", encoding="utf-8") as file:
-					json.dump(value, file, indent=4, ensure_ascii=False)
+				file_path = compression.output_path(f"{output_file}{key}.json")
+				checkpoint.atomic_write_json(file_path, value)
 				logger.info(f"Data for {key} saved to {file_path}")
 	else:
 		logger.error("No data fetched. No files were saved.")
@@ -0,0 +1,150 @@
+import os
+import json
+from srcs_extraction import checkpoint, compression, config, endpoints, logger, ndjson, normalize, store
+
+INCREMENTAL_ENDPOINTS = ["issues", "time_entries"]
+
+def state_file_path(output_file):
+	"""
+	Get the path of the file keeping the watermarks, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the state file.
+	"""
+	return os.path.join(os.path.dirname(output_file), "extraction_state.json")
+
+def load_state(output_file):
+	"""
+	Load the watermarks saved by the previous extraction.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		dict: The watermarks by endpoint, empty if no previous extraction was found.
+	"""
+	state_file = state_file_path(output_file)
+	if not os.path.exists(state_file):
+		logger.info(f"No extraction state found at {state_file}")
+		return {}
+	with open(state_file, "r", encoding="utf-8") as file:
+		state = json.load(file)
+	logger.info(f"Extraction state loaded from {state_file}: {state}")
+	return state
+
+def save_state(output_file, state):
+	"""
+	Save the watermarks of the extraction.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		state (dict): The watermarks by endpoint.
+
+	Returns:
+		None
+	"""
+	state_file = state_file_path(output_file)
+	cleaned_path = os.path.dirname(state_file)
+	if cleaned_path:
+		os.makedirs(cleaned_path, exist_ok=True)
+	checkpoint.atomic_write_json(state_file, state)
+	logger.info(f"Extraction state saved to {state_file}")
+
+def load_previous_data(output_file):
+	"""
+	Load the data written by the previous extraction, in single file or multiple files mode, as JSON, NDJSON or SQLite.
+
+	A normalized output is rehydrated, its records getting back the objects of the lookup tables.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		dict: The previous data by endpoint, empty if no previous extraction was found.
+	"""
+	previous_data = {}
+	if config.SQLITE:
+		previous_data = store.load_store(output_file)
+	elif config.NDJSON:
+		file_paths = [ndjson.ndjson_path(output_file)] if config.SINGLE_FILE else [ndjson.ndjson_path(output_file, key) for key in endpoints.endpoints]
+		for file_path in file_paths:
+			if os.path.exists(file_path):
+				logger.info(f"Loading previous extraction from {file_path}")
+				previous_data.update(ndjson.read_sections(file_path)[0])
+	elif config.SINGLE_FILE:
+		file_path = compression.output_path(output_file)
+		if os.path.exists(file_path):
+			logger.info(f"Loading previous extraction from {file_path}")
+			with compression.open_read(file_path) as file:
+				previous_data = json.load(file)
+	else:
+		for key in [*endpoints.endpoints, normalize.LOOKUPS_KEY]:
+			file_path = compression.output_path(f"{output_file}{key}.json")
+			if os.path.exists(file_path):
+				logger.info(f"Loading previous extraction of {key} from {file_path}")
+				with compression.open_read(file_path) as file:
+					previous_data[key] = json.load(file)
+	return normalize.rehydrate_data(previous_data)
+
+def updated_on_filter(state, key):
+	"""
+	Build the Redmine filter fetching only the records updated since the watermark of an endpoint.
+
+	Args:
+		state (dict): The watermarks by endpoint.
+		key (str): The endpoint name.
+
+	Returns:
+		dict: The filter parameters, or None if the endpoint has to be fully extracted.
+	"""
+	if key not in INCREMENTAL_ENDPOINTS or not state.get(key):
+		return None
+	return {"updated_on": f">={state[key]}"}
+
+def watermark(records, current=None):
+	"""
+	Get the most recent updated_on of the records.
+
+	Args:
+		records (list): The records to look at.
+		current (str, optional): The current watermark, kept if no record is more recent. Defaults to None.
+
+	Returns:
+		str: The new watermark, or None if there is none.
+	"""
+	for record in records:
+		updated_on = record.get("updated_on") if isinstance(record, dict) else None
+		if updated_on and (current is None or updated_on > current):
+			current = updated_on
+	return current
+
+def merge_records(previous, records):
+	"""
+	Merge freshly fetched records into the previous ones by id.
+
+	Updated records replace their previous version in place, new records are appended.
+
+	Args:
+		previous (list): The records of the previous extraction.
+		records (list): The records fetched by this extraction.
+
+	Returns:
+		list: The merged records.
+	"""
+	merged = list(previous)
+	index_by_id = {record["id"]: index for index, record in enumerate(merged) if isinstance(record, dict) and "id" in record}
+	replaced = 0
+	for record in records:
+		record_id = record.get("id") if isinstance(record, dict) else None
+		if record_id is not None and record_id in index_by_id:
+			merged[index_by_id[record_id]] = record
+			replaced += 1
+		else:
+			if record_id is not None:
+				index_by_id[record_id] = len(merged)
+			merged.append(record)
+	logger.info(f"Merged {len(records)} record(s): {replaced} updated, {len(records) - replaced} added")
+	return merged
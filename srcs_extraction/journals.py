@@ -0,0 +1,89 @@
+import os
+import json
+from collections import defaultdict
+from srcs_extraction import compression, config, logger
+
+def journals_path(output_file, project_id):
+	"""
+	Get the path of the file holding the issue journals (history) of a project, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		project_id (int): The ID of the project.
+
+	Returns:
+		str: The path of the journals file.
+	"""
+	return compression.output_path(os.path.join(os.path.dirname(output_file), "journals", f"{project_id}.ndjson"))
+
+def load_journals(file_path):
+	"""
+	Load the journals stored in a journals file, one issue per line.
+
+	Args:
+		file_path (str): The journals file.
+
+	Returns:
+		dict: The journals by issue ID, empty if the file does not exist or cannot be read.
+	"""
+	if not os.path.exists(file_path):
+		return {}
+	journals = {}
+	try:
+		with compression.open_read(file_path) as file:
+			for line in file:
+				entry = json.loads(line)
+				journals[entry["issue_id"]] = entry["journals"]
+	except (OSError, EOFError, ValueError, KeyError) as e:
+		logger.warning(f"Ignoring the stored journals in {file_path}: {e}")
+		return {}
+	return journals
+
+def write_journals(file_path, journals):
+	"""
+	Write the journals of a project, one issue per line, to a temporary file moved over the target once complete.
+
+	Args:
+		file_path (str): The journals file.
+		journals (dict): The journals by issue ID.
+
+	Returns:
+		None
+	"""
+	compressed = compression.compression_of(file_path)
+	tmp_path = compression.strip_extension(file_path) + ".tmp" + (compression.EXTENSIONS[compressed] if compressed else "")
+	with compression.open_write(tmp_path) as file:
+		for issue_id in sorted(journals):
+			file.write(json.dumps({"issue_id": issue_id, "journals": journals[issue_id]}, ensure_ascii=False) + "\n")
+	os.replace(tmp_path, file_path)
+
+def save_journals(output_file, issues):
+	"""
+	Move the journals embedded in the issues to the journals file of their project.
+
+	The journals are removed from the issues, so the issues output does not grow with their history.
+	In incremental mode, only the issues fetched again are replaced in the journals files.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		issues (list): The issues, updated in place.
+
+	Returns:
+		int: The number of journals saved.
+	"""
+	by_project = defaultdict(dict)
+	for issue in issues:
+		if "journals" in issue:
+			by_project[issue["project"]["id"]][issue["id"]] = issue.pop("journals") or []
+
+	total = 0
+	for project_id, journals in by_project.items():
+		file_path = journals_path(output_file, project_id)
+		os.makedirs(os.path.dirname(file_path), exist_ok=True)
+		if config.INCREMENTAL:
+			journals = {**load_journals(file_path), **journals}
+		write_journals(file_path, journals)
+		count = sum(len(entries) for entries in journals.values())
+		total += count
+		logger.info(f"{count} journal(s) of {len(journals)} issue(s) of project {project_id} saved to {file_path}")
+	return total
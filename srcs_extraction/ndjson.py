@@ -0,0 +1,234 @@
+import os
+import json
+from datetime import datetime, timezone
+from srcs_extraction import compression, config, endpoints, logger, normalize
+
+FORMAT = "redmine-ndjson"
+VERSION = 1
+
+_part_path = None
+
+def ndjson_path(output_file, key=None):
+	"""
+	Get the path of an NDJSON output.
+
+	In single file mode, every endpoint is a section of the same file, named after the output with a
+	.ndjson extension. In multiple files mode, every endpoint has its own file. Either gets the
+	extension of config.COMPRESSION.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		key (str, optional): The endpoint name, used in multiple files mode. Defaults to None.
+
+	Returns:
+		str: The path of the NDJSON file.
+	"""
+	if config.SINGLE_FILE:
+		return compression.output_path(output_file.removesuffix(".json") + ".ndjson")
+	return compression.output_path(f"{output_file}{key}.ndjson")
+
+def part_path(file_path):
+	"""
+	Get the path an NDJSON file is written to before being moved in place, keeping its compression extension last.
+
+	Args:
+		file_path (str): The NDJSON file.
+
+	Returns:
+		str: The path of the ".part" file.
+	"""
+	compressed = compression.compression_of(file_path)
+	return compression.strip_extension(file_path) + ".part" + (compression.EXTENSIONS[compressed] if compressed else "")
+
+def write_lines(file_path, lines, append=False):
+	"""
+	Write lines to a file, compressed if its extension asks for it, and sync it to disk.
+
+	Args:
+		file_path (str): The file to write.
+		lines (iterable): The lines to write.
+		append (bool, optional): Append to the file instead of replacing it. Defaults to False.
+
+	Returns:
+		None
+	"""
+	with compression.open_write(file_path, append) as file:
+		file.writelines(lines)
+		if not compression.compression_of(file_path):
+			file.flush()
+			os.fsync(file.fileno())
+
+def section_lines(key, records, lookups=None):
+	"""
+	Serialize an endpoint as a section: a header line, one line per record and a footer line with the count.
+
+	Args:
+		key (str): The endpoint name.
+		records (list): The records of the endpoint.
+		lookups (dict, optional): The lookup tables of normalized records, saved in the header. Defaults to None.
+
+	Yields:
+		str: The lines of the section.
+	"""
+	header = {"entity": key, "format": FORMAT, "version": VERSION, "created_at": datetime.now(timezone.utc).isoformat()}
+	if lookups:
+		header["lookups"] = lookups
+	yield json.dumps({"_header": header}, ensure_ascii=False) + "\n"
+	count = 0
+	for record in records:
+		yield json.dumps(record, ensure_ascii=False) + "\n"
+		count += 1
+	yield json.dumps({"_footer": {"entity": key, "count": count}}, ensure_ascii=False) + "\n"
+
+def endpoint_lines(key, records):
+	"""
+	Serialize an endpoint as a section, normalized with its own lookup tables when config.NORMALIZE is set.
+
+	Args:
+		key (str): The endpoint name.
+		records (list): The records of the endpoint.
+
+	Returns:
+		iterator: The lines of the section.
+	"""
+	if not config.NORMALIZE:
+		return section_lines(key, records)
+	records, tables = normalize.normalize_records(key, records)
+	return section_lines(key, records, normalize.lookup_data(tables))
+
+def read_sections(file_path):
+	"""
+	Read the complete sections of an NDJSON file.
+
+	A section without its footer, or whose footer count does not match, was interrupted while being
+	written and is ignored. A compressed file is decompressed on the fly. The records of a section
+	normalized with lookup tables in its header are rehydrated.
+
+	Args:
+		file_path (str): The NDJSON file to read.
+
+	Returns:
+		tuple: (dict of records by endpoint, offset in uncompressed bytes of the end of the last complete section).
+	"""
+	sections = {}
+	end = 0
+	offset = 0
+	key = None
+	lookups = None
+	records = []
+	with compression.open_read(file_path, binary=True) as file:
+		try:
+			for line in file:
+				offset += len(line)
+				try:
+					entry = json.loads(line)
+				except json.JSONDecodeError:
+					logger.warning(f"Ignoring a truncated line of {file_path}")
+					break
+				if isinstance(entry, dict) and "_header" in entry:
+					key = entry["_header"]["entity"]
+					lookups = entry["_header"].get("lookups")
+					records = []
+				elif isinstance(entry, dict) and "_footer" in entry:
+					if key == entry["_footer"]["entity"] and len(records) == entry["_footer"]["count"]:
+						sections[key] = normalize.rehydrate_records(records, lookups) if lookups else records
+						end = offset
+					else:
+						logger.warning(f"Ignoring the section {key} of {file_path}, its footer does not match")
+					key = None
+				elif key is not None:
+					records.append(entry)
+		except EOFError:
+			logger.warning(f"Ignoring the truncated end of {file_path}")
+	if key is not None:
+		logger.warning(f"Ignoring the section {key} of {file_path}, it has no footer")
+	return sections, end
+
+def open_output(output_file, resume):
+	"""
+	Open the NDJSON output of the extraction.
+
+	In single file mode, the sections are appended to a ".part" file moved over the output once the
+	extraction is completed, so the previous output stays whole until then. When resuming, the
+	complete sections of the ".part" file are kept and an interrupted one is cut off, by rewriting
+	the complete ones when the file is compressed. In multiple files mode, every file is moved in
+	place once written, so the files present are complete.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		resume (bool): Keep the sections written before the interruption.
+
+	Returns:
+		set: The endpoints already written to the output of this extraction.
+	"""
+	global _part_path
+	written = set()
+	cleaned_path = os.path.dirname(output_file)
+	if cleaned_path:
+		os.makedirs(cleaned_path, exist_ok=True)
+	if not config.SINGLE_FILE:
+		if resume:
+			for key in endpoints.endpoints:
+				if os.path.exists(ndjson_path(output_file, key)):
+					written.add(key)
+		return written
+
+	_part_path = part_path(ndjson_path(output_file))
+	if resume and os.path.exists(_part_path):
+		sections, end = read_sections(_part_path)
+		written.update(sections)
+		if compression.compression_of(_part_path):
+			with compression.open_write(_part_path) as file:
+				for key, records in sections.items():
+					file.writelines(endpoint_lines(key, records))
+		else:
+			with open(_part_path, "r+b") as file:
+				file.truncate(end)
+		logger.info(f"Resuming the NDJSON output {_part_path} with {len(written)} endpoint(s) already written")
+	else:
+		with compression.open_write(_part_path):
+			pass
+		logger.info(f"NDJSON output started at {_part_path}")
+	return written
+
+def write_section(output_file, key, records):
+	"""
+	Stream the records of an endpoint to the NDJSON output, without rewriting what is already written.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		key (str): The endpoint name.
+		records (list): The records of the endpoint.
+
+	Returns:
+		None
+	"""
+	if config.SINGLE_FILE:
+		write_lines(_part_path, endpoint_lines(key, records), append=True)
+		logger.info(f"{len(records)} record(s) of {key} appended to {_part_path}")
+		return
+
+	file_path = ndjson_path(output_file, key)
+	write_lines(part_path(file_path), endpoint_lines(key, records))
+	os.replace(part_path(file_path), file_path)
+	logger.info(f"{len(records)} record(s) of {key} saved to {file_path}")
+
+def close_output(output_file, completed):
+	"""
+	Close the NDJSON output, moving it in place once the extraction is completed.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		completed (bool): Whether the whole extraction is completed.
+
+	Returns:
+		None
+	"""
+	global _part_path
+	if _part_path is None:
+		return
+	if completed:
+		file_path = ndjson_path(output_file)
+		os.replace(_part_path, file_path)
+		logger.info(f"All data saved to {file_path}")
+	_part_path = None
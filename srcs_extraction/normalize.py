@@ -0,0 +1,128 @@
+from srcs_extraction import logger
+
+REFERENCES = {
+	"project": "projects",
+	"tracker": "trackers",
+	"status": "statuses",
+	"priority": "priorities",
+	"author": "principals",
+	"assigned_to": "principals",
+	"user": "principals",
+	"activity": "activities",
+	"category": "categories",
+	"fixed_version": "versions"
+}
+NORMALIZED_ENDPOINTS = ("issues", "time_entries", "news")
+LOOKUPS_KEY = "lookups"
+
+def normalize_records(key, records, tables=None):
+	"""
+	Replace the references of the records to other entities, e.g., {"id": 2, "name": "Bug"}, by their ID.
+
+	The referenced objects go to lookup tables, once per ID. A reference differing from the object
+	already in its table for the same ID, e.g., a project renamed during the extraction, is kept whole
+	so nothing is lost. Only the endpoints of NORMALIZED_ENDPOINTS are normalized.
+
+	Args:
+		key (str): The endpoint name.
+		records (list): The records of the endpoint, left untouched.
+		tables (dict, optional): The lookup tables to add to, the objects by ID by table. Defaults to new tables.
+
+	Returns:
+		tuple: (records, tables), the normalized records and the lookup tables.
+	"""
+	tables = {} if tables is None else tables
+	if key not in NORMALIZED_ENDPOINTS:
+		return records, tables
+	normalized = []
+	for record in records:
+		copy = None
+		if isinstance(record, dict):
+			for field, table in REFERENCES.items():
+				value = record.get(field)
+				if not isinstance(value, dict) or type(value.get("id")) is not int:
+					continue
+				if tables.setdefault(table, {}).setdefault(value["id"], value) != value:
+					continue
+				if copy is None:
+					copy = dict(record)
+				copy[field] = value["id"]
+		normalized.append(copy or record)
+	return normalized, tables
+
+def lookup_data(tables):
+	"""
+	Get the lookup tables as saved in the output: the objects of each table, ordered by ID.
+
+	Args:
+		tables (dict): The objects by ID by table.
+
+	Returns:
+		dict: The list of objects by table.
+	"""
+	return {table: [entries[entry_id] for entry_id in sorted(entries)] for table, entries in sorted(tables.items())}
+
+def normalize_data(data):
+	"""
+	Normalize the endpoints of a JSON output, with the lookup tables of all of them under LOOKUPS_KEY.
+
+	Args:
+		data (dict): The records by endpoint.
+
+	Returns:
+		dict: The normalized records by endpoint, and the lookup tables if any reference was found.
+	"""
+	tables = {}
+	normalized = {}
+	for key, records in data.items():
+		normalized[key], _ = normalize_records(key, records, tables)
+	if tables:
+		normalized[LOOKUPS_KEY] = lookup_data(tables)
+		logger.debug(f"Lookup tables: {', '.join(f'{table} ({len(entries)})' for table, entries in tables.items())}")
+	return normalized
+
+def rehydrate_records(records, lookups, interned=None):
+	"""
+	Put back the references replaced by their ID, every record referencing the same object of the table.
+
+	The equal objects of the lookup tables of several NDJSON sections can be shared as well, through interned.
+
+	Args:
+		records (list): The normalized records, updated in place.
+		lookups (dict): The list of objects by table, as saved in the output.
+		interned (dict, optional): The objects already shared, by (table, ID), added to. Defaults to None.
+
+	Returns:
+		list: The records.
+	"""
+	interned = {} if interned is None else interned
+	tables = {}
+	for table, entries in lookups.items():
+		for entry in entries:
+			shared = interned.setdefault((table, entry["id"]), entry)
+			tables.setdefault(table, {})[entry["id"]] = shared if shared == entry else entry
+	for record in records:
+		if not isinstance(record, dict):
+			continue
+		for field, table in REFERENCES.items():
+			value = record.get(field)
+			if type(value) is int and value in tables.get(table, {}):
+				record[field] = tables[table][value]
+	return records
+
+def rehydrate_data(data):
+	"""
+	Rehydrate the endpoints of a normalized JSON output, removing its lookup tables.
+
+	Args:
+		data (dict): The records by endpoint, with the lookup tables under LOOKUPS_KEY if normalized.
+
+	Returns:
+		dict: The records by endpoint, with their references put back.
+	"""
+	lookups = data.pop(LOOKUPS_KEY, None)
+	if lookups:
+		for key in NORMALIZED_ENDPOINTS:
+			if isinstance(data.get(key), list):
+				rehydrate_records(data[key], lookups)
+	return data
@@ -0,0 +1,485 @@
+import os
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from srcs_extraction import checkpoint, config, endpoints, logger, session, throttle
+
+PAGE_SIZE = 100
+PROJECT_LISTINGS = ("memberships", "versions", "issue_categories")
+SAMPLE_BYTES = 1024 * 1024
+
+def plan_path(output_file):
+	"""
+	Get the path of the extraction plan, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the plan.
+	"""
+	return os.path.join(os.path.dirname(output_file), "extraction_plan.json")
+
+def page_count(count):
+	"""
+	Get the number of requests paging through a listing of 100 records per page.
+
+	Args:
+		count (int): The number of records.
+
+	Returns:
+		int: The number of pages, at least one.
+	"""
+	return max(1, math.ceil(count / PAGE_SIZE))
+
+def listing_pages(count):
+	"""
+	Get the number of requests of fetcher.fetch_endpoint_data() on a listing, which asks for one more
+	page after a full last one, for the records added during the extraction.
+
+	Args:
+		count (int): The number of records.
+
+	Returns:
+		int: The number of pages.
+	"""
+	return count // PAGE_SIZE + 1
+
+def probe(path, params=None, limit=1):
+	"""
+	Request the first records of a listing, for its total_count and the size of its records.
+
+	Args:
+		path (str): The path to request, e.g., "/issues.json".
+		params (dict, optional): The filters of the listing. Defaults to None.
+		limit (int, optional): The number of records asked. Defaults to 1.
+
+	Returns:
+		tuple: (data, seconds, size), data being None if the request failed.
+	"""
+	url = f"{config.BASE_URL}{path}"
+	start = time.monotonic()
+	try:
+		response = session.get(url, params={**(params or {}), "offset": 0, "limit": limit})
+		seconds = time.monotonic() - start
+		if response.status_code != 200:
+			logger.warning(f"Probe of {url} answered {response.status_code}")
+			return None, seconds, len(response.content)
+		return response.json(), seconds, len(response.content)
+	except Exception as e:
+		logger.warning(f"Probe of {url} failed: {e}")
+		return None, time.monotonic() - start, 0
+
+def listing_entry(data, key, size, requests=None):
+	"""
+	Estimate a listing from the answer of its probe.
+
+	Args:
+		data (dict): The answer of the probe, or None.
+		key (str): The key holding the records.
+		size (int): The size of the answer, in bytes.
+		requests (int, optional): The number of requests, when not the pages of the listing. Defaults to None.
+
+	Returns:
+		dict: The records, requests and bytes of the listing.
+	"""
+	if not data:
+		return {"records": None, "requests": requests or 1, "bytes": 0, "estimated": True}
+	records = data.get(key, [])
+	count = data.get("total_count", len(records) if isinstance(records, list) else 1)
+	record_size = size / max(1, len(records) if isinstance(records, list) else 1)
+	return {"records": count, "requests": requests or listing_pages(count), "bytes": round(count * record_size), "estimated": False}
+
+def plan_issues(data, size, project_ids, samples, files):
+	"""
+	Estimate the issues listing, its sharded variant and the requests of the issues completed one by one:
+	all of them with config.JOURNALS, or the ones whose includes the listing ignores.
+
+	With config.ISSUE_ATTACHMENTS, the attachments of the probed page of issues are extrapolated to
+	all the issues, and added to the files sampled for the download throughput.
+
+	Args:
+		data (dict): The answer of the probe of the listing, or None.
+		size (int): The size of the answer, in bytes.
+		project_ids (list): The IDs of the projects, the shards of config.SHARDED_ISSUES.
+		samples (list): The (seconds, size) of the probes, appended to.
+		files (list): The files to download, appended to.
+
+	Returns:
+		dict: The records, requests and bytes of the issues, and the estimated attachments to download.
+	"""
+	entry = listing_entry(data, "issues", size)
+	if not data:
+		return entry
+	if config.SHARDED_ISSUES and project_ids:
+		params = {"status_id": "*", "subproject_id": "!*"}
+		with ThreadPoolExecutor(max_workers=config.WORKERS, thread_name_prefix="redmine-plan") as executor:
+			probes = list(executor.map(lambda project_id: probe("/issues.json", {**params, "project_id": project_id}), project_ids))
+		requests = 0
+		for shard, seconds, shard_size in probes:
+			samples.append((seconds, shard_size))
+			count = (shard or {}).get("total_count", 0)
+			requests += page_count(count)
+			if count > config.SHARD_SIZE:
+				requests += 2 + math.ceil(count / config.SHARD_SIZE)
+		entry["requests"] = requests
+		entry["estimated"] = True
+	issues = data.get("issues", [])
+	if issues:
+		issue = issues[0]
+		if config.JOURNALS or not isinstance(issue.get("relations"), list) or (config.ISSUE_ATTACHMENTS and not isinstance(issue.get("attachments"), list)):
+			logger.info("The journals, or the includes the issues listing ignores, need one request per issue")
+			entry["requests"] += entry["records"]
+			entry["bytes"] += round(entry["records"] * size / len(issues))
+	if config.ISSUE_ATTACHMENTS and issues:
+		sampled = [file for issue in issues for file in issue.get("attachments") or [] if file.get("content_url")]
+		ratio = entry["records"] / len(issues)
+		entry["attachments"] = {"files": round(len(sampled) * ratio), "bytes": round(sum(file.get("filesize", 0) for file in sampled) * ratio)}
+		files.extend(sampled)
+	return entry
+
+def plan_project(project_id):
+	"""
+	Estimate the sub-resources of a project: one request per listing and per wiki page, and the files to download.
+
+	Args:
+		project_id (int): The ID of the project.
+
+	Returns:
+		dict: The requests, records and bytes by sub-resource, the files, their size, the first wiki
+		page title and the (seconds, size) of the probes.
+	"""
+	result = {"requests": {}, "records": {}, "bytes": {}, "files": [], "wiki_page": None, "samples": []}
+	for name in PROJECT_LISTINGS:
+		data, seconds, size = probe(f"/projects/{project_id}/{name}.json")
+		result["samples"].append((seconds, size))
+		entry = listing_entry(data, name, size, requests=1)
+		result["requests"][name] = 1
+		result["records"][name] = entry["records"] or 0
+		result["bytes"][name] = entry["bytes"]
+
+	data, seconds, size = probe(f"/projects/{project_id}/files.json", limit=PAGE_SIZE)
+	result["samples"].append((seconds, size))
+	result["files"] = [file for file in (data or {}).get("files", []) if file.get("content_url")]
+	result["requests"]["files"] = 1
+	result["records"]["files"] = len(result["files"])
+	result["bytes"]["files"] = size
+
+	data, seconds, size = probe(f"/projects/{project_id}/wiki/index.json", limit=PAGE_SIZE)
+	result["samples"].append((seconds, size))
+	pages = [page for page in (data or {}).get("wiki_pages", []) if page.get("title")]
+	result["requests"]["wiki"] = 1 + len(pages)
+	result["records"]["wiki"] = len(pages)
+	result["bytes"]["wiki"] = size
+	if pages:
+		result["wiki_page"] = pages[0]["title"]
+	return result
+
+def sample_download(files, latency):
+	"""
+	Measure the download throughput on the first bytes of the largest file.
+
+	Args:
+		files (list): The files to download.
+		latency (float): The mean latency of the probes, taken out of the measure.
+
+	Returns:
+		float: The bytes per second of one download, or None if it could not be measured.
+	"""
+	if not files:
+		return None
+	file = max(files, key=lambda file: file.get("filesize", 0))
+	headers = {**config.HEADERS, "Range": f"bytes=0-{SAMPLE_BYTES - 1}"}
+	start = time.monotonic()
+	try:
+		response = session.get(file["content_url"], headers=headers, stream=True, adaptive=False)
+		size = sum(len(chunk) for chunk in response.iter_content(64 * 1024))
+		response.close()
+	except Exception as e:
+		logger.warning(f"Sample download of {file['content_url']} failed: {e}")
+		return None
+	transfer = time.monotonic() - start - latency
+	return size / transfer if size and transfer > 0 else None
+
+def estimate_wall_time(requests, files, file_bytes, latency, throughput):
+	"""
+	Estimate the wall time of the extraction, the requests and the downloads running side by side.
+
+	Args:
+		requests (int): The requests sent to Redmine, downloads excluded.
+		files (int): The files to download.
+		file_bytes (int): The size of the files.
+		latency (float): The mean time of a request.
+		throughput (float): The bytes per second of one download, or None if unknown.
+
+	Returns:
+		dict: The seconds of the requests, of the downloads and of the whole extraction.
+	"""
+	request_seconds = requests * latency / config.WORKERS
+	if config.MAX_RPS:
+		request_seconds = max(request_seconds, requests / config.MAX_RPS)
+	download_seconds = files * latency / config.DOWNLOAD_WORKERS
+	if throughput:
+		download_seconds += file_bytes / (throughput * config.DOWNLOAD_WORKERS)
+	if config.MAX_BANDWIDTH:
+		download_seconds = max(download_seconds, file_bytes / config.MAX_BANDWIDTH)
+	return {
+		"requests": round(request_seconds, 1),
+		"downloads": round(download_seconds, 1),
+		"total": round(max(request_seconds, download_seconds), 1)
+	}
+
+def build_plan():
+	"""
+	Probe every endpoint of the extraction and estimate its requests, bytes and wall time.
+
+	The listings are probed with limit=1 for their total_count, and every project for its
+	sub-resources; the files listings, and a page of issues with config.ISSUE_ATTACHMENTS, give the size
+	of the downloads. Custom endpoints with an
+	"{id}" placeholder are counted as one request per record of their parent.
+
+	The totals of requests and bytes count the downloads, one request per file, like the report of the
+	extraction does, so the two can be compared.
+
+	Returns:
+		dict: The plan, with the records, requests and bytes by endpoint, the downloads and the estimates.
+	"""
+	samples = []
+	plan_endpoints = {}
+	project_ids = []
+	files = []
+	attachment_files = []
+	wiki_page = None
+
+	if "projects" in endpoints.endpoints:
+		projects = []
+		offset = 0
+		while True:
+			data, seconds, size = probe("/projects.json", {"offset": offset}, limit=PAGE_SIZE)
+			samples.append((seconds, size))
+			page = (data or {}).get("projects", [])
+			projects.extend(page)
+			offset += PAGE_SIZE
+			if not data or len(page) < PAGE_SIZE or offset >= data.get("total_count", 0):
+				break
+		project_ids = [project["id"] for project in projects]
+		entry = {"records": len(projects), "requests": listing_pages(len(projects)), "bytes": sum(size for _, size in samples), "estimated": False, "sub_resources": {}}
+		with ThreadPoolExecutor(max_workers=config.WORKERS, thread_name_prefix="redmine-plan") as executor:
+			for project_id, project in zip(project_ids, executor.map(plan_project, project_ids)):
+				samples.extend(project["samples"])
+				files.extend(project["files"])
+				if wiki_page is None and project["wiki_page"]:
+					wiki_page = (project_id, project["wiki_page"])
+				for name, requests in project["requests"].items():
+					sub_resource = entry["sub_resources"].setdefault(name, {"records": 0, "requests": 0, "bytes": 0})
+					sub_resource["requests"] += requests
+					sub_resource["records"] += project["records"][name]
+					sub_resource["bytes"] += project["bytes"][name]
+		plan_endpoints["projects"] = entry
+
+	for key, spec in endpoints.specs.items():
+		if key == "projects":
+			continue
+		if spec["parent"]:
+			parent = plan_endpoints.get(spec["parent"], {})
+			parents = parent.get("records") or 0
+			plan_endpoints[key] = {"records": None, "requests": parents, "bytes": 0, "estimated": True}
+			continue
+		if spec["pagination"] == "none":
+			data, seconds, size = probe(spec["path"])
+			samples.append((seconds, size))
+			plan_endpoints[key] = {"records": 1, "requests": 1, "bytes": size, "estimated": False}
+			continue
+		params = endpoints.issue_params() if key == "issues" else None
+		data, seconds, size = probe(spec["path"], params, limit=PAGE_SIZE if key == "issues" and config.ISSUE_ATTACHMENTS else 1)
+		samples.append((seconds, size))
+		if key == "issues":
+			plan_endpoints[key] = plan_issues(data, size, project_ids, samples, attachment_files)
+		else:
+			plan_endpoints[key] = listing_entry(data, spec["key"], size)
+		if key == "time_entries" and config.WINDOWED_TIME_ENTRIES and plan_endpoints[key]["records"]:
+			windows = math.ceil(2 * plan_endpoints[key]["records"] / (config.WINDOW_PAGES * PAGE_SIZE))
+			plan_endpoints[key]["requests"] = 2 + page_count(plan_endpoints[key]["records"]) + windows
+			plan_endpoints[key]["estimated"] = True
+
+	latency = sum(seconds for seconds, _ in samples) / len(samples) if samples else 0
+	if "projects" in plan_endpoints and wiki_page:
+		project_id, title = wiki_page
+		data, seconds, size = probe(f"/projects/{project_id}/wiki/{title}.json")
+		samples.append((seconds, size))
+		wiki = plan_endpoints["projects"]["sub_resources"]["wiki"]
+		wiki["bytes"] += wiki["records"] * size
+
+	for entry in plan_endpoints.values():
+		for sub_resource in entry.get("sub_resources", {}).values():
+			entry["requests"] += sub_resource["requests"]
+			entry["bytes"] += sub_resource["bytes"]
+
+	file_count = len(files) + sum(entry.get("attachments", {}).get("files", 0) for entry in plan_endpoints.values())
+	file_bytes = sum(file.get("filesize", 0) for file in files) + sum(entry.get("attachments", {}).get("bytes", 0) for entry in plan_endpoints.values())
+	throughput = sample_download(files + attachment_files, latency)
+	api_requests = sum(entry["requests"] for entry in plan_endpoints.values())
+	return {
+		"created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+		"base_url": config.BASE_URL,
+		"workers": config.WORKERS,
+		"download_workers": config.DOWNLOAD_WORKERS,
+		"endpoints": plan_endpoints,
+		"requests": api_requests + file_count,
+		"bytes": sum(entry["bytes"] for entry in plan_endpoints.values()) + file_bytes,
+		"downloads": {"files": file_count, "bytes": file_bytes},
+		"probes": len(samples) + (1 if files or attachment_files else 0),
+		"latency": round(latency, 4),
+		"download_bytes_per_second": round(throughput, 1) if throughput else None,
+		"wall_time": estimate_wall_time(api_requests, file_count, file_bytes, latency, throughput)
+	}
+
+def format_size(size):
+	"""
+	Format a size in bytes with a K, M or G suffix.
+
+	Args:
+		size (int): The size in bytes.
+
+	Returns:
+		str: The formatted size, e.g., 12.5M.
+	"""
+	for unit, multiplier in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+		if size >= multiplier:
+			return f"{size / multiplier:.1f}{unit}"
+	return f"{size}B"
+
+def format_duration(seconds):
+	"""
+	Format a duration in seconds as hours, minutes and seconds.
+
+	Args:
+		seconds (float): The duration.
+
+	Returns:
+		str: The formatted duration, e.g., 1h02m03s.
+	"""
+	minutes, seconds = divmod(round(seconds), 60)
+	hours, minutes = divmod(minutes, 60)
+	if hours:
+		return f"{hours}h{minutes:02d}m{seconds:02d}s"
+	if minutes:
+		return f"{minutes}m{seconds:02d}s"
+	return f"{seconds}s"
+
+def print_plan(plan):
+	"""
+	Print the plan, endpoint by endpoint, and its totals.
+
+	Args:
+		plan (dict): The plan returned by build_plan().
+
+	Returns:
+		None
+	"""
+	print(config.BOLD + f"Extraction plan of {plan['base_url']}" + config.END + f" ({plan['probes']} probe requests, {plan['latency'] * 1000:.0f}ms per request)")
+	rows = []
+	for key, entry in plan["endpoints"].items():
+		rows.append((key, entry))
+		for name, sub_resource in entry.get("sub_resources", {}).items():
+			rows.append((f"  ↪ {name}", sub_resource))
+	for name, entry in rows:
+		records = "?" if entry["records"] is None else entry["records"]
+		approximate = "~" if entry.get("estimated") else ""
+		print(f"\t{name:<24} {records:>10} records {approximate + str(entry['requests']):>10} requests {format_size(entry['bytes']):>10}")
+	downloads = plan["downloads"]
+	print(f"\t{'files to download':<24} {downloads['files']:>10} files {format_size(downloads['bytes']):>29}")
+	wall_time = plan["wall_time"]
+	print(config.BOLD + "Total: " + config.END + f"{plan['requests']} requests, {downloads['files']} of them downloads, "
+		f"{format_size(plan['bytes'] - downloads['bytes'])} of answers and {format_size(downloads['bytes'])} of files")
+	print(config.BOLD + "Estimated wall time: " + config.END + f"{format_duration(wall_time['total'])} with {plan['workers']} workers and {plan['download_workers']} download workers "
+		f"(requests {format_duration(wall_time['requests'])}, downloads {format_duration(wall_time['downloads'])})")
+
+def save_plan(output_file, plan):
+	"""
+	Write the plan next to the output, for the extraction to size its progress bars from.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		plan (dict): The plan returned by build_plan().
+
+	Returns:
+		str: The path of the plan.
+	"""
+	file_path = plan_path(output_file)
+	plan_dir = os.path.dirname(file_path)
+	if plan_dir:
+		os.makedirs(plan_dir, exist_ok=True)
+	checkpoint.atomic_write_json(file_path, plan)
+	logger.info(f"Extraction plan saved to {file_path}")
+	return file_path
+
+def load_plan(output_file):
+	"""
+	Load the plan made with --plan for the same Redmine, if any.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		dict: The plan, or None if there is none for config.BASE_URL.
+	"""
+	file_path = plan_path(output_file)
+	if not os.path.exists(file_path):
+		return None
+	try:
+		with open(file_path, "r", encoding="utf-8") as file:
+			plan = json.load(file)
+	except (OSError, ValueError) as e:
+		logger.warning(f"Ignoring the extraction plan {file_path}: {e}")
+		return None
+	if plan.get("base_url") != config.BASE_URL:
+		logger.info(f"Ignoring the extraction plan {file_path}, made for {plan.get('base_url')}")
+		return None
+	logger.info(f"Using the extraction plan of {plan['created_at']}: {plan['requests']} requests")
+	return plan
+
+def progress_total(plan, key):
+	"""
+	Get the total of the progress bar of an endpoint from the plan, in the units the extraction advances it by.
+
+	The projects and the issues count 7 units per record, 1 for the listing and 6 for their sub-resources,
+	and an endpoint with an "{id}" placeholder 1 unit per parent.
+
+	Args:
+		plan (dict): The plan, or None.
+		key (str): The endpoint.
+
+	Returns:
+		int: The total, or None if unknown.
+	"""
+	entry = (plan or {}).get("endpoints", {}).get(key)
+	if not entry:
+		return None
+	if endpoints.specs.get(key, {}).get("parent"):
+		return entry["requests"]
+	if entry["records"] is None:
+		return None
+	return entry["records"] * 7 if key in ("projects", "issues") else entry["records"]
+
+def plan_extraction(output_file):
+	"""
+	Probe Redmine, then print and save the plan of the extraction, without extracting anything.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		dict: The plan.
+	"""
+	throttle.configure()
+	try:
+		plan = build_plan()
+	finally:
+		session.close_session()
+	print_plan(plan)
+	file_path = save_plan(output_file, plan)
+	print("Plan saved to " + config.BOLD + file_path + config.END + ", the extraction into the same output will use it for its progress")
+	return plan
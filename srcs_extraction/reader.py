@@ -0,0 +1,278 @@
+import os
+import json
+import sqlite3
+from srcs_extraction import compression, logger, normalize, store
+
+def read_ndjson(file_path):
+	"""
+	Read the sections of an NDJSON extraction, one record per line between a header and a footer.
+
+	Unlike ndjson.read_sections(), which resumes after the last complete section, a truncated section
+	is an error: the extraction to convert is incomplete. A compressed file is decompressed on the fly,
+	and a section normalized with the lookup tables of its header is rehydrated, the equal objects of
+	the tables of all the sections being shared.
+
+	Args:
+		file_path (str): The NDJSON file to read.
+
+	Returns:
+		dict: The records by endpoint.
+
+	Raises:
+		ValueError: If a section is truncated, e.g., the extraction was interrupted.
+	"""
+	sections = {}
+	key = None
+	lookups = None
+	interned = {}
+	records = []
+	with compression.open_read(file_path) as file:
+		for line in file:
+			entry = json.loads(line)
+			if isinstance(entry, dict) and "_header" in entry:
+				key = entry["_header"]["entity"]
+				lookups = entry["_header"].get("lookups")
+				records = []
+			elif isinstance(entry, dict) and "_footer" in entry:
+				if key != entry["_footer"]["entity"] or len(records) != entry["_footer"]["count"]:
+					raise ValueError(f"Section {key} of {file_path} does not match its footer, the extraction may have been interrupted.")
+				sections[key] = normalize.rehydrate_records(records, lookups, interned) if lookups else records
+				key = None
+			else:
+				records.append(entry)
+	if key is not None:
+		raise ValueError(f"Section {key} of {file_path} has no footer, the extraction may have been interrupted.")
+	return sections
+
+def find_input(base_filename):
+	"""
+	Find the file of an endpoint in multiple files mode, NDJSON first, then JSON, each uncompressed, gzip or zstd.
+
+	Args:
+		base_filename (str): The path and prefix of the file, followed by the endpoint name.
+
+	Returns:
+		str: The file found, or the legacy JSON one if none exists.
+	"""
+	for extension in (".ndjson", ".json"):
+		for compressed in ("", *compression.EXTENSIONS.values()):
+			file_path = base_filename + extension + compressed
+			if os.path.exists(file_path):
+				return file_path
+	return base_filename + ".json"
+
+def is_store(input_file):
+	"""
+	Tell if the input is the SQLite store of an extraction made with --sqlite.
+
+	Args:
+		input_file (str): The file, path, and/or prefix that should be taken as input.
+
+	Returns:
+		bool: True for a .sqlite input.
+	"""
+	return input_file.endswith(".sqlite")
+
+def open_store(input_file):
+	"""
+	Open the SQLite store of an extraction, read-only.
+
+	Args:
+		input_file (str): The .sqlite file.
+
+	Returns:
+		sqlite3.Connection: The database.
+
+	Raises:
+		ValueError: If the file does not exist.
+	"""
+	if not os.path.exists(input_file):
+		raise ValueError(f"The SQLite store {input_file} does not exist.")
+	return sqlite3.connect(f"file:{input_file}?mode=ro", uri=True)
+
+def store_counts(connection):
+	"""
+	Read the number of records of each endpoint written to a SQLite store.
+
+	Args:
+		connection (sqlite3.Connection): The database.
+
+	Returns:
+		dict: The number of records by endpoint.
+	"""
+	return dict(connection.execute("SELECT name, count FROM endpoints"))
+
+def read_store(connection, key, where="", params=()):
+	"""
+	Read the records of an endpoint from a SQLite store, see store.read_records(), checking the endpoint was written.
+
+	Args:
+		connection (sqlite3.Connection): The database.
+		key (str): The endpoint, e.g., "issues".
+		where (str, optional): An SQL condition on the indexed columns id, project_id, issue_id or updated_on. Defaults to "".
+		params (tuple, optional): The parameters of the condition. Defaults to ().
+
+	Returns:
+		generator: The records, in the extraction order.
+
+	Raises:
+		ValueError: If the endpoint is missing from the store.
+	"""
+	if key not in store_counts(connection):
+		raise ValueError(f"Unexpected input format. The SQLite store has no '{key}' table.")
+	return store.read_records(connection, key, where, params)
+
+def stream_projects(input_file, multiple_files=False):
+	"""
+	Give the projects one at a time, each one with its issues and time entries.
+
+	Only a SQLite store is read project by project, through its project_id indexes, so only one
+	project is in memory at a time. A JSON or NDJSON input is loaded whole, then grouped by project:
+	its memory is not bounded by the size of a project.
+
+	Args:
+		input_file (str): The file, path, and/or prefix that should be taken as input.
+		multiple_files (bool, optional): The input is the prefix of one file per endpoint. Defaults to False.
+
+	Returns:
+		tuple: (counts, batches), the number of projects, issues and time entries, and an iterator of
+		(project, issues, time_entries) tuples in the order of the projects.
+	"""
+	if is_store(input_file):
+		connection = open_store(input_file)
+		counts = store_counts(connection)
+		for key in ("projects", "issues", "time_entries"):
+			if key not in counts:
+				raise ValueError(f"Unexpected input format. The SQLite store has no '{key}' table.")
+
+		def batches():
+			try:
+				for project in read_store(connection, "projects"):
+					issues = list(read_store(connection, "issues", "project_id = ?", (project["id"],)))
+					time_entries = list(read_store(connection, "time_entries", "project_id = ?", (project["id"],)))
+					yield project, issues, time_entries
+			finally:
+				connection.close()
+
+		return {key: counts[key] for key in ("projects", "issues", "time_entries")}, batches()
+
+	entities = load_entities(input_file, ["projects", "issues", "time_entries"], multiple_files)
+	issues_by_project = {}
+	for issue in entities["issues"]:
+		issues_by_project.setdefault(issue["project"]["id"], []).append(issue)
+	time_entries_by_project = {}
+	for time_entry in entities["time_entries"]:
+		time_entries_by_project.setdefault(time_entry["project"]["id"], []).append(time_entry)
+	counts = {key: len(records) for key, records in entities.items()}
+	batches = (
+		(project, issues_by_project.get(project["id"], []), time_entries_by_project.get(project["id"], []))
+		for project in entities["projects"]
+	)
+	return counts, batches
+
+def stream_relations(input_file, multiple_files=False):
+	"""
+	Give the relations of the issues one at a time.
+
+	A SQLite store is read from its relations table, without loading the issues. The other inputs are
+	loaded whole.
+
+	Args:
+		input_file (str): The file, path, and/or prefix that should be taken as input.
+		multiple_files (bool, optional): The input is the prefix of one file per endpoint. Defaults to False.
+
+	Returns:
+		tuple: (count, relations), the number of relations and an iterator of the relations in the order of the issues.
+
+	Raises:
+		ValueError: If an issue has no relations.
+	"""
+	if is_store(input_file):
+		connection = open_store(input_file)
+		if "issues" not in store_counts(connection):
+			connection.close()
+			raise ValueError("Unexpected input format. The SQLite store has no 'issues' table.")
+		(count,) = connection.execute("SELECT COUNT(*) FROM relations").fetchone()
+
+		def relations():
+			try:
+				for (data,) in connection.execute("SELECT data FROM relations ORDER BY rowid"):
+					yield json.loads(data)
+			finally:
+				connection.close()
+
+		return count, relations()
+
+	relations = []
+	for issue in load_entities(input_file, ["issues"], multiple_files)["issues"]:
+		if not isinstance(issue, dict) or "relations" not in issue:
+			raise ValueError("Unexpected input format. Expected a list or an object with a 'relations' key.")
+		relations_data = issue["relations"]
+		if relations_data and "relations" in relations_data:
+			relations.extend(relations_data["relations"])
+	return len(relations), iter(relations)
+
+def load_entities(input_file, keys, multiple_files=False):
+	"""
+	Load endpoints of an extraction, from the legacy JSON output, the NDJSON one, compressed or not, or the SQLite store.
+
+	The issues, time entries and news of a normalized JSON output are rehydrated from its lookup tables,
+	the lookups file in multiple files mode.
+
+	Args:
+		input_file (str): The file, path, and/or prefix that should be taken as input.
+		keys (list): The endpoints to load, e.g., ["projects", "issues"].
+		multiple_files (bool, optional): The input is the prefix of one file per endpoint. Defaults to False.
+
+	Returns:
+		dict: The records by endpoint.
+
+	Raises:
+		ValueError: If an endpoint is missing from the input.
+	"""
+	entities = {}
+	if is_store(input_file):
+		logger.info(f"Loading {', '.join(keys)} from the SQLite store {input_file}.")
+		connection = open_store(input_file)
+		try:
+			for key in keys:
+				entities[key] = list(read_store(connection, key))
+		finally:
+			connection.close()
+		return entities
+
+	if multiple_files:
+		lookups = None
+		lookups_path = find_input(input_file + normalize.LOOKUPS_KEY)
+		if any(key in normalize.NORMALIZED_ENDPOINTS for key in keys) and os.path.exists(lookups_path):
+			logger.info(f"Loading the lookup tables from {lookups_path}.")
+			with compression.open_read(lookups_path) as file:
+				lookups = json.load(file)
+		for key in keys:
+			file_path = find_input(input_file + key)
+			logger.info(f"Loading {key} from {file_path}.")
+			if compression.strip_extension(file_path).endswith(".ndjson"):
+				entities[key] = read_ndjson(file_path).get(key, [])
+			else:
+				with compression.open_read(file_path) as file:
+					data = json.load(file)
+				entities[key] = data[key] if isinstance(data, dict) and key in data else data
+			if lookups and key in normalize.NORMALIZED_ENDPOINTS:
+				normalize.rehydrate_records(entities[key], lookups)
+		return entities
+
+	logger.info(f"Loading data from {input_file}.")
+	if compression.strip_extension(input_file).endswith(".ndjson"):
+		data = read_ndjson(input_file)
+	else:
+		with compression.open_read(input_file) as file:
+			data = json.load(file)
+	if isinstance(data, list) and len(keys) == 1:
+		return {keys[0]: data}
+	for key in keys:
+		if not isinstance(data, dict) or key not in data:
+			raise ValueError(f"Unexpected input format. Expected an object with a '{key}' key.")
+		entities[key] = data[key]
+		if normalize.LOOKUPS_KEY in data and key in normalize.NORMALIZED_ENDPOINTS:
+			normalize.rehydrate_records(entities[key], data[normalize.LOOKUPS_KEY])
+	return entities
@@ -0,0 +1,92 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from srcs_extraction import logger
+
+def check_tasks(tasks):
+	"""
+	Check that the dependencies of the tasks exist and have no cycle.
+
+	Args:
+		tasks (dict): The tasks by name, each one a (function, dependencies) tuple.
+
+	Returns:
+		list: The task names in an order satisfying the dependencies.
+
+	Raises:
+		ValueError: If a dependency is unknown or the dependencies have a cycle.
+	"""
+	for name, (_, dependencies) in tasks.items():
+		for dependency in dependencies:
+			if dependency not in tasks:
+				raise ValueError(f"Task {name} depends on the unknown task {dependency}")
+	order = []
+	remaining = dict(tasks)
+	while remaining:
+		ready = [name for name, (_, dependencies) in remaining.items() if all(dependency in order for dependency in dependencies)]
+		if not ready:
+			raise ValueError(f"The dependencies of the tasks {', '.join(remaining)} have a cycle")
+		for name in ready:
+			order.append(name)
+			del remaining[name]
+	return order
+
+def run_tasks(tasks, max_workers=None, stop_event=None):
+	"""
+	Run tasks concurrently, each one as soon as the tasks it depends on are done.
+
+	Tasks ready at the same time start in the order of the tasks dict. The tasks themselves only
+	coordinate: the Redmine requests they send are bounded by the shared request budget, so
+	max_workers only needs to cover the tasks that may run together.
+	If a task fails, no other task is started, the running ones are waited for and the first error is raised.
+	If the run is interrupted, e.g., by Ctrl-C, stop_event is set for the running tasks to give up, the
+	tasks not started are cancelled and the interruption is raised without waiting for the running ones.
+
+	Args:
+		tasks (dict): The tasks by name, each one a (function, dependencies) tuple, function being called without arguments.
+		max_workers (int, optional): The maximum number of tasks running at the same time. Defaults to the number of tasks.
+		stop_event (threading.Event, optional): Set when the run is interrupted, checked by the tasks. Defaults to None.
+
+	Returns:
+		dict: The result of each task by name.
+
+	Raises:
+		ValueError: If a dependency is unknown or the dependencies have a cycle.
+		Exception: The first error raised by a task.
+		KeyboardInterrupt: If the run is interrupted.
+	"""
+	check_tasks(tasks)
+	results = {}
+	pending = dict(tasks)
+	running = {}
+	error = None
+	executor = ThreadPoolExecutor(max_workers=max_workers or max(len(tasks), 1), thread_name_prefix="redmine-task")
+	try:
+		while pending or running:
+			if error is None:
+				for name in [name for name, (_, dependencies) in pending.items() if all(dependency in results for dependency in dependencies)]:
+					function, _ = pending.pop(name)
+					logger.info(f"Task {name} started")
+					running[executor.submit(function)] = name
+			if not running:
+				break
+			done, _ = wait(running, return_when=FIRST_COMPLETED)
+			for future in done:
+				name = running.pop(future)
+				try:
+					results[name] = future.result()
+					logger.info(f"Task {name} done")
+				except Exception as e:
+					logger.error(f"Task {name} failed: {e}")
+					if error is None:
+						error = e
+	except BaseException:
+		if stop_event is not None:
+			stop_event.set()
+		logger.warning(f"Run interrupted, tasks stopped: {', '.join(list(running.values()) + list(pending))}")
+		executor.shutdown(wait=False, cancel_futures=True)
+		raise
+	executor.shutdown()
+	if error is not None:
+		if pending:
+			logger.warning(f"Tasks not started because of the failure: {', '.join(pending)}")
+		raise error
+	return results
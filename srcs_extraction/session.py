@@ -0,0 +1,155 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+from srcs_extraction import cache, config, logger, telemetry, throttle
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+	"""
+	Get the shared HTTP session, create it if needed.
+
+	The session keeps a pool of keep-alive connections per host, sized for the request and download pools.
+	Cookies are refused so the session holds no per-request state and can be shared between threads.
+
+	Returns:
+		requests.Session: The shared session.
+	"""
+	global _session
+	with _session_lock:
+		if _session is None:
+			_session = requests.Session()
+			_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+			pool_size = config.WORKERS + config.DOWNLOAD_WORKERS
+			adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size)
+			_session.mount("http://", adapter)
+			_session.mount("https://", adapter)
+			logger.info(f"HTTP session created with {pool_size} connections per host")
+		return _session
+
+def close_session():
+	"""
+	Close the shared HTTP session and its pooled connections.
+
+	Returns:
+		None
+	"""
+	global _session
+	with _session_lock:
+		if _session is not None:
+			_session.close()
+			_session = None
+			logger.info("HTTP session closed")
+
+def backoff_delay(attempt):
+	"""
+	Compute the delay before the next attempt, using exponential backoff with full jitter.
+
+	Args:
+		attempt (int): The number of attempts already failed.
+
+	Returns:
+		float: The delay in seconds.
+	"""
+	return random.uniform(0, min(config.MAX_BACKOFF, config.BACKOFF_FACTOR * (2 ** attempt)))
+
+def retry_after_delay(response):
+	"""
+	Read the delay asked by the server in the Retry-After header.
+
+	Args:
+		response (requests.Response): The response to read.
+
+	Returns:
+		float: The delay in seconds, or None if the header is missing or invalid.
+	"""
+	retry_after = response.headers.get("Retry-After")
+	if not retry_after:
+		return None
+	try:
+		delay = float(retry_after)
+	except ValueError:
+		try:
+			delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+		except (TypeError, ValueError):
+			return None
+	return min(max(delay, 0), config.MAX_RETRY_AFTER)
+
+def get(url, params=None, headers=None, stream=False, adaptive=True):
+	"""
+	Send a GET request through the shared session, retrying transient failures.
+
+	Connection errors, timeouts and 429/5xx answers are retried up to config.RETRIES times,
+	waiting for the Retry-After header when given, or an exponential backoff otherwise.
+	Every attempt goes through the throttling controllers and is recorded in the telemetry.
+	When the HTTP cache is open, a response cached by a previous run is revalidated with a
+	conditional request and its body is reused if Redmine answers 304 Not Modified.
+
+	Args:
+		url (str): The URL to request.
+		params (dict, optional): Dictionary of query parameters. Defaults to None.
+		headers (dict, optional): Request headers. Defaults to config.HEADERS.
+		stream (bool, optional): Do not read the body right away. Defaults to False.
+		adaptive (bool, optional): Count the request in the request budget of config.WORKERS, adaptive or fixed. Defaults to True.
+
+	Returns:
+		requests.Response: The last response received, possibly still an error one.
+
+	Raises:
+		requests.exceptions.RequestException: If the request still fails to complete after all retries.
+	"""
+	if headers is None:
+		headers = config.HEADERS
+	key = None if stream else cache.cache_key(url, params, headers)
+	attempt = 0
+	while True:
+		throttle.acquire(adaptive)
+		start = time.monotonic()
+		try:
+			response = get_session().get(
+				url, headers=cache.conditional_headers(key, headers) if key else headers, params=params, stream=stream,
+				timeout=(config.CONNECT_TIMEOUT, config.READ_TIMEOUT)
+			)
+		except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+			throttle.release(time.monotonic() - start, timed_out=True, adaptive=adaptive)
+			telemetry.record_request(url, time.monotonic() - start, retry=attempt > 0)
+			if attempt >= config.RETRIES:
+				raise
+			delay = backoff_delay(attempt)
+			logger.warning(f"Request to {url} failed ({err}), retry {attempt + 1}/{config.RETRIES} in {delay:.1f}s")
+		except Exception:
+			throttle.release(time.monotonic() - start, adaptive=adaptive)
+			raise
+		else:
+			elapsed = time.monotonic() - start
+			throttle.release(elapsed, status=response.status_code, adaptive=adaptive)
+			size = 0
+			if not stream:
+				size = len(response.content)
+				throttle.consume_bytes(size)
+			telemetry.record_request(url, elapsed, response.status_code, size, retry=attempt > 0)
+			if key and response.status_code == 304:
+				cached = cache.cached_response(key, response)
+				if cached is not None:
+					return cached
+				logger.warning(f"Cached response of {url} is gone, requesting it again")
+				key = None
+				continue
+			if response.status_code not in RETRY_STATUSES or attempt >= config.RETRIES:
+				if key:
+					cache.store_response(key, response)
+				return response
+			delay = retry_after_delay(response)
+			if delay is None:
+				delay = backoff_delay(attempt)
+			logger.warning(f"Request to {url} answered {response.status_code}, retry {attempt + 1}/{config.RETRIES} in {delay:.1f}s")
+			response.close()
+		time.sleep(delay)
+		attempt += 1
@@ -0,0 +1,172 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+from srcs_extraction import checkpoint, config, logger
+
+def parse_shard(value):
+	"""
+	Parse a shard given as "i/N", the i-th of N shards, counted from 1.
+
+	Args:
+		value (str): The shard to parse, e.g., 2/4.
+
+	Returns:
+		tuple: (index, count), or None if the value is invalid.
+	"""
+	index, _, count = value.partition("/")
+	if not index.strip().isdigit() or not count.strip().isdigit():
+		return None
+	index, count = int(index), int(count)
+	if count < 1 or not 1 <= index <= count:
+		return None
+	return index, count
+
+def shard_of(project_id, count):
+	"""
+	Get the shard a project belongs to, from a hash of its ID, the same on every machine.
+
+	Args:
+		project_id (int): The ID of the project.
+		count (int): The number of shards.
+
+	Returns:
+		int: The shard, counted from 1.
+	"""
+	digest = hashlib.sha256(str(project_id).encode("utf-8")).digest()
+	return int.from_bytes(digest[:8], "big") % count + 1
+
+def is_own_project(project_id):
+	"""
+	Tell if a project belongs to the shard of this extraction, config.SHARD.
+
+	Args:
+		project_id (int): The ID of the project.
+
+	Returns:
+		bool: True if the project is extracted by this shard, or without config.SHARD.
+	"""
+	if not config.SHARD:
+		return True
+	index, count = config.SHARD
+	return shard_of(project_id, count) == index
+
+def project_of(record):
+	"""
+	Get the ID of the project of a record, as {"project": {"id": ...}} or "project_id".
+
+	Args:
+		record (dict): The record.
+
+	Returns:
+		int: The ID of the project, or None.
+	"""
+	if not isinstance(record, dict):
+		return None
+	project = record.get("project")
+	if isinstance(project, dict):
+		return project.get("id")
+	return record.get("project_id")
+
+def filter_records(key, records):
+	"""
+	Keep the records of an endpoint that belong to the shard of this extraction.
+
+	The projects belong to the shard of their ID and the records of a project to the shard of their
+	project. The records of no project, e.g., the users, are kept by the first shard only.
+
+	Args:
+		key (str): The endpoint name.
+		records (list): The records of the endpoint.
+
+	Returns:
+		list: The records of the shard.
+	"""
+	if not config.SHARD:
+		return records
+	if key == "projects":
+		kept = [record for record in records if is_own_project(record["id"])]
+	else:
+		kept = [
+			record for record in records
+			if (is_own_project(project_of(record)) if project_of(record) is not None else config.SHARD[0] == 1)
+		]
+	if len(kept) != len(records):
+		logger.info(f"Shard {config.SHARD[0]}/{config.SHARD[1]} keeps {len(kept)} of the {len(records)} record(s) of {key}")
+	return kept
+
+def record_key(record):
+	"""
+	Get the sort key of a record in a shard output and in the merge: its ID, the records without one last.
+
+	Args:
+		record (dict): The record.
+
+	Returns:
+		tuple: The key.
+	"""
+	record_id = record.get("id") if isinstance(record, dict) else None
+	return (record_id is None, record_id if isinstance(record_id, int) else 0)
+
+def sort_records(records):
+	"""
+	Sort the records of a shard output by ID, for the merge to read the shards in step.
+
+	Args:
+		records (list): The records of an endpoint.
+
+	Returns:
+		list: The sorted records.
+	"""
+	return sorted(records, key=record_key)
+
+def shard_info_path(output_file):
+	"""
+	Get the path of the file describing the shard of an output, next to it.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the file.
+	"""
+	return os.path.join(os.path.dirname(output_file), "shard.json")
+
+def save_shard_info(output_file):
+	"""
+	Write which shard of how many the output holds, checked by the merge.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		None
+	"""
+	index, count = config.SHARD
+	file_path = shard_info_path(output_file)
+	directory = os.path.dirname(file_path)
+	if directory:
+		os.makedirs(directory, exist_ok=True)
+	checkpoint.atomic_write_json(file_path, {
+		"index": index,
+		"count": count,
+		"base_url": config.BASE_URL,
+		"created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+	})
+	logger.info(f"Shard {index}/{count} described in {file_path}")
+
+def load_shard_info(output_file):
+	"""
+	Read which shard of how many an output holds.
+
+	Args:
+		output_file (str): The file, path, and/or prefix of the output.
+
+	Returns:
+		dict: The index, count, base_url and created_at of the shard, or None if the output is not a shard.
+	"""
+	file_path = shard_info_path(output_file)
+	if not os.path.exists(file_path):
+		return None
+	with open(file_path, "r", encoding="utf-8") as file:
+		return json.load(file)
@@ -0,0 +1,238 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from srcs_extraction import logger
+
+PROJECT_CHILDREN = {
+	"memberships": ("memberships", "memberships"),
+	"versions": ("versions", "versions"),
+	"issue_categories": ("issue_categories", "issue_categories"),
+	"files": ("files", "files"),
+	"wiki": ("wiki_pages", "pages")
+}
+ISSUE_CHILDREN = {
+	"relations": ("relations", "relations")
+}
+CHILDREN = {
+	"projects": PROJECT_CHILDREN,
+	"issues": ISSUE_CHILDREN
+}
+INDEXED_COLUMNS = ("id", "project_id", "issue_id", "updated_on")
+
+_connection = None
+_store_lock = threading.Lock()
+
+def store_path(output_file):
+	"""
+	Get the path of the SQLite store, the output with a .sqlite extension.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the database.
+	"""
+	return os.path.splitext(output_file)[0] + ".sqlite"
+
+def table_name(key):
+	"""
+	Get the table of an endpoint, e.g., "projects/{id}/issue_categories" gives "projects_id_issue_categories".
+
+	Args:
+		key (str): The endpoint name.
+
+	Returns:
+		str: The table name.
+	"""
+	return re.sub(r"\W+", "_", key).strip("_")
+
+def reference_id(record, name):
+	"""
+	Get the ID of a record referenced by another one, e.g., its project, as {"id": ...} or as "<name>_id".
+
+	Args:
+		record (dict): The record.
+		name (str): The referenced record, e.g., "project".
+
+	Returns:
+		int: The ID, or None.
+	"""
+	reference = record.get(name)
+	if isinstance(reference, dict):
+		return reference.get("id")
+	return record.get(f"{name}_id")
+
+def index_values(record):
+	"""
+	Get the indexed columns of a record, a wiki page being read inside its {"wiki_page": ...} wrapper.
+
+	Args:
+		record (dict): The record.
+
+	Returns:
+		dict: The id, project_id, issue_id and updated_on of the record, None when it has none.
+	"""
+	if not isinstance(record, dict):
+		return dict.fromkeys(INDEXED_COLUMNS)
+	if isinstance(record.get("wiki_page"), dict):
+		record = record["wiki_page"]
+	return {
+		"id": record.get("id"),
+		"project_id": reference_id(record, "project"),
+		"issue_id": reference_id(record, "issue"),
+		"updated_on": record.get("updated_on")
+	}
+
+def create_table(connection, table):
+	"""
+	Create the table of an entity and its indexes, if missing.
+
+	Every table has the same columns: the raw JSON of the record in data, and its id, project_id,
+	issue_id and updated_on, each indexed.
+
+	Args:
+		connection (sqlite3.Connection): The database.
+		table (str): The table name.
+
+	Returns:
+		None
+	"""
+	connection.execute(f"CREATE TABLE IF NOT EXISTS \"{table}\" (id INTEGER, project_id INTEGER, issue_id INTEGER, updated_on TEXT, data TEXT NOT NULL)")
+	for column in INDEXED_COLUMNS:
+		connection.execute(f"CREATE INDEX IF NOT EXISTS \"{table}_{column}\" ON \"{table}\" ({column})")
+
+def open_store(output_file):
+	"""
+	Open the SQLite store of the extraction, creating it if needed.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		None
+	"""
+	global _connection
+	file_path = store_path(output_file)
+	directory = os.path.dirname(file_path)
+	if directory:
+		os.makedirs(directory, exist_ok=True)
+	with _store_lock:
+		_connection = sqlite3.connect(file_path, check_same_thread=False)
+		_connection.execute("PRAGMA journal_mode=WAL")
+		_connection.execute("CREATE TABLE IF NOT EXISTS endpoints (name TEXT PRIMARY KEY, table_name TEXT NOT NULL, count INTEGER NOT NULL, written_on TEXT NOT NULL)")
+		_connection.commit()
+	logger.info(f"SQLite store opened at {file_path}")
+
+def close_store():
+	"""
+	Close the SQLite store.
+
+	Returns:
+		None
+	"""
+	global _connection
+	with _store_lock:
+		if _connection is not None:
+			_connection.close()
+			_connection = None
+			logger.info("SQLite store closed")
+
+def write_endpoint(key, records):
+	"""
+	Replace the records of an endpoint in the store, in one transaction.
+
+	The lists of the sub-resources of the projects (memberships, versions, issue categories, files and
+	wiki pages) and of the issues (relations) are stored in their own tables, with the ID of their
+	project or issue, and replaced in the record by a {"$table": ...} reference read back by the readers.
+
+	Args:
+		key (str): The endpoint name.
+		records (list): The records of the endpoint.
+
+	Returns:
+		None
+	"""
+	table = table_name(key)
+	children = CHILDREN.get(key, {})
+	with _store_lock, _connection:
+		for child_table in [table] + [child_table for child_table, _ in children.values()]:
+			create_table(_connection, child_table)
+			_connection.execute(f"DELETE FROM \"{child_table}\"")
+		rows = {table: []}
+		for record in records:
+			values = index_values(record)
+			stored = record
+			if children and isinstance(record, dict):
+				stored = dict(record)
+				for name, (child_table, list_key) in children.items():
+					envelope = record.get(name)
+					if not isinstance(envelope, dict) or not isinstance(envelope.get(list_key), list):
+						continue
+					stored[name] = {**envelope, list_key: {"$table": child_table}}
+					for item in envelope[list_key]:
+						item_values = index_values(item)
+						if key == "projects":
+							item_values["project_id"] = values["id"]
+						else:
+							item_values.update({"project_id": values["project_id"], "issue_id": values["id"]})
+						rows.setdefault(child_table, []).append((*item_values.values(), json.dumps(item, ensure_ascii=False)))
+			rows[table].append((*values.values(), json.dumps(stored, ensure_ascii=False)))
+		for row_table, table_rows in rows.items():
+			_connection.executemany(f"INSERT INTO \"{row_table}\" (id, project_id, issue_id, updated_on, data) VALUES (?, ?, ?, ?, ?)", table_rows)
+		_connection.execute(
+			"INSERT OR REPLACE INTO endpoints (name, table_name, count, written_on) VALUES (?, ?, ?, ?)",
+			(key, table, len(records), datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+		)
+	logger.info(f"{len(records)} record(s) of {key} saved to the SQLite store")
+
+def read_records(connection, key, where="", params=()):
+	"""
+	Read the records of an endpoint, with the lists of their sub-resources put back in place.
+
+	Args:
+		connection (sqlite3.Connection): The database.
+		key (str): The endpoint name.
+		where (str, optional): An SQL condition on the indexed columns, e.g., "project_id = ?". Defaults to "".
+		params (tuple, optional): The parameters of the condition. Defaults to ().
+
+	Yields:
+		dict: The records, in the order they were written.
+	"""
+	children = CHILDREN.get(key, {})
+	query = f"SELECT data FROM \"{table_name(key)}\"" + (f" WHERE {where}" if where else "") + " ORDER BY rowid"
+	for (data,) in connection.execute(query, params):
+		record = json.loads(data)
+		for name, (child_table, list_key) in children.items():
+			envelope = record.get(name)
+			if isinstance(envelope, dict) and isinstance(envelope.get(list_key), dict) and "$table" in envelope[list_key]:
+				column = "project_id" if key == "projects" else "issue_id"
+				child_rows = connection.execute(f"SELECT data FROM \"{child_table}\" WHERE {column} = ? ORDER BY rowid", (record["id"],))
+				envelope[list_key] = [json.loads(child_data) for (child_data,) in child_rows]
+		yield record
+
+def load_store(output_file):
+	"""
+	Load all the endpoints of a previous extraction from its SQLite store.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		dict: The previous data by endpoint, empty if the store does not exist.
+	"""
+	file_path = store_path(output_file)
+	if not os.path.exists(file_path):
+		return {}
+	logger.info(f"Loading previous extraction from {file_path}")
+	connection = sqlite3.connect(file_path)
+	try:
+		names = [name for (name,) in connection.execute("SELECT name FROM endpoints ORDER BY rowid")]
+		return {name: list(read_records(connection, name)) for name in names}
+	except sqlite3.OperationalError as e:
+		logger.warning(f"Ignoring the SQLite store {file_path}: {e}")
+		return {}
+	finally:
+		connection.close()
@@ -0,0 +1,334 @@
+import os
+import re
+import time
+import random
+import threading
+from bisect import bisect_left
+from itertools import accumulate
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from srcs_extraction import checkpoint, config, logger
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LATENCY_SAMPLES = 4096
+METRIC_PREFIX = "redmine_extraction"
+
+_families = {}
+_downloads = {"downloaded": 0, "skipped": 0, "failed": 0, "bytes": 0, "seconds": 0.0, "first_start": None, "last_end": None}
+_phases = {}
+_started_at = None
+_start = None
+_listener = None
+_random = random.Random()
+_telemetry_lock = threading.Lock()
+
+def reset():
+	"""
+	Forget the measures of a previous extraction and start the clock of a new one.
+
+	Returns:
+		None
+	"""
+	global _started_at, _start
+	with _telemetry_lock:
+		_families.clear()
+		_downloads.update({"downloaded": 0, "skipped": 0, "failed": 0, "bytes": 0, "seconds": 0.0, "first_start": None, "last_end": None})
+		_phases.clear()
+		_started_at = datetime.now(timezone.utc)
+		_start = time.monotonic()
+
+def set_listener(listener):
+	"""
+	Set a function called after every recorded request, e.g., to advance a progress bar.
+
+	Args:
+		listener (callable): Called without arguments, or None to remove it.
+
+	Returns:
+		None
+	"""
+	global _listener
+	_listener = listener
+
+def endpoint_family(url):
+	"""
+	Group a requested URL with the other requests of the same endpoint, replacing IDs and wiki titles by placeholders.
+
+	e.g. "/projects/12/wiki/Home.json" gives "projects/{id}/wiki/{title}", "/issues/34.json" gives "issues/{id}".
+
+	Args:
+		url (str): The requested URL.
+
+	Returns:
+		str: The endpoint family.
+	"""
+	if url.startswith(config.BASE_URL):
+		path = url[len(config.BASE_URL):]
+	else:
+		path = urlparse(url).path
+	segments = [segment for segment in path.split("?")[0].strip("/").split("/") if segment]
+	if "download" in segments:
+		return "attachments/download"
+	family = []
+	for index, segment in enumerate(segments):
+		segment = re.sub(r"\.json$", "", segment)
+		previous = segments[index - 1] if index else None
+		if segment.isdigit() or previous == "projects":
+			segment = "{id}"
+		elif previous == "wiki" and segment != "index":
+			segment = "{title}"
+		family.append(segment)
+	return "/".join(family) or "/"
+
+def record_request(url, seconds, status=None, size=0, retry=False):
+	"""
+	Record one attempt of a request sent by session.get().
+
+	The latencies are not kept: each family counts them in the LATENCY_BUCKETS, sums them, keeps the
+	maximum, and keeps a uniform sample of LATENCY_SAMPLES of them for the percentiles, so the memory
+	of the telemetry does not grow with the number of requests.
+
+	Args:
+		url (str): The requested URL.
+		seconds (float): The time until the answer, or until the failure.
+		status (int, optional): The HTTP status, None for a connection error or a timeout. Defaults to None.
+		size (int, optional): The size of the body read, in bytes. Defaults to 0.
+		retry (bool, optional): Whether the attempt retries a failed one. Defaults to False.
+
+	Returns:
+		None
+	"""
+	family = endpoint_family(url)
+	with _telemetry_lock:
+		measures = _families.setdefault(family, {
+			"requests": 0, "retries": 0, "bytes": 0, "not_modified": 0, "errors": {},
+			"latency_sum": 0.0, "latency_max": 0.0, "buckets": [0] * len(LATENCY_BUCKETS), "samples": []
+		})
+		measures["requests"] += 1
+		measures["bytes"] += size
+		measures["latency_sum"] += seconds
+		measures["latency_max"] = max(measures["latency_max"], seconds)
+		bucket = bisect_left(LATENCY_BUCKETS, seconds)
+		if bucket < len(LATENCY_BUCKETS):
+			measures["buckets"][bucket] += 1
+		if len(measures["samples"]) < LATENCY_SAMPLES:
+			measures["samples"].append(seconds)
+		else:
+			index = _random.randrange(measures["requests"])
+			if index < LATENCY_SAMPLES:
+				measures["samples"][index] = seconds
+		if retry:
+			measures["retries"] += 1
+		if status == 304:
+			measures["not_modified"] += 1
+		elif status is None or status >= 400:
+			error = str(status) if status else "connection"
+			measures["errors"][error] = measures["errors"].get(error, 0) + 1
+	if _listener:
+		_listener()
+
+def record_download(start, size, outcome="downloaded", url=None):
+	"""
+	Record an attachment download, measured apart from the requests for the throughput of the downloads.
+
+	The requests of a download are recorded by session.get() without their body, streamed to disk
+	afterwards: the bytes received are added to the family of the URL here.
+
+	Args:
+		start (float): The time.monotonic() at which the download started.
+		size (int): The bytes received, over all the attempts.
+		outcome (str, optional): "downloaded", "skipped" when already on disk, or "failed". Defaults to "downloaded".
+		url (str, optional): The URL of the file, None for a skipped download. Defaults to None.
+
+	Returns:
+		None
+	"""
+	end = time.monotonic()
+	with _telemetry_lock:
+		_downloads[outcome] += 1
+		if outcome == "skipped":
+			return
+		if url and endpoint_family(url) in _families:
+			_families[endpoint_family(url)]["bytes"] += size
+		_downloads["bytes"] += size
+		_downloads["seconds"] += end - start
+		if _downloads["first_start"] is None or start < _downloads["first_start"]:
+			_downloads["first_start"] = start
+		if _downloads["last_end"] is None or end > _downloads["last_end"]:
+			_downloads["last_end"] = end
+
+def record_phase(key, seconds):
+	"""
+	Record the time spent on an endpoint of the extraction, its sub-resources included.
+
+	Args:
+		key (str): The endpoint key, e.g., "issues".
+		seconds (float): The time spent.
+
+	Returns:
+		None
+	"""
+	with _telemetry_lock:
+		_phases[key] = _phases.get(key, 0) + seconds
+
+def percentile(values, share):
+	"""
+	Get a percentile of sorted values, by the nearest-rank method.
+
+	Args:
+		values (list): The sorted values.
+		share (float): The percentile, between 0 and 1.
+
+	Returns:
+		float: The value, or None without values.
+	"""
+	if not values:
+		return None
+	return values[max(0, min(len(values) - 1, int(share * len(values) + 0.5) - 1))]
+
+def build_report(completed=True):
+	"""
+	Build the performance report of the extraction from the measures so far.
+
+	The mean, maximum and histogram of the latencies are exact. The percentiles are exact up to
+	LATENCY_SAMPLES requests of a family, and estimated from the sample of its latencies beyond.
+
+	Args:
+		completed (bool, optional): Whether the extraction went through all the endpoints. Defaults to True.
+
+	Returns:
+		dict: The report, with the measures by endpoint family, the downloads and the time by endpoint.
+	"""
+	with _telemetry_lock:
+		wall_time = time.monotonic() - _start if _start is not None else 0
+		families = {}
+		for family, measures in sorted(_families.items()):
+			samples = sorted(measures["samples"])
+			families[family] = {
+				"requests": measures["requests"],
+				"retries": measures["retries"],
+				"bytes": measures["bytes"],
+				"not_modified": measures["not_modified"],
+				"errors": dict(sorted(measures["errors"].items())),
+				"latency": {
+					"mean": round(measures["latency_sum"] / measures["requests"], 4),
+					"p50": round(percentile(samples, 0.5), 4),
+					"p95": round(percentile(samples, 0.95), 4),
+					"p99": round(percentile(samples, 0.99), 4),
+					"max": round(measures["latency_max"], 4)
+				},
+				"histogram": dict(zip((str(bound) for bound in LATENCY_BUCKETS), accumulate(measures["buckets"]))),
+				"latency_sum": round(measures["latency_sum"], 4)
+			}
+		active = _downloads["last_end"] - _downloads["first_start"] if _downloads["first_start"] is not None else 0
+		report = {
+			"started_at": _started_at.strftime("%Y-%m-%dT%H:%M:%SZ") if _started_at else None,
+			"finished_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+			"completed": completed,
+			"wall_time": round(wall_time, 3),
+			"requests": sum(measures["requests"] for measures in families.values()),
+			"retries": sum(measures["retries"] for measures in families.values()),
+			"bytes": sum(measures["bytes"] for measures in families.values()),
+			"endpoints": {key: round(seconds, 3) for key, seconds in _phases.items()},
+			"families": families,
+			"attachments": {
+				"downloaded": _downloads["downloaded"],
+				"skipped": _downloads["skipped"],
+				"failed": _downloads["failed"],
+				"bytes": _downloads["bytes"],
+				"download_seconds": round(_downloads["seconds"], 3),
+				"active_seconds": round(active, 3),
+				"bytes_per_second": round(_downloads["bytes"] / active, 1) if active else None
+			}
+		}
+	return report
+
+def prometheus_text(report):
+	"""
+	Format a report in the Prometheus text exposition format, for the textfile collector of the node exporter.
+
+	Args:
+		report (dict): The report returned by build_report().
+
+	Returns:
+		str: The metrics.
+	"""
+	lines = []
+
+	def metric(name, kind, description, samples):
+		lines.append(f"# HELP {METRIC_PREFIX}_{name} {description}")
+		lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+		for labels, value in samples:
+			label_text = ",".join(f'{label}="{label_value}"' for label, label_value in labels.items())
+			lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}" if label_text else f"{METRIC_PREFIX}_{name} {value}")
+
+	families = report["families"]
+	metric("requests_total", "counter", "Requests sent to Redmine, retries included.",
+		[({"family": family}, measures["requests"]) for family, measures in families.items()])
+	metric("retries_total", "counter", "Requests retried after a connection error, a timeout or a 429/5xx answer.",
+		[({"family": family}, measures["retries"]) for family, measures in families.items()])
+	metric("response_bytes_total", "counter", "Bytes of the bodies received, downloaded files included.",
+		[({"family": family}, measures["bytes"]) for family, measures in families.items()])
+	metric("not_modified_total", "counter", "Answers 304 Not Modified to a revalidation of the HTTP cache.",
+		[({"family": family}, measures["not_modified"]) for family, measures in families.items()])
+	metric("errors_total", "counter", "Failed attempts, by HTTP status or \"connection\".",
+		[({"family": family, "status": status}, count) for family, measures in families.items() for status, count in measures["errors"].items()])
+	lines.append(f"# HELP {METRIC_PREFIX}_request_duration_seconds Time until the answer of each request.")
+	lines.append(f"# TYPE {METRIC_PREFIX}_request_duration_seconds histogram")
+	for family, measures in families.items():
+		for bound, count in list(measures["histogram"].items()) + [("+Inf", measures["requests"])]:
+			lines.append(f"{METRIC_PREFIX}_request_duration_seconds_bucket{{family=\"{family}\",le=\"{bound}\"}} {count}")
+		lines.append(f"{METRIC_PREFIX}_request_duration_seconds_sum{{family=\"{family}\"}} {measures['latency_sum']}")
+		lines.append(f"{METRIC_PREFIX}_request_duration_seconds_count{{family=\"{family}\"}} {measures['requests']}")
+	downloads = report["attachments"]
+	metric("attachment_files_total", "counter", "Attachment files, by outcome.",
+		[({"outcome": outcome}, downloads[outcome]) for outcome in ("downloaded", "skipped", "failed")])
+	metric("attachment_bytes_total", "counter", "Bytes of the attachment files downloaded.", [({}, downloads["bytes"])])
+	metric("attachment_download_seconds_total", "counter", "Time spent downloading attachment files, summed over the downloads.", [({}, downloads["download_seconds"])])
+	metric("endpoint_seconds", "gauge", "Time spent on each endpoint, its sub-resources included.",
+		[({"endpoint": key}, seconds) for key, seconds in report["endpoints"].items()])
+	metric("duration_seconds", "gauge", "Wall time of the extraction.", [({}, report["wall_time"])])
+	metric("completed", "gauge", "1 if the extraction went through all the endpoints.", [({}, int(report["completed"]))])
+	return "\n".join(lines) + "\n"
+
+def report_path(output_file):
+	"""
+	Get the path of the performance report, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+
+	Returns:
+		str: The path of the report.
+	"""
+	return os.path.join(os.path.dirname(output_file), "extraction_report.json")
+
+def save_report(output_file, completed=True):
+	"""
+	Write the performance report next to the output, and the Prometheus textfile when config.PROMETHEUS_FILE is set.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		completed (bool, optional): Whether the extraction went through all the endpoints. Defaults to True.
+
+	Returns:
+		dict: The report.
+	"""
+	report = build_report(completed)
+	file_path = report_path(output_file)
+	report_dir = os.path.dirname(file_path)
+	if report_dir:
+		os.makedirs(report_dir, exist_ok=True)
+	checkpoint.atomic_write_json(file_path, report)
+	logger.info(f"Extraction report saved to {file_path}: {report['requests']} requests, {report['retries']} retries, "
+				f"{report['bytes']} bytes, {report['attachments']['downloaded']} attachments downloaded in {report['wall_time']}s")
+	if config.PROMETHEUS_FILE:
+		prometheus_dir = os.path.dirname(config.PROMETHEUS_FILE)
+		if prometheus_dir:
+			os.makedirs(prometheus_dir, exist_ok=True)
+		tmp_path = f"{config.PROMETHEUS_FILE}.tmp"
+		with open(tmp_path, "w", encoding="utf-8") as file:
+			file.write(prometheus_text(report))
+		os.replace(tmp_path, config.PROMETHEUS_FILE)
+		logger.info(f"Prometheus metrics saved to {config.PROMETHEUS_FILE}")
+	return report
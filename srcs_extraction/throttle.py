@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import deque
+from srcs_extraction import config, logger
+
+SLOW_DOWN_STATUSES = {429, 503}
+
+class AdaptiveLimiter:
+	"""
+	Limit the number of requests in flight, adapting it to how the server copes (AIMD).
+
+	The limit grows by one after each round of successful requests while the p95 latency stays
+	close to its smoothed baseline, and is halved on 429/503 answers, on timeouts, or when the p95
+	latency rises above config.ADAPTIVE_LATENCY_TOLERANCE times the baseline.
+	"""
+
+	def __init__(self, initial, maximum):
+		self.limit = float(initial)
+		self.maximum = maximum
+		self.in_flight = 0
+		self.successes = 0
+		self.latencies = deque(maxlen=100)
+		self.baseline = None
+		self.last_decrease = 0.0
+		self.condition = threading.Condition()
+
+	def acquire(self):
+		"""
+		Wait for a free slot under the current limit.
+
+		Returns:
+			None
+		"""
+		with self.condition:
+			while self.in_flight >= int(self.limit):
+				self.condition.wait()
+			self.in_flight += 1
+
+	def release(self, latency, status=None, timed_out=False):
+		"""
+		Free a slot and adapt the limit to the outcome of the request.
+
+		Args:
+			latency (float): Seconds the request took.
+			status (int, optional): The HTTP status received. Defaults to None.
+			timed_out (bool, optional): Whether the request timed out or failed to connect. Defaults to False.
+
+		Returns:
+			None
+		"""
+		with self.condition:
+			self.in_flight -= 1
+			if timed_out or status in SLOW_DOWN_STATUSES:
+				self._decrease(f"status {status}" if status else "timeout")
+			else:
+				self.latencies.append(latency)
+				self.successes += 1
+				if self.successes >= int(self.limit):
+					self._end_round()
+			self.condition.notify_all()
+
+	def _end_round(self):
+		"""
+		Compare the p95 latency of the last requests to the baseline, and grow or shrink the limit.
+
+		The baseline follows the p95 latency slowly, so it absorbs the mix of endpoints being fetched
+		but not a sudden slowdown of the server.
+
+		Returns:
+			None
+		"""
+		self.successes = 0
+		if len(self.latencies) < config.ADAPTIVE_MIN_SAMPLES:
+			if int(self.limit) < self.maximum:
+				self.limit += 1
+			return
+		ordered = sorted(self.latencies)
+		p95 = ordered[int(0.95 * (len(ordered) - 1))]
+		if self.baseline is None:
+			self.baseline = p95
+		if p95 > self.baseline * config.ADAPTIVE_LATENCY_TOLERANCE:
+			self._decrease(f"p95 latency {p95:.2f}s above {self.baseline:.2f}s")
+		else:
+			self.baseline = 0.9 * self.baseline + 0.1 * p95
+			if int(self.limit) < self.maximum:
+				self.limit += 1
+				logger.info(f"Adaptive concurrency raised to {int(self.limit)} (p95 latency {p95:.2f}s)")
+
+	def _decrease(self, reason):
+		"""
+		Halve the limit, at most once per config.ADAPTIVE_COOLDOWN seconds.
+
+		Args:
+			reason (str): Why the limit is decreased, used for logging.
+
+		Returns:
+			None
+		"""
+		now = time.monotonic()
+		if now - self.last_decrease < config.ADAPTIVE_COOLDOWN:
+			return
+		self.last_decrease = now
+		self.limit = max(1.0, self.limit / 2)
+		self.successes = 0
+		self.latencies.clear()
+		self.baseline = None
+		logger.warning(f"Adaptive concurrency lowered to {int(self.limit)} ({reason})")
+
+class RateLimiter:
+	"""
+	Token bucket capping an amount per second, e.g., requests or bytes.
+
+	Callers take what they need and sleep for the debt when the bucket runs dry.
+	"""
+
+	def __init__(self, rate):
+		self.rate = float(rate)
+		self.tokens = float(rate)
+		self.updated = time.monotonic()
+		self.lock = threading.Lock()
+
+	def consume(self, amount=1):
+		"""
+		Take an amount from the bucket, waiting until it is allowed.
+
+		Args:
+			amount (float, optional): The amount to take. Defaults to 1.
+
+		Returns:
+			None
+		"""
+		with self.lock:
+			now = time.monotonic()
+			self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+			self.updated = now
+			self.tokens -= amount
+			wait = -self.tokens / self.rate if self.tokens < 0 else 0
+		if wait > 0:
+			time.sleep(wait)
+
+_limiter = None
+_budget = None
+_rate_limiter = None
+_bandwidth_limiter = None
+
+def configure():
+	"""
+	Set up the controllers from the configuration, before the extraction starts.
+
+	The requests in flight are bounded by config.WORKERS, whatever thread sends them, by the
+	adaptive limit when config.ADAPTIVE is set and by a fixed budget otherwise.
+
+	Returns:
+		None
+	"""
+	global _limiter, _budget, _rate_limiter, _bandwidth_limiter
+	_limiter = AdaptiveLimiter(min(config.ADAPTIVE_INITIAL, config.WORKERS), config.WORKERS) if config.ADAPTIVE else None
+	_budget = None if config.ADAPTIVE else threading.BoundedSemaphore(config.WORKERS)
+	_rate_limiter = RateLimiter(config.MAX_RPS) if config.MAX_RPS else None
+	_bandwidth_limiter = RateLimiter(config.MAX_BANDWIDTH) if config.MAX_BANDWIDTH else None
+	logger.info(f"Throttling: adaptive={config.ADAPTIVE}, max_rps={config.MAX_RPS}, max_bandwidth={config.MAX_BANDWIDTH}")
+
+def acquire(adaptive=True):
+	"""
+	Wait until a request is allowed to start.
+
+	Args:
+		adaptive (bool, optional): Take a slot of the request budget, adaptive or fixed. Defaults to True.
+
+	Returns:
+		None
+	"""
+	if adaptive and _limiter:
+		_limiter.acquire()
+	elif adaptive and _budget:
+		_budget.acquire()
+	if _rate_limiter:
+		_rate_limiter.consume()
+
+def release(latency, status=None, timed_out=False, adaptive=True):
+	"""
+	Report the outcome of a request started with acquire().
+
+	Args:
+		latency (float): Seconds the request took.
+		status (int, optional): The HTTP status received. Defaults to None.
+		timed_out (bool, optional): Whether the request timed out or failed to connect. Defaults to False.
+		adaptive (bool, optional): Whether the request took a slot of the request budget. Defaults to True.
+
+	Returns:
+		None
+	"""
+	if adaptive and _limiter:
+		_limiter.release(latency, status, timed_out)
+	elif adaptive and _budget:
+		_budget.release()
+
+def consume_bytes(amount):
+	"""
+	Account for bytes received, waiting if the bandwidth ceiling is reached.
+
+	Args:
+		amount (int): The number of bytes received.
+
+	Returns:
+		None
+	"""
+	if _bandwidth_limiter and amount:
+		_bandwidth_limiter.consume(amount)
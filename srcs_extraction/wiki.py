@@ -0,0 +1,88 @@
+import os
+import json
+from srcs_extraction import checkpoint, compression, config, logger
+
+def wiki_path(output_file, project_id):
+	"""
+	Get the path of the file holding the wiki pages of a project, next to the output.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		project_id (int): The ID of the project.
+
+	Returns:
+		str: The path of the wiki file.
+	"""
+	return compression.output_path(os.path.join(os.path.dirname(output_file), "wikis", f"{project_id}.json"))
+
+def load_pages(output_file, project_id):
+	"""
+	Load the wiki pages of a project stored by a previous extraction.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		project_id (int): The ID of the project.
+
+	Returns:
+		dict: The stored pages by title, empty if there are none.
+	"""
+	file_path = wiki_path(output_file, project_id)
+	if not os.path.exists(file_path):
+		return {}
+	try:
+		with compression.open_read(file_path) as file:
+			return json.load(file)
+	except (OSError, EOFError, ValueError) as e:
+		logger.warning(f"Ignoring the stored wiki pages of project {project_id} in {file_path}: {e}")
+		return {}
+
+def save_pages(output_file, project_id, pages):
+	"""
+	Save the wiki pages of a project, with their text, to its wiki file.
+
+	Args:
+		output_file (str): The file, path, and/or prefix that is used as output.
+		project_id (int): The ID of the project.
+		pages (dict): The pages by title.
+
+	Returns:
+		str: The path of the wiki file, relative to the output directory.
+	"""
+	file_path = wiki_path(output_file, project_id)
+	os.makedirs(os.path.dirname(file_path), exist_ok=True)
+	checkpoint.atomic_write_json(file_path, pages)
+	logger.info(f"{len(pages)} wiki page(s) of project {project_id} saved to {file_path}")
+	return os.path.relpath(file_path, os.path.dirname(output_file) or ".")
+
+def is_current(index_page, stored_page):
+	"""
+	Check whether the stored copy of a wiki page is the version listed in the wiki index.
+
+	The version is compared when both have one, the updated_on date otherwise.
+
+	Args:
+		index_page (dict): The page as listed in the wiki index.
+		stored_page (dict): The stored page, or None.
+
+	Returns:
+		bool: True if the stored page does not need to be fetched again.
+	"""
+	if not stored_page:
+		return False
+	if config.WIKI_ATTACHMENTS and "attachments" not in stored_page:
+		return False
+	if index_page.get("version") is not None and stored_page.get("version") is not None:
+		return index_page["version"] == stored_page["version"]
+	return bool(index_page.get("updated_on")) and stored_page.get("updated_on") == index_page["updated_on"]
+
+def page_summary(page):
+	"""
+	Get what is kept of a wiki page in the projects output, everything but its text.
+
+	Args:
+		page (dict): The wiki page.
+
+	Returns:
+		dict: The page without its text.
+	"""
+	return {key: value for key, value in page.items() if key != "text"}
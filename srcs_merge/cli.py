@@ -0,0 +1,85 @@
+import getopt
+import sys
+from srcs_merge import config, logger
+from srcs_extraction import compression
+
+def exit_with_error(message):
+	"""
+	Report an invalid argument, print the usage and exit.
+
+	Args:
+		message (str): What is wrong with the argument.
+
+	Returns:
+		None
+	"""
+	logger.error(f"{message} Exiting.")
+	print(config.BOLD + "Error: " + config.END + message)
+	print(config.TXT_USAGE)
+	sys.exit(2)
+
+def parse_args(argv):
+	"""
+	Parse command-line arguments and return them as a dictionary.
+
+	The arguments left after the options are the outputs of the shards to merge.
+
+	Args:
+		argv (list): List of argument.
+
+	Returns:
+		dict: Parsed arguments as a dictionary.
+	"""
+	args = {
+		"output": config.OUTPUT,
+		"single_file": False,
+		"multiple_files": False,
+		"ndjson": config.NDJSON,
+		"compression": config.COMPRESSION,
+		"inputs": []
+	}
+
+	try:
+		opts, args["inputs"] = getopt.gnu_getopt(argv, "hs:m", ["help", "single-file=", "multiple-files=", "ndjson", "compress="])
+	except getopt.GetoptError as e:
+		logger.error(f"Argument parsing error: {e}")
+		logger.info("Displaying usage information.")
+		print(config.BOLD + "Error: " + config.END + str(e))
+		print(config.TXT_USAGE)
+		sys.exit(1)
+
+	for opt, arg in opts:
+		if opt in ("-h", "--help"):
+			logger.info("Help requested. Displaying usage and help information.")
+			print(config.TXT_USAGE + "\n" + config.TXT_HELP)
+			sys.exit(0)
+		elif opt in ("-s", "--single-file"):
+			args["single_file"] = True
+			args["output"] = arg
+			logger.debug(f"Single output file set to: {arg}")
+		elif opt in ("-m", "--multiple-files"):
+			args["multiple_files"] = True
+			args["output"] = ""
+			if arg:
+				args["output"] = arg.removesuffix(".json")
+			logger.debug(f"Multiple files output prefix set to: {args['output']}")
+		elif opt == "--ndjson":
+			args["ndjson"] = True
+			logger.debug("NDJSON output enabled")
+		elif opt == "--compress":
+			if arg not in compression.EXTENSIONS:
+				exit_with_error(f"Compression must be one of {', '.join(compression.EXTENSIONS)}, got \"{arg}\".")
+			args["compression"] = arg
+			logger.debug(f"Compression set to: {arg}")
+
+	if args["single_file"] and args["multiple_files"]:
+		exit_with_error("You cannot use single file and multiple files options at the same time.")
+
+	if len(args["inputs"]) < 1:
+		exit_with_error("Missing the outputs of the shards to merge.")
+
+	if not compression.available(args["compression"] or compression.compression_of(args["output"])):
+		exit_with_error("zstd compression needs the zstandard package: pip install zstandard")
+
+	logger.info("Arguments successfully parsed.")
+	return args
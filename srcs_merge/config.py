@@ -0,0 +1,31 @@
+OUTPUT = "outputs/redmine_data.json"
+SINGLE_FILE = True
+NDJSON = False
+COMPRESSION = None
+INPUTS = []
+
+BOLD = "\x1B[1m"
+ITALIC = "\x1B[3m"
+END = "\x1B[0m"
+
+TXT_USAGE = BOLD + "Usage: " + END + "(e.g)\n\
+\tpython3 merge_extractions.py " + ITALIC + "-h -s <SINGLE_OUTPUT_FILE> <SHARD_OUTPUT> <SHARD_OUTPUT>..." + END + "\n\
+\tOR\n\
+\tpython3 merge_extractions.py " + ITALIC + "--multiple-files=<MULTIPLE_OUTPUT_FILES> --ndjson shards/1/redmine_data.ndjson shards/2/redmine_data.ndjson" + END
+
+TXT_HELP = BOLD + "Options: " + END + "\n\
+\t" + BOLD + "-h, -help" + END + "\n\
+\t\tPrint this help paragraph.\n\n\
+\t" + BOLD + "SHARD_OUTPUT" + END + " (required)\n\
+\t\tThe outputs of the extractions made with " + ITALIC + "--shard" + END + ", as given to their " + ITALIC + "-s" + END + " or " + ITALIC + "-m" + END + " option, JSON or NDJSON, compressed or not.\n\
+\t\tNDJSON outputs are streamed, JSON ones are read one file at a time and spilled to temporary files.\n\n\
+\t" + BOLD + "-s, --single-file=SINGLE_OUTPUT_FILE" + END + " (default)\n\
+\t\tUse to write the merged data in a unique file, e.g: " + ITALIC + "outputs/redmine_data.json" + END + ".\n\
+\t\tDefault: " + ITALIC + "\"outputs/redmine_data.json\"" + END + "\n\n\
+\t" + BOLD + "-m, --multiple-files=MULTIPLE_OUTPUT_FILES" + END + " (optional)\n\
+\t\tUse to write the merged data in one file per endpoint, with an optional prefix, e.g: " + ITALIC + "--multiple-files=outputs/" + END + ".\n\n\
+\t" + BOLD + "--ndjson" + END + " (optional)\n\
+\t\tUse to write the merged data as NDJSON, in the sections read by the processors.\n\n\
+\t" + BOLD + "--compress=ALGORITHM" + END + " (optional)\n\
+\t\tUse to compress the merged data with " + ITALIC + "gzip" + END + " or " + ITALIC + "zstd" + END + ", also picked from a .gz or .zst single output file.\n\
+\t\tzstd needs the " + ITALIC + "zstandard" + END + " package."
@@ -0,0 +1,457 @@
+import os
+import json
+import heapq
+import shutil
+import tempfile
+from srcs_merge import config, logger
+from srcs_extraction import checkpoint, compression, ndjson, shard
+
+SIDECAR_FILES = (
+	"extraction_report.json",
+	"extraction_state.json",
+	"extraction_plan.json",
+	"extraction_journal.ndjson",
+	"failed_requests.json",
+	"shard.json"
+)
+SIDECAR_DIRS = ("journals", "wikis", "attachements", "http_cache")
+COPIED_DIRS = ("journals", "wikis")
+INDENT = 4
+
+def output_dir(output_file):
+	"""
+	Get the directory of an output, where its sidecar files and directories are.
+
+	Args:
+		output_file (str): The file, path, and/or prefix of the output.
+
+	Returns:
+		str: The directory, "." for the current one.
+	"""
+	return os.path.dirname(output_file) or "."
+
+def find_single_file(input_file):
+	"""
+	Find the single file of a shard output, given as the -s option of its extraction.
+
+	The file may have been written as NDJSON and/or compressed, e.g., "redmine_data.json" may be
+	found as "redmine_data.ndjson.gz".
+
+	Args:
+		input_file (str): The output of the shard.
+
+	Returns:
+		str: The file, or None if the output is not a single file.
+	"""
+	stem = compression.strip_extension(input_file).removesuffix(".json").removesuffix(".ndjson")
+	for name in (compression.strip_extension(input_file), f"{stem}.json", f"{stem}.ndjson"):
+		for extension in ("", *compression.EXTENSIONS.values()):
+			if os.path.isfile(name + extension):
+				return name + extension
+	return None
+
+def is_ndjson(file_path):
+	"""
+	Tell if a file holds NDJSON sections, from its extension.
+
+	Args:
+		file_path (str): The file.
+
+	Returns:
+		bool: True for an NDJSON file, compressed or not.
+	"""
+	return compression.strip_extension(file_path).endswith(".ndjson")
+
+def find_multiple_files(prefix):
+	"""
+	Find the endpoint files of a shard output written in multiple files mode, without its sidecar files.
+
+	Args:
+		prefix (str): The path and/or prefix given as the -m option of the extraction.
+
+	Returns:
+		dict: The file of each endpoint, by endpoint name.
+	"""
+	directory = output_dir(prefix)
+	name_prefix = prefix[len(os.path.dirname(prefix)):].lstrip(os.sep)
+	files = {}
+	for root, dirs, names in os.walk(directory):
+		if root == directory:
+			dirs[:] = [name for name in dirs if name not in SIDECAR_DIRS]
+		for name in names:
+			relative = os.path.relpath(os.path.join(root, name), directory).replace(os.sep, "/")
+			if not relative.startswith(name_prefix) or relative in SIDECAR_FILES:
+				continue
+			stem = compression.strip_extension(relative)
+			if ".part" in stem or ".tmp" in stem:
+				continue
+			for extension in (".ndjson", ".json"):
+				if stem.endswith(extension):
+					files[stem[len(name_prefix):-len(extension)]] = os.path.join(root, name)
+					break
+	return files
+
+def section_keys(file_path):
+	"""
+	List the sections of an NDJSON file in their order, reading only their headers.
+
+	Args:
+		file_path (str): The NDJSON file.
+
+	Returns:
+		list: The endpoint names.
+	"""
+	keys = []
+	with compression.open_read(file_path, binary=True) as file:
+		for line in file:
+			if line.startswith(b'{"_header"'):
+				keys.append(json.loads(line)["_header"]["entity"])
+	return keys
+
+def iter_section(file_path, key):
+	"""
+	Stream the records of a section of an NDJSON file, checking that they are sorted by ID.
+
+	Args:
+		file_path (str): The NDJSON file.
+		key (str): The endpoint name.
+
+	Yields:
+		dict: The records of the section.
+
+	Raises:
+		ValueError: If the section is not complete or not sorted by ID.
+	"""
+	inside = False
+	count = 0
+	previous = None
+	with compression.open_read(file_path, binary=True) as file:
+		for line in file:
+			entry = json.loads(line)
+			if isinstance(entry, dict) and "_header" in entry:
+				inside = entry["_header"]["entity"] == key
+			elif isinstance(entry, dict) and "_footer" in entry:
+				if inside:
+					if entry["_footer"]["count"] != count:
+						raise ValueError(f"The section {key} of {file_path} holds {count} record(s) instead of {entry['_footer']['count']}")
+					return
+			elif inside:
+				record_key = shard.record_key(entry)
+				if previous is not None and record_key < previous:
+					raise ValueError(f"The records of {key} in {file_path} are not sorted by ID, was it extracted with --shard?")
+				previous = record_key
+				count += 1
+				yield entry
+	if inside:
+		raise ValueError(f"The section {key} of {file_path} has no footer, the extraction was interrupted")
+
+def spill(key, records, spill_path):
+	"""
+	Write the records of an endpoint, sorted by ID, to a temporary NDJSON file read back by the merge.
+
+	Args:
+		key (str): The endpoint name.
+		records (list): The records of the endpoint.
+		spill_path (str): The temporary file.
+
+	Returns:
+		str: The temporary file.
+	"""
+	with open(spill_path, "w", encoding="utf-8") as file:
+		file.writelines(ndjson.section_lines(key, shard.sort_records(records)))
+	return spill_path
+
+def load_json(file_path):
+	"""
+	Load a JSON file, decompressing it if needed.
+
+	Args:
+		file_path (str): The file.
+
+	Returns:
+		dict or list: The data.
+	"""
+	with compression.open_read(file_path) as file:
+		return json.load(file)
+
+def open_sources(input_file, spill_dir):
+	"""
+	Get the NDJSON file holding each endpoint of a shard output.
+
+	NDJSON outputs are read in place. JSON outputs are loaded one file at a time and every endpoint
+	is spilled to a temporary NDJSON file, so only one shard is ever held in memory.
+
+	Args:
+		input_file (str): The output of the shard, as given to the -s or -m option of its extraction.
+		spill_dir (str): The directory of the temporary files of this shard.
+
+	Returns:
+		dict: The NDJSON file of each endpoint, by endpoint name, in the order of the output.
+
+	Raises:
+		ValueError: If the output holds no endpoint.
+	"""
+	single_file = find_single_file(input_file)
+	files = {}
+	if single_file and is_ndjson(single_file):
+		files = {key: single_file for key in section_keys(single_file)}
+	elif single_file:
+		logger.info(f"Spilling the endpoints of {single_file} to {spill_dir}")
+		data = load_json(single_file)
+		for index, (key, records) in enumerate(data.items()):
+			files[key] = spill(key, records, os.path.join(spill_dir, f"{index}.ndjson"))
+		del data
+	else:
+		for index, (key, file_path) in enumerate(find_multiple_files(input_file).items()):
+			if is_ndjson(file_path):
+				files[key] = file_path
+			else:
+				files[key] = spill(key, load_json(file_path), os.path.join(spill_dir, f"{index}.ndjson"))
+	if not files:
+		raise ValueError(f"No extracted data found for {input_file}")
+	logger.info(f"{len(files)} endpoint(s) found in {input_file}")
+	return files
+
+def order_inputs(inputs):
+	"""
+	Check that the inputs are shards of the same extraction and order them by shard index.
+
+	Args:
+		inputs (list): The outputs of the shards.
+
+	Returns:
+		list: The inputs, ordered by shard index.
+
+	Raises:
+		ValueError: If an input is not a shard output, or if the shards do not belong together.
+	"""
+	shards = []
+	for input_file in inputs:
+		info = shard.load_shard_info(input_file)
+		if info is None:
+			raise ValueError(f"{input_file} is not the output of an extraction with --shard, {shard.shard_info_path(input_file)} is missing")
+		shards.append((info, input_file))
+	counts = {info["count"] for info, _ in shards}
+	if len(counts) > 1:
+		raise ValueError(f"The shards were extracted with different shard counts: {', '.join(str(count) for count in sorted(counts))}")
+	base_urls = {info.get("base_url") for info, _ in shards}
+	if len(base_urls) > 1:
+		raise ValueError(f"The shards were extracted from different Redmine instances: {', '.join(sorted(str(url) for url in base_urls))}")
+	indexes = [info["index"] for info, _ in shards]
+	duplicates = sorted({index for index in indexes if indexes.count(index) > 1})
+	if duplicates:
+		raise ValueError(f"Shard(s) {', '.join(str(index) for index in duplicates)} given more than once")
+	count = counts.pop()
+	missing = sorted(set(range(1, count + 1)) - set(indexes))
+	if missing:
+		logger.warning(f"Shard(s) {', '.join(str(index) for index in missing)} of {count} missing, the merged data is partial")
+		print(config.BOLD + "Warning: " + config.END + f"shard(s) {', '.join(str(index) for index in missing)} of {count} missing, the merged data is partial")
+	return [input_file for _, input_file in sorted(shards, key=lambda entry: entry[0]["index"])]
+
+def merge_records(key, sources):
+	"""
+	Merge the sorted records of an endpoint from every shard, k-way, keeping the first of the records sharing an ID.
+
+	Args:
+		key (str): The endpoint name.
+		sources (list): The NDJSON file of the endpoint in each shard having it.
+
+	Yields:
+		dict: The records, sorted by ID.
+	"""
+	previous_id = None
+	duplicates = 0
+	for record in heapq.merge(*(iter_section(file_path, key) for file_path in sources), key=shard.record_key):
+		record_id = record.get("id") if isinstance(record, dict) else None
+		if record_id is not None and record_id == previous_id:
+			duplicates += 1
+			continue
+		previous_id = record_id
+		yield record
+	if duplicates:
+		logger.info(f"{duplicates} duplicate record(s) of {key} dropped")
+
+def compression_extension():
+	"""
+	Get the extension of the merged files for config.COMPRESSION.
+
+	Returns:
+		str: The extension, empty without compression.
+	"""
+	return compression.EXTENSIONS[config.COMPRESSION] if config.COMPRESSION else ""
+
+def write_list(file, records, depth):
+	"""
+	Stream a JSON list, laid out like json.dump with an indentation of 4, or compact for a compressed file.
+
+	Args:
+		file (io.TextIOBase): The file to write to.
+		records (iterable): The items of the list.
+		depth (int): The indentation level of the list.
+
+	Returns:
+		int: The number of items written.
+	"""
+	count = 0
+	if config.COMPRESSION:
+		file.write("[")
+		for record in records:
+			file.write((", " if count else "") + json.dumps(record, ensure_ascii=False))
+			count += 1
+		file.write("]")
+		return count
+	margin = " " * INDENT * (depth + 1)
+	file.write("[")
+	for record in records:
+		text = json.dumps(record, indent=INDENT, ensure_ascii=False).replace("\n", "\n" + margin)
+		file.write(("," if count else "") + "\n" + margin + text)
+		count += 1
+	file.write(("\n" + " " * INDENT * depth if count else "") + "]")
+	return count
+
+def write_json_file(file_path, key_sources):
+	"""
+	Write the merged endpoints as one JSON object, streamed to a temporary file moved in place once complete.
+
+	Args:
+		file_path (str): The merged file.
+		key_sources (dict): The NDJSON files of each endpoint, by endpoint name.
+
+	Returns:
+		None
+	"""
+	tmp_path = compression.strip_extension(file_path) + ".tmp" + compression_extension()
+	with compression.open_write(tmp_path) as file:
+		file.write("{")
+		for index, (key, sources) in enumerate(key_sources.items()):
+			if config.COMPRESSION:
+				file.write((", " if index else "") + json.dumps(key) + ": ")
+			else:
+				file.write(("," if index else "") + "\n" + " " * INDENT + json.dumps(key) + ": ")
+			count = write_list(file, merge_records(key, sources), 1)
+			logger.info(f"{count} record(s) of {key} merged")
+		file.write(("\n" if key_sources and not config.COMPRESSION else "") + "}")
+	os.replace(tmp_path, file_path)
+
+def write_outputs(output_file, key_sources):
+	"""
+	Write the merged endpoints in the layout of config.SINGLE_FILE and config.NDJSON, like the extraction does.
+
+	Args:
+		output_file (str): The file, path, and/or prefix to write to.
+		key_sources (dict): The NDJSON files of each endpoint, by endpoint name.
+
+	Returns:
+		list: The files written.
+	"""
+	extension = compression_extension()
+	written = []
+	if config.SINGLE_FILE and config.NDJSON:
+		file_path = output_file.removesuffix(".json") + ".ndjson" + extension
+		part_path = ndjson.part_path(file_path)
+		with compression.open_write(part_path) as file:
+			for key, sources in key_sources.items():
+				file.writelines(ndjson.section_lines(key, merge_records(key, sources)))
+				logger.info(f"Records of {key} merged")
+		os.replace(part_path, file_path)
+		written.append(file_path)
+	elif config.SINGLE_FILE:
+		file_path = output_file + extension
+		write_json_file(file_path, key_sources)
+		written.append(file_path)
+	else:
+		for key, sources in key_sources.items():
+			file_path = f"{output_file}{key}" + (".ndjson" if config.NDJSON else ".json") + extension
+			directory = os.path.dirname(file_path)
+			if directory:
+				os.makedirs(directory, exist_ok=True)
+			tmp_path = compression.strip_extension(file_path) + ".tmp" + extension
+			with compression.open_write(tmp_path) as file:
+				if config.NDJSON:
+					file.writelines(ndjson.section_lines(key, merge_records(key, sources)))
+				else:
+					logger.info(f"{write_list(file, merge_records(key, sources), 0)} record(s) of {key} merged")
+			os.replace(tmp_path, file_path)
+			written.append(file_path)
+	return written
+
+def copy_sidecars(input_file, output_file):
+	"""
+	Copy the journals, wiki pages and attachments of a shard next to the merged output.
+
+	The journals and wiki pages are stored per project, and every project is in a single shard, so
+	their files do not collide. Attachment blobs are named after their digest and only copied when missing.
+
+	Args:
+		input_file (str): The output of the shard.
+		output_file (str): The merged output.
+
+	Returns:
+		dict: The attachments manifest of the shard, empty if it has none.
+	"""
+	source_dir = output_dir(input_file)
+	target_dir = output_dir(output_file)
+	if os.path.abspath(source_dir) == os.path.abspath(target_dir):
+		logger.warning(f"{input_file} is in the directory of the merged output, its sidecar files are left as they are")
+		return {}
+	for name in COPIED_DIRS:
+		if os.path.isdir(os.path.join(source_dir, name)):
+			shutil.copytree(os.path.join(source_dir, name), os.path.join(target_dir, name), dirs_exist_ok=True)
+			logger.info(f"{name} of {input_file} copied")
+	store_dir = os.path.join(source_dir, "attachements")
+	blobs_dir = os.path.join(store_dir, "blobs")
+	for root, _, names in os.walk(blobs_dir):
+		for name in names:
+			source = os.path.join(root, name)
+			target = os.path.join(target_dir, "attachements", os.path.relpath(source, store_dir))
+			if not os.path.exists(target):
+				os.makedirs(os.path.dirname(target), exist_ok=True)
+				shutil.copy2(source, target)
+	manifest_file = os.path.join(store_dir, "manifest.json")
+	if not os.path.exists(manifest_file):
+		return {}
+	with open(manifest_file, "r", encoding="utf-8") as file:
+		return json.load(file)
+
+def merge(inputs, output_file):
+	"""
+	Merge the outputs of the shards of an extraction into one output, as if it was extracted at once.
+
+	Every endpoint is merged k-way from the records of the shards, sorted by ID, so the merged
+	records are never all in memory. Shards written as JSON are spilled to temporary NDJSON files,
+	one at a time. The endpoints keep the order in which they first appear in the shards.
+
+	Args:
+		inputs (list): The outputs of the shards, as given to the -s or -m option of their extraction.
+		output_file (str): The file, path, and/or prefix to write the merged data to.
+
+	Returns:
+		None
+
+	Raises:
+		ValueError: If the inputs are not shards of the same extraction, or hold unsorted or incomplete data.
+	"""
+	inputs = order_inputs(inputs)
+	directory = os.path.dirname(output_file)
+	if directory:
+		os.makedirs(directory, exist_ok=True)
+	with tempfile.TemporaryDirectory(prefix=".merge-", dir=directory or ".") as spill_root:
+		key_sources = {}
+		for index, input_file in enumerate(inputs):
+			spill_dir = os.path.join(spill_root, str(index))
+			os.makedirs(spill_dir)
+			for key, file_path in open_sources(input_file, spill_dir).items():
+				key_sources.setdefault(key, []).append(file_path)
+		written = write_outputs(output_file, key_sources)
+
+	manifest = {}
+	for input_file in inputs:
+		manifest.update(copy_sidecars(input_file, output_file))
+	if manifest:
+		store_dir = os.path.join(output_dir(output_file), "attachements")
+		os.makedirs(store_dir, exist_ok=True)
+		checkpoint.atomic_write_json(os.path.join(store_dir, "manifest.json"), manifest)
+		logger.info(f"Attachments manifest merged with {len(manifest)} file(s)")
+
+	logger.info(f"{len(inputs)} shard(s) merged into {', '.join(written)}")
+	print(f"{len(inputs)} shard(s) merged into " + config.BOLD + ", ".join(written) + config.END)
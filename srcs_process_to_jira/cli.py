@@ -1,6 +1,7 @@
 import getopt
 import sys
 from srcs_process_to_jira import config, logger
+from srcs_extraction import compression
 
 def parse_args(argv):
 	"""
@@ -20,12 +21,14 @@ def parse_args(argv):
 		"single_file_output": False,
 		"multiple_files_output": False,
 		"auto": False,
-		"auto_indent": 10000
+		"auto_indent": 10000,
+		"compression": None,
+		"attachments_url": None
 	}
 
 	try:
 		opts, _ = getopt.getopt(
-			argv, "hi:o:a",["help", "single-input-file=", "single-output-file=", "multiple-input-files=", "multiple-output-files=", "auto="]
+			argv, "hi:o:a",["help", "single-input-file=", "single-output-file=", "multiple-input-files=", "multiple-output-files=", "auto=", "compress=", "attachments-url="]
 		)
 	except getopt.GetoptError as e:
 		logger.error(f"Argument parsing error: {e}")
@@ -61,6 +64,17 @@ def parse_args(argv):
 			if arg:
 				args["output_file"] = arg.removesuffix('.json')
 			logger.debug(f"Multiple files output prefix set to: {args['output_file']}")
+		elif opt == "--compress":
+			if arg not in compression.EXTENSIONS:
+				logger.error(f"Invalid compression: {arg}. Exiting.")
+				print(config.BOLD + "Error: " + config.END + f"Compression must be one of {', '.join(compression.EXTENSIONS)}, got \"{arg}\".")
+				print(config.TXT_USAGE)
+				sys.exit(2)
+			args["compression"] = arg
+			logger.debug(f"Compression set to: {arg}")
+		elif opt == "--attachments-url":
+			args["attachments_url"] = arg
+			logger.debug(f"Attachments URL set to: {arg}")
 
 	if (args["single_file_input"] and args["multiple_files_input"]) or (args["single_file_output"] and args["multiple_files_output"]):
 		logger.error("Both single file and multiple files options set. Exiting.")
@@ -68,6 +82,12 @@ def parse_args(argv):
 		print(config.TXT_USAGE)
 		sys.exit(2)
 
+	if not compression.available(args["compression"] or compression.compression_of(args["output_file"])):
+		logger.error("zstd compression asked without the zstandard package. Exiting.")
+		print(config.BOLD + "Error: " + config.END + "zstd compression needs the zstandard package: pip install zstandard")
+		print(config.TXT_USAGE)
+		sys.exit(2)
+
 	logger.info("Arguments successfully parsed.")
 	return args
 
@@ -4,6 +4,8 @@ INPUT_MULTIPLE_FILE = False
 OUTPUT_MULTIPLE_FILE = False
 AUTO = False
 AUTO_INDENT = 10000
+COMPRESSION = None
+ATTACHMENTS_URL = None
 
 BOLD = "\x1B[1m"
 ITALIC = "\x1B[3m"
@@ -19,6 +21,8 @@ TXT_HELP = BOLD + "Options: " + END + "\n\
 \t\tPrint this help paragraph.\n\n\
 \t" + BOLD + "-i, --single-input-file=SINGLE_INPUT_FILE" + END + " (default)\n\
 \t\tUse to choose a single input file.\n\
+\t\tAn NDJSON extraction (" + ITALIC + "--ndjson" + END + ") is read from its .ndjson file, e.g: " + ITALIC + "-i outputs/redmine_data.ndjson" + END + ".\n\
+\t\tA SQLite extraction (" + ITALIC + "--sqlite" + END + ") is read project by project from its .sqlite file, e.g: " + ITALIC + "-i outputs/redmine_data.sqlite" + END + ".\n\
 \t\tDefault: " + ITALIC + "\"redmine_data.json\"" + END + "\n\n\
 \t" + BOLD + "-o, --single-output-file=SINGLE_OUTPUT_FILE" + END + " (default)\n\
 \t\tUse to choose a single output file.\n\
@@ -28,7 +32,8 @@ TXT_HELP = BOLD + "Options: " + END + "\n\
 \t" + BOLD + "--multiple-input-files=MULTIPLE_INPUT_FILES" + END + " (optional)\n\
 \t\tUse to choose a multiple input file.\n\
 \t\tArgument is only use for the path and prefix.\n\
-\t\tYou can add a prefix as argument, e.g: " + ITALIC + "--multiple-input-files=test/xyz_ will take as input ./test/xyz_projects.json..." + END + "\n\n\
+\t\tYou can add a prefix as argument, e.g: " + ITALIC + "--multiple-input-files=test/xyz_ will take as input ./test/xyz_projects.json..." + END + "\n\
+\t\tThe .ndjson files of an NDJSON extraction are taken first when present.\n\n\
 \t" + BOLD + "--multiple-output-files=MULTIPLE_OUTPUT_FILES" + END + " (optional)\n\
 \t\tUse to choose a multiple output file.\n\
 \t\tIt will process each categories into separate file.\n\
@@ -36,4 +41,12 @@ TXT_HELP = BOLD + "Options: " + END + "\n\
 \t\t⚠ It will clear the file if already exist or create it if not existing.\n\n\
 \t" + BOLD + "-a, --auto=LINE_PER_FILE" + END + " (recommended)\n\
 \t\tUse to split data in different file.\n\
-\t\tDefault: " + ITALIC + "10000 lines per file" + END + "."
+\t\tDefault: " + ITALIC + "10000 lines per file" + END + ".\n\n\
+\t" + BOLD + "--compress=COMPRESSION" + END + " (optional)\n\
+\t\tUse to compress the output with " + ITALIC + "gzip" + END + " or " + ITALIC + "zstd" + END + ", adding the .gz or .zst extension to the output files.\n\
+\t\tIt is also picked from the extension of the single output file, e.g: " + ITALIC + "--single-output-file=jira_data.json.gz" + END + ".\n\
+\t\tCompressed inputs (.gz, .zst) are always read transparently. zstd needs the " + ITALIC + "zstandard" + END + " package.\n\n\
+\t" + BOLD + "--attachments-url=URL" + END + " (optional)\n\
+\t\tUse to point the attachments of the Jira issues to the attachments store of the extraction instead of Redmine.\n\
+\t\tThe path of each attachment in the store is added to the URL, e.g: " + ITALIC + "--attachments-url=https://files.example.com/attachements/" + END + " or " + ITALIC + "--attachments-url=file://redmine/" + END + ".\n\
+\t\tDefault: the " + ITALIC + "content_url" + END + " of the attachment in Redmine."
@@ -0,0 +1,50 @@
+import json, os
+from srcs_process_to_jira import logger
+from srcs_extraction import compression
+
+def load_journals(input_file, project_ids):
+	"""
+	Loads the issue journals (history) extracted with --journals, from the journals/ directory next to the input.
+
+	Args:
+		input_file (str): The file, path, and/or prefix that should be taken as input.
+		project_ids (list): The IDs of the projects to load the journals of.
+
+	Returns:
+		dict: The journals by issue ID, empty if the extraction has none.
+	"""
+	journals = {}
+	journals_dir = os.path.join(os.path.dirname(input_file), "journals")
+	if not os.path.isdir(journals_dir):
+		logger.info(f"No journals found in {journals_dir}, the history of the issues will be empty.")
+		return journals
+	for project_id in project_ids:
+		for compressed in ("", *compression.EXTENSIONS.values()):
+			file_path = os.path.join(journals_dir, f"{project_id}.ndjson{compressed}")
+			if os.path.exists(file_path):
+				logger.info(f"Loading journals of project {project_id} from {file_path}.")
+				with compression.open_read(file_path) as file:
+					for line in file:
+						entry = json.loads(line)
+						journals[entry["issue_id"]] = entry["journals"]
+				break
+	return journals
+
+def load_attachments(input_file):
+	"""
+	Loads the manifest of the attachments store next to the input, giving where each downloaded file is stored.
+
+	Args:
+		input_file (str): The file, path, and/or prefix that should be taken as input.
+
+	Returns:
+		dict: The manifest entries by file ID, empty if the extraction has no attachments store.
+	"""
+	manifest_file = os.path.join(os.path.dirname(input_file), "attachements", "manifest.json")
+	if not os.path.exists(manifest_file):
+		logger.info(f"No attachments manifest found at {manifest_file}, the attachments will point to Redmine.")
+		return {}
+	with open(manifest_file, "r", encoding="utf-8") as file:
+		manifest = json.load(file)
+	logger.info(f"Attachments manifest loaded from {manifest_file} with {len(manifest)} file(s).")
+	return {entry["file_id"]: entry for entry in manifest.values()}
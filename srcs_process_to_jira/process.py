@@ -1,12 +1,15 @@
 import json, os, isodate
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
-from srcs_process_to_jira import config, logger, save
+from srcs_process_to_jira import config, load, logger, save
+from srcs_extraction import reader
 from datetime import timedelta
 
 def process_projects(input_file, progress, task_id, data):
 	"""
 	Processes projects and issues from the input file.
 
+	The assignee of an issue is the display name of the Redmine user, read from the input.
+
 	Args:
 		input_file (str): The file, path, and/or prefix that should be taken as input.
 		progress (Progress): Rich progress object for displaying progress.
@@ -24,9 +27,87 @@ def process_projects(input_file, progress, task_id, data):
 		"New": "Open"
 	}
 
+	HISTORY_FIELDS = {
+		"status_id": "status",
+		"assigned_to_id": "assignee",
+		"priority_id": "priority",
+		"tracker_id": "issuetype",
+		"subject": "summary",
+		"description": "description",
+		"fixed_version_id": "Fix Version",
+		"category_id": "Component",
+		"due_date": "duedate",
+		"estimated_hours": "timeestimate",
+		"parent_id": "Parent"
+	}
+
 	def map_status(status):
 		return STATUS_MAPPING.get(status, "Open")
 
+	def convert_journal_to_history(journal):
+		"""
+		Converts a Redmine journal to a Jira history entry, one item per changed field.
+
+		Args:
+			journal (dict): The Redmine journal, with its details.
+
+		Returns:
+			dict: The Jira history entry, or None if the journal only holds notes.
+		"""
+		items = []
+		for detail in journal.get("details", []):
+			if detail.get("property") == "cf":
+				field_type, field = "custom", f"cf_{detail['name']}"
+			elif detail.get("property") == "attachment":
+				field_type, field = "jira", "Attachment"
+			elif detail.get("property") == "relation":
+				field_type, field = "jira", "Link"
+			else:
+				field_type, field = "jira", HISTORY_FIELDS.get(detail.get("name"), detail.get("name"))
+			items.append({
+				"fieldType": field_type,
+				"field": field,
+				"from": detail.get("old_value"),
+				"fromString": detail.get("old_value"),
+				"to": detail.get("new_value"),
+				"toString": detail.get("new_value")
+			})
+		if not items:
+			return None
+		return {
+			"author": journal.get("user", {}).get("name"),
+			"created": journal["created_on"],
+			"items": items
+		}
+
+	def convert_attachment(attachment):
+		"""
+		Converts a Redmine attachment to a Jira attachment.
+
+		With config.ATTACHMENTS_URL, an attachment downloaded into the attachments store points to its
+		copy there, the others to Redmine.
+
+		Args:
+			attachment (dict): The Redmine attachment, as included in the issue.
+
+		Returns:
+			dict: The Jira attachment.
+		"""
+		uri = attachment.get("content_url")
+		stored = stored_attachments.get(attachment["id"])
+		if config.ATTACHMENTS_URL:
+			if stored:
+				uri = config.ATTACHMENTS_URL.rstrip("/") + "/" + stored["blob"].replace(os.sep, "/")
+			else:
+				logger.warning(f"Attachment {attachment['id']} is not in the attachments store, pointing to {uri}.")
+		return {
+			"name": attachment["filename"],
+			"attacher": attachment.get("author", {}).get("name"),
+			"created": attachment.get("created_on"),
+			"uri": uri,
+			"description": attachment.get("description") or ""
+		}
+
 	def convert_hours_to_iso_duration(hours):
 		"""
 		Converts decimal hours to ISO 8601 duration format (e.g., PT1H50M).
@@ -41,43 +122,26 @@ def process_projects(input_file, progress, task_id, data):
 		return isodate.duration_isoformat(td)
 
 	total = 0
+	jira_projects = []
 	try:
-		if config.INPUT_MULTIPLE_FILE:
-			projects_input_file = input_file + "projects.json"
-			issues_input_file =  input_file + "issues.json"
-			time_input_file =  input_file + "time_entries.json"
-			logger.info(f"Loading projects from {projects_input_file}.")
-			with open(projects_input_file, 'r') as file:
-				projects = json.load(file)
-			logger.info(f"Loading issues from {issues_input_file}.")
-			with open(issues_input_file, 'r') as file:
-				issues = json.load(file)
-			logger.info(f"Loading time entries from {time_input_file}.")
-			with open(time_input_file, 'r') as file:
-				time_entries = json.load(file)
-		else:
-			logger.info(f"Loading data from {input_file}.")
-			with open(input_file, 'r') as file:
-				data = json.load(file)
-			if isinstance(data, dict) and "projects" in data and "issues" in data:
-				projects = data["projects"]
-				issues = data["issues"]
-				time_entries = data["time_entries"]
-			else:
-				raise ValueError("Unexpected input format. Expected a list or an object with a 'projects' and/or 'issues' key.")
+		counts, batches = reader.stream_projects(input_file, config.INPUT_MULTIPLE_FILE)
 
-		total = len(projects) + len(issues) + len(time_entries)
+		total = sum(counts.values())
 		logger.info(f"Total items to process: {total}.")
 		progress.update(task_id, total=total)
 
-		jira_projects = []
 		allocated_keys = set()
+		assignees = {
+			user["id"]: user.get("name") or f"{user['firstname']} {user['lastname']}"
+			for user in reader.load_entities(input_file, ["users"], config.INPUT_MULTIPLE_FILE)["users"]
+		}
+		stored_attachments = load.load_attachments(input_file)
 
-		task_project = progress.add_task("↪ Formatting projects", total=len(projects))
-		task_issues = progress.add_task("↪ Formatting issues", total=len(issues))
-		task_time_entries = progress.add_task("↪ Formatting time_entries", total=len(time_entries))
+		task_project = progress.add_task("↪ Formatting projects", total=counts["projects"])
+		task_issues = progress.add_task("↪ Formatting issues", total=counts["issues"])
+		task_time_entries = progress.add_task("↪ Formatting time_entries", total=counts["time_entries"])
 
-		for project in projects:
+		for project, issues, time_entries in batches:
 			base_key = project["identifier"][:10].upper()
 			key = base_key
 
@@ -111,65 +175,63 @@ def process_projects(input_file, progress, task_id, data):
 			progress.update(task_id, advance=1)
 			logger.info(f"Processed project: {project['name']}")
 
-		for issue in issues:
-			issue_info = {
-				"priority": issue["priority"]["name"],
-				"description": issue.get("description", ""),
-				"status": map_status(issue["status"]["name"]),
-				"reporter": issue["author"]["name"],
-				"labels": [],
-				"watchers": [],
-				"issueType": issue["tracker"]["name"],
-				"resolution": "Unresolved" if issue["status"]["id"] != 3 else "Resolved",
-				"created": issue["created_on"],
-				"updated": issue["updated_on"],
-				"affectedVersions": [],
-				"summary": issue["subject"],
-				"assignee": None,
-				"fixedVersions": [],
-				"components": [],
-				"externalId": issue["id"],
-				"history": [],
-				"customFieldValues": [],
-				"attachments": [],
-				"worklogs": []
-			}
-			assigned_to = issue.get("assigned_to")
-			if assigned_to:
-				assignee_id = assigned_to["id"]
-				for user in data["users"]:
-					if user["id"] == assignee_id:
-						issue_info["assignee"] = user["name"]
-						break
-
-			project_id = issue["project"]["id"]
-			for jira_project in jira_projects:
-				if jira_project["id"] == project_id:
-					jira_project["issues"].append(issue_info)
-					break
-
-			progress.update(task_issues, advance=1)
-			progress.update(task_id, advance=1)
-			logger.info(f"Processed issue: {issue['subject']}")
-
-		for time_entry in time_entries:
-			issue_id = time_entry["issue"]["id"]
-			worklog = {
-				"author": time_entry["user"]["name"],
-				"comment": time_entry.get("comments", "No comment provided"),
-				"startDate": time_entry["spent_on"],
-				"timeSpent": convert_hours_to_iso_duration(time_entry["hours"]),
-			}
-			for jira_project in jira_projects:
-				for jira_issue in jira_project["issues"]:
-					if jira_issue["externalId"] == issue_id:
-						if "worklogs" not in jira_issue:
-							jira_issue["worklogs"] = []
-						jira_issue["worklogs"].append(worklog)
-						break
-			progress.update(task_time_entries, advance=1)
-			progress.update(task_id, advance=1)
-			logger.info(f"Processed time entry for issue ID: {issue_id}")
+			journals = load.load_journals(input_file, [project["id"]])
+			jira_issues = {}
+			for issue in issues:
+				issue_info = {
+					"priority": issue["priority"]["name"],
+					"description": issue.get("description", ""),
+					"status": map_status(issue["status"]["name"]),
+					"reporter": issue["author"]["name"],
+					"labels": [],
+					"watchers": [],
+					"issueType": issue["tracker"]["name"],
+					"resolution": "Unresolved" if issue["status"]["id"] != 3 else "Resolved",
+					"created": issue["created_on"],
+					"updated": issue["updated_on"],
+					"affectedVersions": [],
+					"summary": issue["subject"],
+					"assignee": None,
+					"fixedVersions": [],
+					"components": [],
+					"externalId": issue["id"],
+					"history": [],
+					"customFieldValues": [],
+					"attachments": [convert_attachment(attachment) for attachment in issue.get("attachments", [])],
+					"worklogs": []
+				}
+				for journal in journals.get(issue["id"], []):
+					history = convert_journal_to_history(journal)
+					if history:
+						issue_info["history"].append(history)
+
+				assigned_to = issue.get("assigned_to")
+				if assigned_to:
+					issue_info["assignee"] = assignees.get(assigned_to["id"])
+
+				jira_project["issues"].append(issue_info)
+				jira_issues.setdefault(issue["id"], issue_info)
+
+				progress.update(task_issues, advance=1)
+				progress.update(task_id, advance=1)
+				logger.info(f"Processed issue: {issue['subject']}")
+
+			for time_entry in time_entries:
+				issue_id = time_entry.get("issue", {}).get("id")
+				if issue_id is None:
+					logger.warning(f"Skipped time entry {time_entry.get('id')}, logged on project {project['id']} without an issue.")
+				else:
+					worklog = {
+						"author": time_entry["user"]["name"],
+						"comment": time_entry.get("comments", "No comment provided"),
+						"startDate": time_entry["spent_on"],
+						"timeSpent": convert_hours_to_iso_duration(time_entry["hours"]),
+					}
+					if issue_id in jira_issues:
+						jira_issues[issue_id]["worklogs"].append(worklog)
+					logger.info(f"Processed time entry for issue ID: {issue_id}")
+				progress.update(task_time_entries, advance=1)
+				progress.update(task_id, advance=1)
 
 	except Exception as err:
 		logger.error(f"Error processing projects: {err}")
@@ -191,19 +253,7 @@ def process_users(input_file, progress, task_id, data):
 	logger.info("Starting to process users.")
 	total = 0
 	try:
-		if config.INPUT_MULTIPLE_FILE:
-			input_file += "users.json"
-
-		logger.info(f"Loading users from {input_file}.")
-		with open(input_file, 'r') as file:
-			data = json.load(file)
-
-		if isinstance(data, dict) and "users" in data:
-			users = data["users"]
-		elif isinstance(data, list):
-			users = data
-		else:
-			raise ValueError("Unexpected input format. Expected a list or an object with a 'users' key.")
+		users = reader.load_entities(input_file, ["users"], config.INPUT_MULTIPLE_FILE)["users"]
 
 		total = len(users)
 		logger.info(f"Total users to process: {total}.")
@@ -242,56 +292,22 @@ def process_links(input_file, progress, task_id, data):
 	total = 0
 	jira_links = []
 	try:
-		if config.INPUT_MULTIPLE_FILE:
-			input_file += "issues.json"
-
-		logger.info(f"Loading users from {input_file}.")
-		with open(input_file, 'r') as file:
-			data = json.load(file)
-
-		if isinstance(data, dict) and "issues" in data:
-			issues = data["issues"]
-		elif isinstance(data, list):
-			issues = data
-		else:
-			raise ValueError("Unexpected input format. Expected a list or an object with a 'relations' key.")
-
-		for issue in issues:
-			if isinstance(issue, dict) and "relations" in issue:
-				relations_data = issue["relations"]
-				if relations_data and "relations" in relations_data:
-					relations = relations_data["relations"]
-				else:
-					relations = []
-			else:
-				raise ValueError("Unexpected input format. Expected a list or an object with a 'relations' key.")
-
-			total += len(relations)
+		total, relations = reader.stream_relations(input_file, config.INPUT_MULTIPLE_FILE)
 
 		logger.info(f"Total links to process: {total}.")
 		progress.update(task_id, total=total)
 
-		for issue in issues:
-			if isinstance(issue, dict) and "relations" in issue:
-				relations_data = issue["relations"]
-				if relations_data and "relations" in relations_data:
-					relations = relations_data["relations"]
-				else:
-					relations = []
-			else:
-				raise ValueError("Unexpected input format. Expected a list or an object with a 'relations' key.")
-
-			for relation in relations:
-				jira_link = {
-					"sourceId": relation["issue_id"],
-					"destinationId": relation["issue_to_id"],
-					"name": relation["relation_type"]
-				}
-				jira_links.append(jira_link)
-				progress.update(task_id, advance=1)
-				logger.info(f"Processed link from {relation['issue_id']} to {relation['issue_to_id']}")
+		for relation in relations:
+			jira_link = {
+				"sourceId": relation["issue_id"],
+				"destinationId": relation["issue_to_id"],
+				"name": relation["relation_type"]
+			}
+			jira_links.append(jira_link)
+			progress.update(task_id, advance=1)
+			logger.info(f"Processed link from {relation['issue_id']} to {relation['issue_to_id']}")
 	except Exception as err:
-		logger.error(f"Error processing links: {err} {issue}")
+		logger.error(f"Error processing links: {err}")
 		print(config.BOLD + "Error: " + config.END + f"{err}")
 	return jira_links
 
@@ -350,13 +366,11 @@ def process(input_file, output_file):
 				else:
 					try:
 						task_subsave = progress.add_task(f"↪ Saving into {output_file}", total=1)
-						with open(output_file, "w", encoding="utf-8") as file:
-							json.dump(consolidated_data, file, indent=4, ensure_ascii=False)
-						os.chmod(output_file, 0o777)
+						filename = save.save_json(consolidated_data, output_file)
 						progress.update(task_subsave, advance=1)
 						progress.update(task_save, advance=1)
-						logger.info(f"All data saved to {output_file}.")
-						print("All data saved to " + config.BOLD + f"{output_file}" + config.END)
+						logger.info(f"All data saved to {filename}.")
+						print("All data saved to " + config.BOLD + f"{filename}" + config.END)
 					except Exception as e:
 						logger.error(f"Error while saving data to {output_file}: {e}", exc_info=True)
 						print(config.BOLD + "Error:\n" + config.END + f"{e}")
@@ -382,13 +396,11 @@ def process(input_file, output_file):
 					else:
 						try:
 							task_subsave = progress.add_task(f"↪ Saving into {output_file + key + '.json'}", total=1)
-							with open(output_file + key + '.json', "w", encoding="utf-8") as file:
-								json.dump(consolidated_data[key], file, indent=4, ensure_ascii=False)
-							os.chmod(output_file + key + '.json', 0o777)
+							filename = save.save_json(consolidated_data[key], output_file + key + '.json')
 							progress.update(task_subsave, advance=1)
 							progress.update(task_save, advance=1)
-							logger.info(f"Data for {key} saved to {output_file + key + '.json'}.")
-							print("Data has been saved to " + config.BOLD + f"{output_file + key + '.json'}" + config.END)
+							logger.info(f"Data for {key} saved to {filename}.")
+							print("Data has been saved to " + config.BOLD + f"{filename}" + config.END)
 						except Exception as e:
 							logger.error(f"Error while saving {key} data to {output_file + key + '.json'}: {e}", exc_info=True)
 							print(config.BOLD + "Error:\n" + config.END + f"{e}")
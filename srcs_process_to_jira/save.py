@@ -1,6 +1,30 @@
 import json
 import os
 from srcs_process_to_jira import config, logger
+from srcs_extraction import compression
+
+def save_json(data, filename):
+	"""
+	Save data to a JSON file, compressed on a background thread if config.COMPRESSION is set.
+
+	Compressed files are written without indentation, as they are not meant to be read as is.
+
+	Args:
+		data (dict or list): The data to save.
+		filename (str): The uncompressed filename.
+
+	Returns:
+		str: The filename written, with its compression extension.
+	"""
+	if config.COMPRESSION:
+		filename += compression.EXTENSIONS[config.COMPRESSION]
+		with compression.open_write(filename) as file:
+			json.dump(data, file, ensure_ascii=False)
+	else:
+		with open(filename, "w", encoding="utf-8") as file:
+			json.dump(data, file, indent=4, ensure_ascii=False)
+	os.chmod(filename, 0o777)
+	return filename
 
 def split_and_save(data, base_filename, progress, task_id, key=None):
 	"""
@@ -114,11 +138,7 @@ def save_chunk(chunk, base_filename, part, key):
 		base_filename = base_filename.removesuffix('.json')
 		if config.OUTPUT_MULTIPLE_FILE:
 			base_filename = f"{base_filename}{key}"
-		filename = f"{base_filename}_part{part}.json"
-
-		with open(filename, "w", encoding="utf-8") as file:
-			json.dump(chunk, file, indent=4, ensure_ascii=False)
-		os.chmod(filename, 0o777)
+		filename = save_json(chunk, f"{base_filename}_part{part}.json")
 		logger.info(f"Chunk saved to {filename}")
 	except Exception as e:
 		logger.error(f"An error occurred in save_chunk: {str(e)}", exc_info=True)
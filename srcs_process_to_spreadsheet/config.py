@@ -15,11 +15,15 @@ TXT_HELP = BOLD + "Options: " + END + "\n\
 \t\tPrint this help paragraph.\n\n\
 \t" + BOLD + "-i, --single-input-file=SINGLE_INPUT_FILE" + END + " (default)\n\
 \t\tUse to choose a single input file.\n\
+\t\tAn NDJSON extraction (" + ITALIC + "--ndjson" + END + ") is read from its .ndjson file, e.g: " + ITALIC + "-i outputs/redmine_data.ndjson" + END + ".\n\
+\t\tA SQLite extraction (" + ITALIC + "--sqlite" + END + ") is read project by project from its .sqlite file, e.g: " + ITALIC + "-i outputs/redmine_data.sqlite" + END + ".\n\
+\t\tCompressed inputs (.gz, .zst) are read transparently, zstd needs the " + ITALIC + "zstandard" + END + " package.\n\
 \t\tDefault: " + ITALIC + "\"redmine_data.json\"" + END + "\n\n\
 \t" + BOLD + "--multiple-input-files=MULTIPLE_INPUT_FILES" + END + " (optional)\n\
 \t\tUse to choose a multiple input file.\n\
 \t\tArgument is only use for the path and prefix.\n\
-\t\tYou can add a prefix as argument, e.g: " + ITALIC + "--multiple-input-files=test/xyz_ will take as input ./test/xyz_projects.json..." + END + "\n\n\
+\t\tYou can add a prefix as argument, e.g: " + ITALIC + "--multiple-input-files=test/xyz_ will take as input ./test/xyz_projects.json..." + END + "\n\
+\t\tThe .ndjson files of an NDJSON extraction are taken first when present.\n\n\
 \t" + BOLD + "-o, --output-path=OUTPUT_PATH" + END + " (default)\n\
 \t\tUse to choose an output path.\n\
 \t\tDefault: " + ITALIC + "\"outputs/\"" + END + "."
@@ -1,92 +1,66 @@
 import json, os
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
 from srcs_process_to_spreadsheet import config, logger, save
+from srcs_extraction import reader
 
 def process_projects(input_file, progress, task_id, consolidated_data):
 	"""
 	Process projects, issues, and time entries from the input file(s).
 
+	The projects are read and yielded one at a time, each one with its issues and their time entries,
+	so that a SQLite input is never held whole in memory.
+
 	Args:
 		input_file (str): The file, path and/or prefix that should be taken as input.
 		progress (Progress): The progress bar object.
 		task_id (int): Id of the current task.
 		consolidated_data (dict): Dict that contains a list of projects.
 
-	Returns:
-		list: Processed projects.
+	Yields:
+		dict: Processed project.
 	"""
 
 	total = 0
 	try:
-		if config.INPUT_MULTIPLE_FILE:
-			projects_input_file = input_file + "projects.json"
-			issues_input_file =  input_file + "issues.json"
-			time_entries_input_file =  input_file + "time_entries.json"
-			logger.info(f"Loading projects from {projects_input_file}.")
-			with open(projects_input_file, 'r') as file:
-				projects = json.load(file)
-			logger.info(f"Loading issues from {issues_input_file}.")
-			with open(issues_input_file, 'r') as file:
-				issues = json.load(file)
-			logger.info(f"Loading time entries from {time_entries_input_file}.")
-			with open(time_entries_input_file, 'r') as file:
-				time_entries = json.load(file)
-		else:
-			logger.info(f"Loading data from {input_file}.")
-			with open(input_file, 'r') as file:
-				data = json.load(file)
-			logger.debug(f"Loaded data: {data}")
-			if isinstance(data, dict) and "projects" in data and "issues" in data:
-				projects = data["projects"]
-				issues = data["issues"]
-				time_entries = data["time_entries"]
-			else:
-				raise ValueError("Unexpected input format. Expected a list or an object with a 'projects' and/or 'issues' key.")
-
-		total = len(projects) + len(issues) + len(time_entries)
+		counts, batches = reader.stream_projects(input_file, config.INPUT_MULTIPLE_FILE)
+
+		total = sum(counts.values())
 		logger.info(f"Total items to process: {total}.")
 		progress.update(task_id, total=total)
 
-		processed_projects = []
-
-		task_project = progress.add_task("↪ Formatting projects", total=len(projects))
-		task_issues = progress.add_task("↪ Formatting issues", total=len(issues))
-		task_time_entries = progress.add_task("↪ Formatting time entries", total=len(time_entries))
+		task_project = progress.add_task("↪ Formatting projects", total=counts["projects"])
+		task_issues = progress.add_task("↪ Formatting issues", total=counts["issues"])
+		task_time_entries = progress.add_task("↪ Formatting time entries", total=counts["time_entries"])
 
-		for project in projects:
+		for project, issues, time_entries in batches:
 			project["issues"] = []
-			processed_projects.append(project)
 			progress.update(task_project, advance=1)
 			progress.update(task_id, advance=1)
 			logger.info(f"Processed project: {project['name']}")
 
-		for issue in issues:
-			project_id = issue["project"]["id"]
-			for project in processed_projects:
-				if project["id"] == project_id:
-					issue["time_entries"] = []
-					project["issues"].append(issue)
-					break
+			issues_by_id = {}
+			for issue in issues:
+				issue["time_entries"] = []
+				project["issues"].append(issue)
+				issues_by_id.setdefault(issue["id"], issue)
 
-			progress.update(task_issues, advance=1)
-			progress.update(task_id, advance=1)
-			logger.info(f"Processed issue: {issue['subject']}")
-
-		for time_entry in time_entries:
-			issue_id = time_entry["issue"]["id"]
-			for project in processed_projects:
-				for issue in project.get("issues", []):
-					if issue["id"] == issue_id:
-						issue["time_entries"].append(time_entry)
-						break
-			progress.update(task_time_entries, advance=1)
-			progress.update(task_id, advance=1)
-			logger.info(f"Processed time entry for issue ID: {issue_id}")
+				progress.update(task_issues, advance=1)
+				progress.update(task_id, advance=1)
+				logger.info(f"Processed issue: {issue['subject']}")
+
+			for time_entry in time_entries:
+				issue_id = time_entry.get("issue", {}).get("id")
+				if issue_id in issues_by_id:
+					issues_by_id[issue_id]["time_entries"].append(time_entry)
+				progress.update(task_time_entries, advance=1)
+				progress.update(task_id, advance=1)
+				logger.info(f"Processed time entry for issue ID: {issue_id}")
+
+			yield project
 
 	except Exception as err:
 		logger.error(f"Error processing projects: {err}")
 		print(config.BOLD + "Error: " + config.END + f"{err}")
-	return processed_projects
 
 def process(input_file, output_path):
 	"""
@@ -8,7 +8,7 @@ def export_projects(projects, cleaned_path):
 	Saves multiple projects to individual Excel files.
 
 	Args:
-		projects (list): List of project dictionaries.
+		projects (iterable): Project dictionaries, e.g., the generator of process.process_projects().
 		cleaned_path (str): Path to save the cleaned Excel files.
 
 	Returns: